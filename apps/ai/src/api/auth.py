@@ -44,6 +44,9 @@ load_monorepo_dotenv()
 
 logger = NodeLogger("auth")
 
+# Singleton async Supabase client
+_supabase_client: AsyncClient | None = None
+
 
 @dataclass
 class AuthenticatedUser:
@@ -69,10 +72,11 @@ class AuthenticatedUser:
 
 async def get_supabase_client() -> AsyncClient:
     """
-    Creates an async Supabase client for auth validation.
+    Gets or creates the async Supabase client for auth validation.
 
     Uses SERVICE_KEY to validate tokens on behalf of any user.
     The service key allows us to call auth.get_user() for any token.
+    The client is created on first use and shared by all requests.
 
     Returns:
         Configured AsyncClient instance.
@@ -80,6 +84,11 @@ async def get_supabase_client() -> AsyncClient:
     Raises:
         ValueError: If required environment variables are missing.
     """
+    global _supabase_client
+
+    if _supabase_client is not None:
+        return _supabase_client
+
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_SERVICE_KEY")
 
@@ -95,7 +104,8 @@ async def get_supabase_client() -> AsyncClient:
             "Get it from Supabase Dashboard > Settings > API > service_role key"
         )
 
-    return await acreate_client(url, key)
+    _supabase_client = await acreate_client(url, key)
+    return _supabase_client
 
 
 async def get_current_user(
@@ -26,6 +26,7 @@ Usage:
 """
 
 import json
+import os
 import uuid
 from collections.abc import AsyncGenerator
 from typing import Any, Literal
@@ -46,6 +47,15 @@ JsonValue = dict | list | str | int | float | bool | None
 
 router = APIRouter(prefix="/api", tags=["chat"])
 
+# Dynamic token batching for messages/partial events
+# The first partial is sent after a single token (keeps time-to-first-token
+# unchanged), then each batch grows by the growth factor up to the max size.
+# Every partial event carries the full accumulated text, so fewer events
+# means fewer JSON encodes and far fewer bytes on the wire.
+STREAM_MIN_BATCH_SIZE = int(os.getenv("DEFAULT_MIN_BATCH_SIZE", "1"))
+STREAM_BATCH_SIZE_GROWTH_FACTOR = int(os.getenv("DEFAULT_BATCH_SIZE_GROWTH_FACTOR", "3"))
+STREAM_MAX_BATCH_SIZE = int(os.getenv("DEFAULT_BATCH_SIZE", "50"))
+
 
 # -----------------------------------------------------------------------------
 # Request/Response Models
@@ -141,6 +151,38 @@ def format_error_event(error_message: str) -> str:
     return format_sse_event("error", {"message": error_message})
 
 
+class PartialBatcher:
+    """
+    Decides when accumulated tokens should be flushed as a messages/partial event.
+
+    Starts at STREAM_MIN_BATCH_SIZE tokens per event and multiplies the batch
+    size by STREAM_BATCH_SIZE_GROWTH_FACTOR after each flush, capped at
+    STREAM_MAX_BATCH_SIZE.
+    """
+
+    def __init__(self) -> None:
+        self.batch_size = max(STREAM_MIN_BATCH_SIZE, 1)
+        self.pending = 0
+
+    def add(self) -> bool:
+        """Records one streamed token. Returns True when a partial event is due."""
+        self.pending += 1
+        if self.pending < self.batch_size:
+            return False
+
+        self.pending = 0
+        self.batch_size = min(
+            self.batch_size * STREAM_BATCH_SIZE_GROWTH_FACTOR, STREAM_MAX_BATCH_SIZE
+        )
+        return True
+
+    def flush(self) -> bool:
+        """Returns True if tokens are waiting to be sent, and resets the count."""
+        has_pending = self.pending > 0
+        self.pending = 0
+        return has_pending
+
+
 # -----------------------------------------------------------------------------
 # Helper Functions
 # -----------------------------------------------------------------------------
@@ -163,6 +205,16 @@ def extract_ai_response(messages: list[BaseMessage]) -> str:
     return ""
 
 
+def get_cached_response(update: object) -> str:
+    """Extract the cached reply from a prepare_request update, if it was a cache hit."""
+    if not isinstance(update, dict):
+        return ""
+    node_update = update.get("prepare_request")
+    if not isinstance(node_update, dict) or not node_update.get("cache_hit"):
+        return ""
+    return extract_ai_response(node_update.get("messages", []))
+
+
 def message_to_history(msg: BaseMessage, index: int) -> HistoryMessage:
     """Convert a LangChain message to history format."""
     role: Literal["user", "assistant"] = "user" if isinstance(msg, HumanMessage) else "assistant"
@@ -258,6 +310,7 @@ async def chat_stream(request: ChatRequest, user: CurrentUser) -> StreamingRespo
         config = build_langgraph_config(user, thread_id)
 
         accumulated_content = ""
+        batcher = PartialBatcher()
 
         try:
             # Use astream with stream_mode=["updates", "messages"] to properly capture
@@ -287,9 +340,17 @@ async def chat_stream(request: ChatRequest, user: CurrentUser) -> StreamingRespo
                             )
                         if content and not should_filter_content(content):
                             accumulated_content += content
-                            yield format_messages_partial(accumulated_content)
+                            if batcher.add():
+                                yield format_messages_partial(accumulated_content)
 
                 elif mode == "updates":
+                    # Semantic cache hits skip the LLM, so there are no tokens
+                    # to stream - send the cached reply as a single partial
+                    cached_content = get_cached_response(chunk)
+                    if cached_content:
+                        accumulated_content += cached_content
+                        yield format_messages_partial(accumulated_content)
+
                     # Check for interrupt events (HITL)
                     if isinstance(chunk, dict) and "__interrupt__" in chunk:
                         interrupt_data = chunk["__interrupt__"]
@@ -300,6 +361,9 @@ async def chat_stream(request: ChatRequest, user: CurrentUser) -> StreamingRespo
                                 interrupt_obj, "value", None
                             ) or interrupt_obj.get("value")
                             if interrupt_value:
+                                # Send any batched tokens before handing off to HITL
+                                if batcher.flush():
+                                    yield format_messages_partial(accumulated_content)
                                 yield format_interrupt_event(interrupt_value)
                                 return  # Stop streaming, wait for resume
 
@@ -344,6 +408,7 @@ async def chat_resume(request: ResumeRequest, user: CurrentUser) -> StreamingRes
         config = build_langgraph_config(user, request.thread_id)
 
         accumulated_content = ""
+        batcher = PartialBatcher()
 
         # Build resume data matching what the nodes expect
         resume_data: dict[str, Any] = {"decision": request.decision}
@@ -382,7 +447,8 @@ async def chat_resume(request: ResumeRequest, user: CurrentUser) -> StreamingRes
                             )
                         if content and not should_filter_content(content):
                             accumulated_content += content
-                            yield format_messages_partial(accumulated_content)
+                            if batcher.add():
+                                yield format_messages_partial(accumulated_content)
 
                 elif mode == "updates":
                     # Check for interrupt events (chained HITL)
@@ -395,6 +461,9 @@ async def chat_resume(request: ResumeRequest, user: CurrentUser) -> StreamingRes
                                 interrupt_obj, "value", None
                             ) or interrupt_obj.get("value")
                             if interrupt_value:
+                                # Send any batched tokens before handing off to HITL
+                                if batcher.flush():
+                                    yield format_messages_partial(accumulated_content)
                                 yield format_interrupt_event(interrupt_value)
                                 return
 
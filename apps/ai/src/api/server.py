@@ -25,6 +25,9 @@ Usage:
     # Production (via Docker):
     uv run uvicorn src.api.server:app --host 0.0.0.0 --port 8000
 
+    # uvicorn's default --loop auto runs on uvloop (a project dependency)
+    # when it's installed, which speeds up task scheduling between nodes.
+
     # Endpoints available at:
     # http://localhost:2024/api/chat
     # http://localhost:2024/api/chat/stream
@@ -42,8 +45,12 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from src.api.graph import router as graph_router
 from src.api.meditation import router as meditation_router
-from src.checkpointer import cleanup_checkpointer, setup_checkpointer
+from src.checkpointer import cleanup_checkpointer
+from src.graph.wellness import get_compiled_graph
+from src.llm.providers import close_llm_clients, warmup_llms
 from src.logging_config import NodeLogger
+from src.nodes.analyze_profile.node import wait_for_profile_analyses
+from src.nodes.store_memory.node import shutdown_memory_writer
 
 logger = NodeLogger("server")
 
@@ -56,20 +63,31 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Startup:
     - Initialize PostgreSQL checkpointer
     - Create checkpoint tables if needed (idempotent)
+    - Compile the checkpointed graph, so the first request doesn't pay for it
+    - Warm LLM provider connections (best-effort)
 
     Shutdown:
+    - Wait (bounded) for background profile analyses
+    - Flush queued memory writes and stop background writers
     - Close checkpointer connection pool
+    - Close LLM client connection pools
     """
     logger.info("Starting Wbot AI API server")
 
-    # Initialize checkpointer (creates tables if needed)
-    await setup_checkpointer()
-    logger.info("Checkpointer initialized")
+    # Initialize checkpointer (creates tables if needed) and warm the compiled graph
+    await get_compiled_graph()
+    logger.info("Checkpointer initialized, graph compiled")
+
+    # Open LLM connections now so the first message skips the TLS handshake
+    await warmup_llms()
 
     yield
 
     # Cleanup on shutdown
+    await wait_for_profile_analyses()
+    await shutdown_memory_writer()
     await cleanup_checkpointer()
+    await close_llm_clients()
     logger.info("Server shutdown complete")
 
 
@@ -42,10 +42,34 @@ auth = Auth()
 TEST_USER = os.getenv("TEST_USER")
 TEST_USER_PASSWORD = os.getenv("TEST_USER_PASSWORD")
 
+# Singleton async Supabase client (service key, never signed in as a user)
+_supabase_client: AsyncClient | None = None
+
 
 async def get_supabase_client() -> AsyncClient:
     """
-    Creates an async Supabase client for auth validation.
+    Gets or creates the shared async Supabase client.
+
+    The client is created once and reused, so requests don't rebuild the
+    HTTP session on every call.
+
+    Returns:
+        Async Supabase client instance configured with project URL and service key.
+
+    Raises:
+        ValueError: If required environment variables are missing.
+    """
+    global _supabase_client
+
+    if _supabase_client is None:
+        _supabase_client = await _create_supabase_client()
+
+    return _supabase_client
+
+
+async def _create_supabase_client() -> AsyncClient:
+    """
+    Creates a new async Supabase client for auth validation.
 
     Returns:
         Async Supabase client instance configured with project URL and service key.
@@ -125,7 +149,9 @@ async def _authenticate_test_user() -> Auth.types.MinimalUserDict:
     Raises:
         Auth.exceptions.HTTPException: If test credentials are invalid.
     """
-    supabase = await get_supabase_client()
+    # Signing in stores the user's session on the client, so use a fresh
+    # one rather than the shared service-key client
+    supabase = await _create_supabase_client()
 
     try:
         # Sign in with test credentials
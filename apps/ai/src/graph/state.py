@@ -31,6 +31,11 @@ class WellnessState(TypedDict):
     Each field can have a reducer (via Annotated) that controls how
     updates are applied.
 
+    A TypedDict is used (rather than a dataclass or Pydantic model) because
+    LangGraph rebuilds the state value from its channels for every node call.
+    With a TypedDict that value is a plain dict; a dataclass schema would be
+    instantiated per node instead, and nodes rely on dict-style `.get()`.
+
     Attributes:
         messages: The conversation history.
                   Uses the add_messages reducer which:
@@ -88,3 +93,11 @@ class WellnessState(TypedDict):
 
     # The technique ID if a breathing exercise was performed
     exercise_technique: NotRequired[str]
+
+    # -------------------------------------------------------------------------
+    # Semantic Response Cache
+    # -------------------------------------------------------------------------
+
+    # True when prepare_request answered this turn from the semantic cache
+    # (the cached AIMessage is already in messages); routes to store_memory
+    cache_hit: NotRequired[bool]
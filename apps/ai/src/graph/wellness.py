@@ -4,38 +4,47 @@ Wellness Conversation Graph
 ============================================================================
 The main LangGraph graph definition for Wbot's wellness chatbot.
 
-Graph Structure (Parallel Execution with Barrier):
-    START -> [three parallel paths]
+Graph Structure (Parallel Execution):
+    START -> [two parallel paths]
         - retrieve_memories: Semantic memory search (~50-100ms)
-        - inject_user_context: User profile injection
-        - detect_activity: LLM-based activity classification (~200ms)
+        - prepare_request: User profile injection, LLM-based activity
+          classification (~200ms) and the semantic cache lookup, run
+          concurrently inside one node
 
-    All paths converge at prepare_routing barrier, then:
-        -> breathing_exercise -> store_memory -> analyze_profile -> END
-        -> generate_response -> store_memory -> analyze_profile -> END
-        -> generate_meditation_script -> store_memory -> analyze_profile -> END
+    Routing happens directly from prepare_request:
+        -> breathing_exercise -> store_memory -> END
+        -> generate_response -> store_memory -> END
+        -> generate_meditation_script -> store_memory -> END
+        -> store_memory -> END  (semantic cache hit)
 
     Key Design:
-    - All parallel paths converge at barrier before routing
+    - Both parallel paths run in the same super-step, so LangGraph
+      waits for retrieve_memories before any activity node starts
     - Conditional routing sends to exactly ONE activity node
+    - The cache lookup runs inside prepare_request because the routing
+      branch only sees its own node's writes from the current super-step
+    - A semantic cache hit always wins over a detected activity (only
+      replies to no-activity opening messages are cached)
     - Memories are available in state for any node that needs them
-    - detect_activity is the slowest path (~200ms), so memory retrieval
-      adds no additional latency to the barrier
+    - Activity detection is the slowest work (~200ms), so memory retrieval
+      adds no additional latency before routing
 
     Parallel Nodes (run simultaneously from START):
     - retrieve_memories: Semantic search, stores results in state
-    - inject_user_context: Injects auth user info into state
-    - detect_activity: LLM-based activity classification
+    - prepare_request: Injects auth user info, classifies activity intent,
+      and adds a cached AIMessage and sets cache_hit on a cache hit
 
     Activity Nodes (only ONE runs per request):
     - generate_response: Streams AI response with memory context
     - breathing_exercise: Interactive breathing with HITL
     - generate_meditation_script: Personalized meditation with voice selection
-    - store_memory: Stores conversation pair
-    - analyze_profile: Updates wellness profile (post-response, zero latency impact)
+    - store_memory: Stores conversation pair and schedules profile analysis
+      (analyze_profile runs as a background task, outside the graph run)
 
 This file defines the graph structure and compiles it for self-hosted deployment.
-The compiled `graph` is exported for use by the LangGraph server.
+The compiled `graph` is exported for use by the LangGraph server. It is
+compiled lazily on first access, so processes that only use
+get_compiled_graph() never pay for it.
 ============================================================================
 """
 
@@ -47,113 +56,92 @@ from src.graph.state import WellnessState
 
 # Import directly from node modules to avoid circular imports
 # (src/nodes/__init__.py -> src/nodes/generate_response -> src/graph/state -> src/graph/__init__.py -> wellness.py)
-from src.nodes.analyze_profile.node import analyze_profile
 from src.nodes.breathing_exercise.node import run_breathing_exercise
-from src.nodes.detect_activity.node import detect_activity_intent
 from src.nodes.generate_meditation_script.node import run_generate_meditation_script
 from src.nodes.generate_response.node import generate_response
-from src.nodes.inject_user_context.node import inject_user_context
 from src.nodes.journaling_prompt.node import provide_journaling_prompt
+from src.nodes.prepare_request.node import prepare_request
 from src.nodes.retrieve_memories.node import retrieve_memories
 from src.nodes.store_memory.node import store_memory_node
 
+# Activity type -> node that handles it (anything else gets a normal response)
+ACTIVITY_ROUTES: dict[str | None, str] = {
+    "breathing": "breathing_exercise",
+    "meditation": "generate_meditation_script",
+    "journaling": "journaling_prompt",
+}
+
 
 def route_activity(state: WellnessState) -> str:
     """
     Routing function for conditional edges based on detected activity.
 
-    Examines the suggested_activity field set by detect_activity node
+    Examines the suggested_activity field set by the prepare_request node
     and routes to the appropriate activity handler or normal response.
 
+    Turns already answered from the semantic cache go straight to storage:
+    prepare_request has already added the cached AIMessage to state.
+
     Args:
-        state: Current graph state with suggested_activity field
+        state: Current graph state with suggested_activity and cache_hit fields
 
     Returns:
         Name of the node to route to
     """
-    activity = state.get("suggested_activity")
+    if state.get("cache_hit"):
+        return "store_memory"
 
     # Route to the appropriate activity node
-    activity_routes = {
-        "breathing": "breathing_exercise",
-        "meditation": "generate_meditation_script",
-        "journaling": "journaling_prompt",
-    }
-
-    return activity_routes.get(activity, "generate_response")
-
-
-async def prepare_routing(state: WellnessState) -> dict:
-    """
-    Barrier node for routing decision synchronization.
-
-    Ensures all three parallel paths complete before routing:
-    - retrieve_memories: Semantic memory search (available in state)
-    - inject_user_context: User profile and preferences
-    - detect_activity: Activity classification for routing decision
-
-    This node does not modify state - it only serves as a synchronization point.
-    After this barrier, conditional routing sends to exactly ONE activity node.
-    """
-    return {}
+    return ACTIVITY_ROUTES.get(state.get("suggested_activity"), "generate_response")
 
 
 def build_graph() -> StateGraph:
     """
-    Constructs the wellness conversation graph with parallel execution and barrier.
+    Constructs the wellness conversation graph with parallel execution.
 
     Implementation:
-    1. Fan-out from START: Three parallel paths run simultaneously
-    2. All paths converge at prepare_routing barrier
-    3. Conditional routing sends to exactly ONE activity node
-    4. Store conversation pair and analyze profile
+    1. Fan-out from START: Two parallel paths run simultaneously
+    2. Conditional routing from prepare_request sends to exactly ONE activity node
+       (or straight to store_memory on a semantic cache hit)
+    3. Store conversation pair (profile analysis continues in the background)
 
     Returns:
         A StateGraph builder for the self-hosted LangGraph server.
 
     Graph Visualization:
 
-                        ┌─────────┐
-                        │  START  │
-                        └────┬────┘
-                             │
-           ┌─────────────────┼─────────────────┐
-           │                 │                 │
-           ▼                 ▼                 ▼
-    ┌─────────────┐  ┌─────────────┐  ┌─────────────┐
-    │  retrieve   │  │   inject    │  │   detect    │
-    │  memories   │  │user_context │  │  activity   │
-    └──────┬──────┘  └──────┬──────┘  └──────┬──────┘
-           │                │                 │
-           └────────────────┼─────────────────┘
-                            ▼
-                ┌───────────────────────┐
-                │    prepare_routing    │ ← All paths converge here
-                └──────────┬────────────┘
-                           │ conditional routing
-            ┌──────────────┼──────────────┐
-            │              │              │
-            ▼              ▼              ▼
-       ┌────────┐    ┌────────────┐  ┌────────────┐
-       │breathing│    │  generate  │  │ meditation │
-       │exercise │    │  response  │  │   script   │
-       └────┬────┘    └─────┬──────┘  └─────┬──────┘
-            │               │               │
-            └───────────────┼───────────────┘
-                            ▼
-                 ┌─────────────────────┐
-                 │    store_memory     │
-                 └──────────┬──────────┘
-                            │
-                            ▼
-                 ┌─────────────────────┐
-                 │   analyze_profile   │  ← Post-response (zero latency impact)
-                 └──────────┬──────────┘
-                            │
-                            ▼
-                      ┌─────────┐
-                      │   END   │
-                      └─────────┘
+                            ┌─────────┐
+                            │  START  │
+                            └────┬────┘
+                                 │
+           ┌─────────────────────┤
+           │                     │
+           ▼                     ▼
+    ┌─────────────┐   ┌──────────────────────┐
+    │  retrieve   │   │   prepare_request    │
+    │  memories   │   │  user_context +      │
+    └─────────────┘   │  activity detection +│
+                      │  semantic cache      │
+                      └──────────┬───────────┘
+                                 │ conditional routing (next super-step)
+                ┌──────────────┬─┴────────────┬─────────────────┐
+                │              │              │                 │ cache hit
+                ▼              ▼              ▼                 │
+           ┌────────┐    ┌────────────┐  ┌────────────┐         │
+           │breathing│    │  generate  │  │ meditation │         │
+           │exercise │    │  response  │  │   script   │         │
+           └────┬────┘    └─────┬──────┘  └─────┬──────┘         │
+                │               │               │               │
+                └───────────────┼───────────────┴───────────────┘
+                                ▼
+                     ┌─────────────────────┐
+                     │    store_memory     │  → schedules analyze_profile
+                     └──────────┬──────────┘     (background task)
+                                │
+                                ▼
+                          ┌─────────┐
+                          │   END   │
+                          └─────────┘
     """
     # Create the graph builder with our state type
     builder = StateGraph(WellnessState)
@@ -162,16 +150,14 @@ def build_graph() -> StateGraph:
     # Add Nodes
     # -------------------------------------------------------------------------
 
-    # User context injection - reads auth info and populates user_context
+    # Request preparation - populates user_context, classifies activity intent
+    # and answers repeated opening messages from the semantic cache
     # This MUST run first so all downstream nodes have access to user info
-    builder.add_node("inject_user_context", inject_user_context)
+    builder.add_node("prepare_request", prepare_request)
 
     # Memory retrieval - searches for relevant past conversations
     builder.add_node("retrieve_memories", retrieve_memories)
 
-    # Activity detection - classifies if user needs an activity
-    builder.add_node("detect_activity", detect_activity_intent)
-
     # Main response generation - the core of the conversation
     builder.add_node("generate_response", generate_response)
 
@@ -187,37 +173,26 @@ def build_graph() -> StateGraph:
     # Memory storage - persists the conversation for future retrieval
     builder.add_node("store_memory", store_memory_node)
 
-    # Profile analysis - analyzes conversation and updates user wellness profile
-    # Runs AFTER store_memory (zero latency impact on user experience)
-    builder.add_node("analyze_profile", analyze_profile)
-
-    # Barrier node for parallel branch convergence
-    builder.add_node("prepare_routing", prepare_routing)
-
     # -------------------------------------------------------------------------
-    # Define Edges (Flow) - Parallel Execution with Barrier Pattern
+    # Define Edges (Flow) - Parallel Execution
     # -------------------------------------------------------------------------
 
-    # Fan-out from START: Three parallel paths run simultaneously
+    # Fan-out from START: Two parallel paths run simultaneously
+    # All run in the same super-step, so memories are in state
+    # before any activity node runs
     builder.add_edge(START, "retrieve_memories")
-    builder.add_edge(START, "inject_user_context")
-    builder.add_edge(START, "detect_activity")
-
-    # All parallel paths converge at routing barrier
-    # This ensures memories are in state before any activity node runs
-    builder.add_edge("retrieve_memories", "prepare_routing")
-    builder.add_edge("inject_user_context", "prepare_routing")
-    builder.add_edge("detect_activity", "prepare_routing")
+    builder.add_edge(START, "prepare_request")
 
-    # Conditional routing based on detected activity (from barrier node)
+    # Conditional routing based on detected activity (or a semantic cache hit)
     builder.add_conditional_edges(
-        "prepare_routing",
+        "prepare_request",
         route_activity,
         {
             "breathing_exercise": "breathing_exercise",
             "generate_meditation_script": "generate_meditation_script",
             "journaling_prompt": "journaling_prompt",
             "generate_response": "generate_response",
+            "store_memory": "store_memory",
         },
     )
 
@@ -227,12 +202,10 @@ def build_graph() -> StateGraph:
     builder.add_edge("generate_meditation_script", "store_memory")
     builder.add_edge("journaling_prompt", "store_memory")
 
-    # After storing memory, analyze the conversation for profile updates
-    # This runs after the response is streamed (zero latency impact)
-    builder.add_edge("store_memory", "analyze_profile")
-
-    # After profile analysis, end the turn
-    builder.add_edge("analyze_profile", END)
+    # After storing memory, end the turn
+    # (store_memory schedules profile analysis in the background, so the
+    # run completes without waiting for the analysis LLM call)
+    builder.add_edge("store_memory", END)
 
     # -------------------------------------------------------------------------
     # Compile and Return
@@ -241,9 +214,40 @@ def build_graph() -> StateGraph:
     return builder
 
 
-# Compile the graph (stateless version for simple use cases)
-# For self-hosted deployments with persistence, use get_compiled_graph() instead
-graph = build_graph().compile()
+# Shared builder so node/edge registration runs once per process,
+# no matter how many compiled variants are created from it
+_builder: StateGraph | None = None
+
+# Stateless compiled graph, created on first access of `graph`
+_graph: CompiledStateGraph | None = None
+
+
+def _get_builder() -> StateGraph:
+    """Gets the shared graph builder, building it on first use."""
+    global _builder
+
+    if _builder is None:
+        _builder = build_graph()
+
+    return _builder
+
+
+def __getattr__(name: str) -> CompiledStateGraph:
+    """
+    Lazily compiles the stateless `graph` export (PEP 562 module __getattr__).
+
+    `from src.graph.wellness import graph` and the LangGraph server's
+    langgraph.json entry both resolve through here on first access.
+    For self-hosted deployments with persistence, use get_compiled_graph() instead.
+    """
+    global _graph
+
+    if name == "graph":
+        if _graph is None:
+            _graph = _get_builder().compile()
+        return _graph
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================================================
@@ -254,7 +258,7 @@ graph = build_graph().compile()
 # ============================================================================
 
 # Cached compiled graph with checkpointer (lazy initialization)
-_compiled_graph_with_checkpointer = None
+_compiled_graph_with_checkpointer: CompiledStateGraph | None = None
 
 
 async def get_compiled_graph() -> "CompiledStateGraph":
@@ -291,7 +295,7 @@ async def get_compiled_graph() -> "CompiledStateGraph":
         # Get the checkpointer singleton
         checkpointer = await get_checkpointer()
 
-        # Build and compile with checkpointer
-        _compiled_graph_with_checkpointer = build_graph().compile(checkpointer=checkpointer)
+        # Compile the shared builder with checkpointer
+        _compiled_graph_with_checkpointer = _get_builder().compile(checkpointer=checkpointer)
 
     return _compiled_graph_with_checkpointer
@@ -0,0 +1,203 @@
+"""
+============================================================================
+LLM Call Cache
+============================================================================
+In-process exact-match cache for low-temperature LLM calls.
+
+Routing, classification and extraction calls run at (near-)deterministic
+temperatures, so the same prompt to the same model gives the same answer.
+Caching those results skips the provider round-trip entirely when a prompt
+repeats (e.g. common opening messages in activity detection).
+
+Keys are a SHA-256 of the model settings, the structured output schema (if
+any) and the normalized message list. Text content is lowercased and its
+whitespace collapsed, so prompts differing only in case or spacing share
+an entry. Entries expire after a TTL and the
+least recently used entries are evicted past the size cap.
+
+Concurrent calls with the same key share one upstream request: the first
+caller runs it and later callers await the same task.
+
+Only calls at or below CACHEABLE_MAX_TEMPERATURE are cached; creative calls
+(responses, exercise selection) always go to the provider.
+============================================================================
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import HumanMessage, convert_to_messages
+from langchain_core.prompt_values import PromptValue
+from pydantic import BaseModel
+
+from src.logging_config import NodeLogger
+
+logger = NodeLogger("llm_call_cache")
+
+# Highest temperature whose results are treated as deterministic.
+# Activity detection runs at 0.2 and is the most repeated classification call.
+CACHEABLE_MAX_TEMPERATURE = 0.2
+
+# Capacity and freshness limits
+MAX_ENTRIES = 10_000
+TTL_SECONDS = 60 * 60  # 1 hour
+
+# Runs of whitespace, collapsed to one space in cache keys
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# key -> (stored_at, result); ordered oldest-used first
+_entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+# key -> the upstream call currently running for it
+_inflight: dict[str, asyncio.Task[Any]] = {}
+
+# Number of calls served by joining an in-flight request (for observability)
+coalesced_calls = 0
+
+
+def is_cacheable(temperature: float, invoke_kwargs: dict[str, Any]) -> bool:
+    """
+    Checks whether a call's result may be cached.
+
+    Calls with extra invoke kwargs (config, stop sequences, tools) are not
+    cached, since those can change the result without changing the input.
+    """
+    return temperature <= CACHEABLE_MAX_TEMPERATURE and not invoke_kwargs
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercases text and collapses whitespace runs (each a single C-level pass)."""
+    return _WHITESPACE_RE.sub(" ", text.lower()).strip()
+
+
+def _normalize_input(input: LanguageModelInput) -> list[list[Any]]:
+    """Converts any chat model input into a JSON-serializable message list."""
+    if isinstance(input, str):
+        messages = [HumanMessage(content=input)]
+    elif isinstance(input, PromptValue):
+        messages = input.to_messages()
+    else:
+        messages = convert_to_messages(input)
+    return [
+        [
+            message.type,
+            _normalize_text(message.content)
+            if isinstance(message.content, str)
+            else message.content,
+        ]
+        for message in messages
+    ]
+
+
+def make_key(
+    model_name: str,
+    temperature: float,
+    max_tokens: int,
+    input: LanguageModelInput,
+    schema: type[BaseModel] | None = None,
+) -> str:
+    """Builds the cache key for a call."""
+    payload = {
+        "m": model_name,
+        "t": temperature,
+        "n": max_tokens,
+        "s": f"{schema.__module__}.{schema.__qualname__}" if schema else None,
+        "msg": _normalize_input(input),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _copy(result: Any) -> Any:  # noqa: ANN401
+    """Returns a copy of pydantic results so callers can't mutate the cached value."""
+    if isinstance(result, BaseModel):
+        return result.model_copy(deep=True)
+    return result
+
+
+def get(key: str) -> Any | None:  # noqa: ANN401
+    """
+    Looks up a cached result.
+
+    Returns:
+        A copy of the cached result, or None on a miss or expired entry.
+    """
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+
+    stored_at, result = entry
+    if time.monotonic() - stored_at > TTL_SECONDS:
+        del _entries[key]
+        return None
+
+    _entries.move_to_end(key)
+    return _copy(result)
+
+
+def put(key: str, result: Any) -> None:  # noqa: ANN401
+    """Stores a result, evicting the least recently used entries past MAX_ENTRIES."""
+    if result is None:
+        return
+
+    _entries[key] = (time.monotonic(), _copy(result))
+    _entries.move_to_end(key)
+    while len(_entries) > MAX_ENTRIES:
+        _entries.popitem(last=False)
+
+
+async def _call_and_store(key: str, call: Callable[[], Awaitable[tuple[Any, bool]]]) -> Any:  # noqa: ANN401
+    """Runs the upstream call and caches its result if the call says to."""
+    result, store = await call()
+    if store:
+        put(key, result)
+    return result
+
+
+async def get_or_call(key: str, call: Callable[[], Awaitable[tuple[Any, bool]]]) -> Any:  # noqa: ANN401
+    """
+    Returns the cached result for key, or runs call() to produce it.
+
+    If the same key is already being fetched, waits for that call instead
+    of starting another one. Errors are shared with every waiting caller
+    and are not cached.
+
+    Args:
+        key: Cache key from make_key()
+        call: Zero-argument coroutine factory for the upstream call. It
+              returns (result, store); store is False when the result
+              doesn't match what the key describes (e.g. a fallback
+              model answered), so it's shared with waiters but not cached.
+
+    Returns:
+        The result (a copy, for pydantic results).
+    """
+    global coalesced_calls
+
+    cached = get(key)
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_call_and_store(key, call))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    else:
+        coalesced_calls += 1
+        logger.info("Coalesced in-flight LLM call", coalesced_total=coalesced_calls)
+
+    # Shield so one caller being cancelled doesn't cancel the shared call
+    return _copy(await asyncio.shield(task))
+
+
+def clear() -> None:
+    """Empties the cache (for tests)."""
+    _entries.clear()
@@ -14,22 +14,42 @@ Additional providers:
 - GLM-4.7-Flash: Lightweight, free variant with good speed/quality balance
 - GLM-4.7-FlashX: High-speed, affordable option
 
-Fallback chain (on 429 rate limit errors):
+Fallback chain (on 429 rate limit errors and connection failures):
 - Gemini 2.5 Flash-Lite → Haiku
 - Haiku → Gemini 2.5 Flash-Lite
 - GLM-4.7 → Haiku → GLM-4.7-Flash
 - GLM-4.7-Flash → GLM-4.7-FlashX → Gemini 2.5 Flash-Lite
+
+Each model has a shared circuit breaker: after repeated failures it is
+skipped (straight to the next fallback) until a cooldown has passed.
+Models can also have a local requests/tokens-per-minute budget, and a 429
+with a Retry-After header pauses the model for that long; calls over budget
+go to the next fallback without a round-trip.
+LITE calls also hedge: a slow primary is raced against the first fallback.
 ============================================================================
 """
 
+import asyncio
+import logging
 import os
+import re
+import threading
+import time
+from collections.abc import Awaitable, Callable
 from enum import Enum
+from functools import partial
 from typing import Any
 
+import httpx
+from langchain_anthropic import ChatAnthropic
 from langchain_core.language_models import LanguageModelInput
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.prompt_values import PromptValue
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
+from src.llm import call_cache
 from src.logging_config import NodeLogger
 
 logger = NodeLogger("llm_providers")
@@ -84,22 +104,465 @@ TIER_TO_MODEL: dict[ModelTier, str] = {
     ModelTier.STANDARD: MODEL_HAIKU,
 }
 
+# Model instances are reused across requests, keyed by
+# (model_name, temperature, max_tokens). Each instance owns its HTTP client,
+# so sharing one keeps connection pools (and TLS sessions) warm.
+_llm_cache: dict[tuple[str, float, int], BaseChatModel] = {}
+_llm_cache_lock = threading.Lock()
+
+# ResilientLLM wrappers are reused the same way, keyed by
+# (tier, temperature, max_tokens), so nodes calling create_resilient_llm()
+# per request get a dict lookup instead of a new wrapper (and, via
+# with_structured_output, a new structured-output runnable).
+_resilient_cache: dict[tuple["ModelTier", float, int], "ResilientLLM"] = {}
+
+# Structured-output runnables bound to cached models, keyed by
+# (id(model), schema, sorted kwargs). Binding builds the schema's JSON
+# schema / tool definition, so fallbacks reuse it instead of rebinding per
+# call. The model is kept in the value so its id can't be reused.
+_structured_cache: dict[
+    tuple[int, type[BaseModel], tuple[Any, ...]], tuple[BaseChatModel, Any]
+] = {}
+
+# HTTP connection limits for Gemini clients
+# httpx defaults keep only 20 idle connections, so bursts of concurrent
+# classifications re-handshake. (Anthropic clients already share one
+# process-wide httpx client with the SDK's larger limits.)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "512"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "256"))
+GEMINI_CLIENT_ARGS: dict[str, Any] = {
+    "limits": httpx.Limits(
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+    ),
+    "timeout": httpx.Timeout(60.0, connect=5.0),
+}
+
+
+def _known_rate_limit_types() -> tuple[type[Exception], ...]:
+    """Collects the SDK exception types that always mean HTTP 429."""
+    types: list[type[Exception]] = []
+    try:
+        from anthropic import RateLimitError as AnthropicRateLimitError
+
+        types.append(AnthropicRateLimitError)
+    except ImportError:
+        pass
+    try:
+        from openai import RateLimitError as OpenAIRateLimitError
+
+        types.append(OpenAIRateLimitError)
+    except ImportError:
+        pass
+    try:
+        from google.api_core.exceptions import ResourceExhausted
+
+        types.append(ResourceExhausted)
+    except ImportError:
+        pass
+    return tuple(types)
+
+
+# Typed 429s are matched with isinstance; anything else (e.g. google-genai
+# ClientError, wrapped LangChain errors) falls back to one case-insensitive
+# regex scan of the message instead of lower() plus four substring scans.
+_KNOWN_429_TYPES = _known_rate_limit_types()
+_RL_RE = re.compile(r"429|resource_exhausted|quota|rate limit", re.IGNORECASE)
+
 
 def is_rate_limit_error(error: Exception) -> bool:
     """
     Check if an exception is a rate limit error (429).
 
     Detects rate limits via:
-    - HTTP 429 status code
-    - Error message containing "429", "RESOURCE_EXHAUSTED", or "quota"
-    """
-    error_str = str(error).lower()
-    return (
-        "429" in error_str
-        or "resource_exhausted" in error_str
-        or "quota" in error_str
-        or "rate limit" in error_str
-    )
+    - Known SDK rate limit exception types (Anthropic, OpenAI, Google API core)
+    - Error message containing "429", "RESOURCE_EXHAUSTED", "quota" or "rate limit"
+    """
+    if isinstance(error, _KNOWN_429_TYPES):
+        return True
+    return _RL_RE.search(str(error)) is not None
+
+
+# Connection failures that mean the provider is unreachable (not a bad request)
+_CONNECTION_ERROR_TYPES: tuple[type[Exception], ...] = (
+    httpx.ConnectError,
+    httpx.TimeoutException,
+    asyncio.TimeoutError,
+)
+try:
+    from anthropic import APIConnectionError as AnthropicConnectionError
+
+    _CONNECTION_ERROR_TYPES += (AnthropicConnectionError,)
+except ImportError:
+    pass
+try:
+    from openai import APIConnectionError as OpenAIConnectionError
+
+    _CONNECTION_ERROR_TYPES += (OpenAIConnectionError,)
+except ImportError:
+    pass
+
+
+def is_provider_unavailable_error(error: Exception) -> bool:
+    """
+    Check if an exception means the provider can't serve the call right now.
+
+    Covers rate limits (429) and connection failures/timeouts. These trip
+    the model's circuit breaker and move the call on to the next fallback.
+    """
+    return is_rate_limit_error(error) or isinstance(error, _CONNECTION_ERROR_TYPES)
+
+
+# =============================================================================
+# Circuit Breakers
+# =============================================================================
+# One breaker per model name, shared by every ResilientLLM in the process.
+# After CIRCUIT_FAILURE_THRESHOLD consecutive unavailable errors the breaker
+# opens and calls to that model are skipped (straight to the next fallback)
+# for CIRCUIT_COOLDOWN_SECONDS. Then a single probe call is let through:
+# success closes the breaker, failure re-opens it for another cooldown.
+# This keeps a hard-down provider from costing every request a full connect
+# timeout before falling through.
+
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN_SECONDS = 30.0
+CIRCUIT_HALF_OPEN_MAX_CALLS = 1
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a model's circuit breaker is open and the call is skipped."""
+
+    def __init__(self, model_name: str) -> None:
+        super().__init__(f"Circuit open for model {model_name}")
+        self.model_name = model_name
+
+
+class _CircuitBreaker:
+    """Closed/open/half-open breaker for a single model."""
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = CIRCUIT_COOLDOWN_SECONDS,
+        half_open_max: int = CIRCUIT_HALF_OPEN_MAX_CALLS,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.half_open_max = half_open_max
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.half_open_calls = 0
+
+    def allow_request(self) -> bool:
+        """Returns True if a call may go to the model now."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = "half_open"
+            self.half_open_calls = 0
+        if self.half_open_calls >= self.half_open_max:
+            return False
+        self.half_open_calls += 1
+        return True
+
+    def record_success(self) -> None:
+        """Closes the breaker after the model answered."""
+        self.state = "closed"
+        self.failures = 0
+
+    def record_cancelled(self) -> None:
+        """Releases a half-open probe slot when the probe call was cancelled."""
+        if self.state == "half_open" and self.half_open_calls > 0:
+            self.half_open_calls -= 1
+
+    def record_failure(self) -> None:
+        """Counts an unavailable error, opening the breaker at the threshold."""
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+_breakers: dict[str, _CircuitBreaker] = {}
+
+
+def _get_breaker(model_name: str) -> _CircuitBreaker:
+    """Gets (or creates) the shared circuit breaker for a model."""
+    breaker = _breakers.get(model_name)
+    if breaker is None:
+        breaker = _breakers.setdefault(model_name, _CircuitBreaker())
+    return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Closes all circuit breakers (for tests and manual recovery)."""
+    _breakers.clear()
+
+
+async def _call_with_breaker(
+    model_name: str,
+    call: Callable[[], Awaitable[Any]],
+    tokens: int = 0,
+) -> Any:  # noqa: ANN401
+    """
+    Runs a model call through that model's circuit breaker and rate budget.
+
+    Args:
+        model_name: Model the call goes to
+        call: Zero-argument coroutine factory for the call
+        tokens: Estimated tokens the call uses (see _estimate_tokens)
+
+    Raises:
+        CircuitOpenError: If the breaker is open (the call is not made).
+        RateBudgetExceededError: If the model's rate budget is spent
+            (the call is not made).
+    """
+    breaker = _get_breaker(model_name)
+    if not breaker.allow_request():
+        raise CircuitOpenError(model_name)
+
+    if not _get_rate_budget(model_name).try_acquire(tokens):
+        # Not a health signal; give back a half-open probe slot if we took one
+        breaker.record_cancelled()
+        raise RateBudgetExceededError(model_name)
+
+    try:
+        result = await call()
+    except asyncio.CancelledError:
+        # Lost a hedged race; says nothing about the provider's health
+        breaker.record_cancelled()
+        raise
+    except Exception as e:
+        if is_rate_limit_error(e):
+            retry_after = _retry_after_seconds(e)
+            if retry_after:
+                _get_rate_budget(model_name).pause(retry_after)
+        if is_provider_unavailable_error(e):
+            was_open = breaker.state == "open"
+            breaker.record_failure()
+            if breaker.state == "open" and not was_open:
+                logger.warning("Circuit breaker opened", model=model_name)
+        else:
+            # The provider answered; the error is about this request
+            breaker.record_success()
+        raise
+
+    breaker.record_success()
+    return result
+
+
+def _should_fall_back(error: Exception) -> bool:
+    """True if the next model in the chain should be tried after this error."""
+    return isinstance(
+        error, (CircuitOpenError, RateBudgetExceededError)
+    ) or is_provider_unavailable_error(error)
+
+
+# =============================================================================
+# Rate Limit Budgets
+# =============================================================================
+# One budget per model name, shared process-wide like the breakers. A model
+# with RPM/TPM limits configured refills continuously at those rates, and a
+# call that doesn't fit is skipped to the next fallback instead of being sent
+# and coming back as a 429. Limits default to 0 (unlimited) because they
+# depend on the account's provider tier. Independently, a 429 carrying a
+# Retry-After header pauses the model for that long.
+
+# Model -> (requests per minute, tokens per minute); 0 means no limit
+MODEL_RATE_LIMITS: dict[str, tuple[int, int]] = {
+    MODEL_GEMINI_LITE: (int(os.getenv("GEMINI_RPM", "0")), int(os.getenv("GEMINI_TPM", "0"))),
+    MODEL_HAIKU: (int(os.getenv("ANTHROPIC_RPM", "0")), int(os.getenv("ANTHROPIC_TPM", "0"))),
+}
+
+# Rough characters-per-token ratio used to estimate prompt size
+CHARS_PER_TOKEN = 4
+
+
+class RateBudgetExceededError(RuntimeError):
+    """Raised when a model's rate budget is spent and the call is skipped."""
+
+    def __init__(self, model_name: str) -> None:
+        super().__init__(f"Rate budget exceeded for model {model_name}")
+        self.model_name = model_name
+
+
+class _RateBudget:
+    """Token buckets for one model's requests and tokens per minute."""
+
+    def __init__(self, rpm: int = 0, tpm: int = 0) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = float(rpm)
+        self.tokens = float(tpm)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+
+    def try_acquire(self, tokens: int) -> bool:
+        """Takes one request and `tokens` tokens if both buckets have room."""
+        now = time.monotonic()
+        if now < self.paused_until:
+            return False
+        if not self.rpm and not self.tpm:
+            return True
+
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        if self.rpm:
+            self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+            # A call larger than the whole budget still goes through when it's full
+            tokens = min(tokens, self.tpm)
+
+        if (self.rpm and self.requests < 1) or (self.tpm and self.tokens < tokens):
+            return False
+        if self.rpm:
+            self.requests -= 1
+        if self.tpm:
+            self.tokens -= tokens
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """Rejects calls for the next `seconds` (from a Retry-After header)."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+_rate_budgets: dict[str, _RateBudget] = {}
+
+
+def _get_rate_budget(model_name: str) -> _RateBudget:
+    """Gets (or creates) the shared rate budget for a model."""
+    budget = _rate_budgets.get(model_name)
+    if budget is None:
+        rpm, tpm = MODEL_RATE_LIMITS.get(model_name, (0, 0))
+        budget = _rate_budgets.setdefault(model_name, _RateBudget(rpm, tpm))
+    return budget
+
+
+def reset_rate_budgets() -> None:
+    """Refills all rate budgets and clears Retry-After pauses (for tests)."""
+    _rate_budgets.clear()
+
+
+def _retry_after_seconds(error: Exception) -> float | None:
+    """Reads a numeric Retry-After header from an SDK error's HTTP response, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is None:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        # Missing, or the HTTP-date form
+        return None
+
+
+def _estimate_tokens(input: LanguageModelInput, max_tokens: int) -> int:
+    """Estimates a call's token use: prompt characters / CHARS_PER_TOKEN plus the reply cap."""
+    if isinstance(input, str):
+        chars = len(input)
+    elif isinstance(input, PromptValue):
+        chars = len(input.to_string())
+    else:
+        chars = sum(len(str(getattr(message, "content", message))) for message in input)
+    return chars // CHARS_PER_TOKEN + max_tokens
+
+
+# =============================================================================
+# Hedged Fallback Chain
+# =============================================================================
+# If the primary hasn't answered within the tier's hedge delay, the first
+# fallback is started in parallel and whichever answers first wins (the
+# other is cancelled). Only LITE hedges: its caller (activity detection)
+# sends a short prompt that normally answers well under the delay, so a hedge
+# means the primary is struggling. FAST calls include whole-conversation
+# extraction (profile analysis) that routinely runs past 500ms, and STANDARD
+# calls stream a long response to the user; hedging those would double spend.
+
+HEDGE_DELAY_SECONDS: dict[ModelTier, float] = {
+    ModelTier.LITE: 0.5,
+}
+
+
+async def _invoke_chain(
+    candidates: list[tuple[str, Callable[[], Awaitable[Any]]]],
+    hedge_delay: float | None,
+    tokens: int = 0,
+) -> tuple[str, Any]:
+    """
+    Tries (model_name, call) candidates in order until one succeeds.
+
+    Unavailable errors (rate limits, connection failures, open breakers,
+    spent rate budgets) move on to the next candidate; any other error is raised. While the
+    first candidate is running longer than hedge_delay, the second one is
+    started alongside it. A hedged candidate that fails with any error
+    only loses the race: the other candidate is still awaited, and the
+    error is raised only if nothing else is left running.
+
+    Returns:
+        (name of the model that answered, its result)
+
+    Raises:
+        RuntimeError: If every candidate was unavailable.
+    """
+    queue = list(candidates)
+    pending: dict[asyncio.Task[Any], str] = {}
+    deferred_error: Exception | None = None
+
+    def start_next() -> None:
+        model_name, call = queue.pop(0)
+        if len(queue) < len(candidates) - 1:
+            logger.info("Trying fallback model", model=model_name)
+        task = asyncio.create_task(_call_with_breaker(model_name, call, tokens))
+        pending[task] = model_name
+
+    start_next()
+    hedged = hedge_delay is None
+    try:
+        while pending:
+            timeout = hedge_delay if not hedged and queue else None
+            done, _ = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                hedged = True
+                logger.info("Primary slow, hedging with fallback", primary=candidates[0][0])
+                start_next()
+                continue
+
+            for task in done:
+                model_name = pending.pop(task)
+                error = task.exception()
+                if error is None:
+                    return model_name, task.result()
+                fall_back = _should_fall_back(error)
+                # str() of provider errors can include the whole response body,
+                # so only build it when the warning will actually be emitted
+                if logger.is_enabled_for(logging.WARNING):
+                    logger.warning(
+                        "Model unavailable, trying fallback" if fall_back else "Model call failed",
+                        model=model_name,
+                        error=str(error)[:100],
+                    )
+                if not fall_back:
+                    deferred_error = error
+
+            if not pending:
+                if deferred_error is not None:
+                    raise deferred_error
+                if queue:
+                    start_next()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    tried = ", ".join(model_name for model_name, _ in candidates)
+    raise RuntimeError(f"All models rate limited or unavailable. Tried: {tried}")
 
 
 def create_llm(
@@ -133,31 +596,97 @@ def create_llm(
 
         # Use FAST for routing and structured extraction
         llm = create_llm(tier=ModelTier.FAST, temperature=0.2)
+
+    Note:
+        Instances are cached per (model, temperature, max_tokens), so repeated
+        calls return the same client rather than opening new connections.
     """
-    if tier in (ModelTier.LITE, ModelTier.FAST):
-        return _create_google_lite_model(temperature, max_tokens)
-    else:
-        return _create_anthropic_model(temperature, max_tokens)
+    return _get_model_by_name(TIER_TO_MODEL[tier], temperature, max_tokens)
+
+
+def _get_model_by_name(model_name: str, temperature: float, max_tokens: int) -> BaseChatModel:
+    """
+    Gets the cached model instance for these settings, creating it on first use.
+
+    Used by create_llm(), create_glm() and the fallback chain.
+    """
+    key = (model_name, temperature, max_tokens)
+    model = _llm_cache.get(key)
+    if model is None:
+        with _llm_cache_lock:
+            # Double-checked: another thread may have created it while we waited
+            model = _llm_cache.get(key)
+            if model is None:
+                model = _create_model_by_name(model_name, temperature, max_tokens)
+                _llm_cache[key] = model
+    return model
+
+
+def _bind_structured(
+    model: BaseChatModel,
+    schema: type[BaseModel],
+    kwargs: dict[str, Any],
+) -> Any:  # noqa: ANN401
+    """
+    Returns model.with_structured_output(schema, **kwargs), bound once per model.
+
+    Options with unhashable values are bound without caching.
+    """
+    try:
+        key = (id(model), schema, tuple(sorted(kwargs.items())))
+        entry = _structured_cache.get(key)
+    except TypeError:
+        return model.with_structured_output(schema, **kwargs)
+
+    if entry is None:
+        entry = _structured_cache.setdefault(
+            key, (model, model.with_structured_output(schema, **kwargs))
+        )
+    return entry[1]
+
+
+def clear_llm_cache() -> None:
+    """Drops cached model instances (e.g. after API keys change in tests)."""
+    with _llm_cache_lock:
+        _llm_cache.clear()
+        _resilient_cache.clear()
+        _structured_cache.clear()
+
+
+async def close_llm_clients() -> None:
+    """
+    Closes the HTTP clients of cached model instances and clears the cache.
+
+    Call this during application shutdown so connection pools are closed
+    on the event loop that opened them.
+    """
+    with _llm_cache_lock:
+        models = list(_llm_cache.values())
+        _llm_cache.clear()
+        # Wrappers and bound runnables hold references to the models being closed
+        _resilient_cache.clear()
+        _structured_cache.clear()
+
+    for model in models:
+        aclose = getattr(model, "aclose", None)
+        if aclose is None:
+            continue
+        try:
+            await aclose()
+        except Exception as e:
+            logger.warning("Failed to close LLM client", error=str(e)[:100])
 
 
 def _create_model_by_name(model_name: str, temperature: float, max_tokens: int) -> BaseChatModel:
     """
-    Creates a model instance by model name.
+    Creates a new model instance by model name.
 
-    Used internally for fallback chain handling.
+    Used internally by _get_model_by_name(); callers should go through the cache.
     """
-    if model_name == MODEL_GEMINI_FLASH:
-        return _create_google_model(temperature, max_tokens)
-    elif model_name == MODEL_GEMINI_LITE:
-        return _create_google_lite_model(temperature, max_tokens)
-    elif model_name == MODEL_HAIKU:
-        return _create_anthropic_model(temperature, max_tokens)
-    elif model_name in (MODEL_GLM_4_7, MODEL_GLM_FLASH, MODEL_GLM_FLASHX):
-        return _create_glm_model(model_name, temperature, max_tokens)
-    elif model_name == MODEL_CEREBRAS_GLM:
-        return _create_cerebras_model(temperature, max_tokens)
-    else:
+    factory = _MODEL_FACTORIES.get(model_name)
+    if factory is None:
         raise ValueError(f"Unknown model: {model_name}")
+    return factory(temperature, max_tokens)
 
 
 def _create_anthropic_model(temperature: float, max_tokens: int) -> BaseChatModel:
@@ -171,8 +700,6 @@ def _create_anthropic_model(temperature: float, max_tokens: int) -> BaseChatMode
 
     Requires: ANTHROPIC_API_KEY environment variable
     """
-    from langchain_anthropic import ChatAnthropic
-
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise ValueError(
@@ -192,29 +719,12 @@ def _create_google_model(temperature: float, max_tokens: int) -> BaseChatModel:
     Creates a Google Gemini 2.5 Flash-Lite model instance.
 
     NOTE: This function exists for backward compatibility with MODEL_GEMINI_FLASH.
-    It now uses the same model as _create_google_lite_model (Gemini 2.5 Flash-Lite).
-
-    Used for routing, classification, and simple tasks:
-    - Very fast response times
-    - Excellent for quick decisions
-    - Cost-effective
+    MODEL_GEMINI_FLASH now names the same model as MODEL_GEMINI_LITE, so this
+    delegates to _create_google_lite_model (and shares its cache entry).
 
     Requires: GOOGLE_API_KEY environment variable
     """
-    from langchain_google_genai import ChatGoogleGenerativeAI
-
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "GOOGLE_API_KEY environment variable is required for Google models. "
-            "Get your API key from https://makersuite.google.com/app/apikey"
-        )
-
-    return ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash-lite",
-        temperature=temperature,
-        max_output_tokens=max_tokens,
-    )
+    return _create_google_lite_model(temperature, max_tokens)
 
 
 def _create_google_lite_model(temperature: float, max_tokens: int) -> BaseChatModel:
@@ -228,8 +738,6 @@ def _create_google_lite_model(temperature: float, max_tokens: int) -> BaseChatMo
 
     Requires: GOOGLE_API_KEY environment variable
     """
-    from langchain_google_genai import ChatGoogleGenerativeAI
-
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise ValueError(
@@ -241,6 +749,7 @@ def _create_google_lite_model(temperature: float, max_tokens: int) -> BaseChatMo
         model="gemini-2.5-flash-lite",
         temperature=temperature,
         max_output_tokens=max_tokens,
+        client_args=GEMINI_CLIENT_ARGS,
     )
 
 
@@ -268,8 +777,6 @@ def _create_glm_model(
 
     See: https://docs.z.ai/guides/develop/langchain/introduction
     """
-    from langchain_openai import ChatOpenAI
-
     api_key = os.getenv("ZAI_API_KEY")
     if not api_key:
         raise ValueError(
@@ -313,8 +820,6 @@ def _create_cerebras_model(
 
     See: https://inference-docs.cerebras.ai/api-reference/chat-completions
     """
-    from langchain_openai import ChatOpenAI
-
     api_key = os.getenv("CEREBRAS_API_KEY")
     if not api_key:
         raise ValueError(
@@ -338,6 +843,20 @@ def _create_cerebras_model(
     )
 
 
+# Model name -> factory(temperature, max_tokens), built once at import.
+# MODEL_GEMINI_FLASH and MODEL_GEMINI_LITE are the same name; both factories
+# build the same Flash-Lite client.
+_MODEL_FACTORIES: dict[str, Callable[[float, int], BaseChatModel]] = {
+    MODEL_GEMINI_FLASH: _create_google_model,
+    MODEL_GEMINI_LITE: _create_google_lite_model,
+    MODEL_HAIKU: _create_anthropic_model,
+    MODEL_GLM_4_7: partial(_create_glm_model, MODEL_GLM_4_7),
+    MODEL_GLM_FLASH: partial(_create_glm_model, MODEL_GLM_FLASH),
+    MODEL_GLM_FLASHX: partial(_create_glm_model, MODEL_GLM_FLASHX),
+    MODEL_CEREBRAS_GLM: _create_cerebras_model,
+}
+
+
 def create_glm(
     model: str = MODEL_GLM_4_7,
     temperature: float = 0.7,
@@ -371,7 +890,47 @@ def create_glm(
         # Use FlashX for high-speed, affordable inference
         llm = create_glm(model=MODEL_GLM_FLASHX, temperature=0.2)
     """
-    return _create_glm_model(model, temperature, max_tokens)
+    return _get_model_by_name(model, temperature, max_tokens)
+
+
+# -----------------------------------------------------------------------------
+# Connection Warmup
+# -----------------------------------------------------------------------------
+
+# (tier, temperature, max_tokens) of the clients on the request path:
+# generate_response (STANDARD defaults) and detect_activity (LITE).
+# Warming these exact cached instances opens the connections they will reuse.
+WARMUP_LLM_SETTINGS: list[tuple[ModelTier, float, int]] = [
+    (ModelTier.STANDARD, 0.7, 1024),
+    (ModelTier.LITE, 0.2, 200),
+]
+WARMUP_TIMEOUT_SECONDS = 10.0
+
+
+async def warmup_llms() -> None:
+    """
+    Opens LLM provider connections before the first user request.
+
+    Sends a tiny prompt through each request-path client so the TCP/TLS
+    handshake happens at startup instead of on the first message.
+    Failures and timeouts are logged and ignored - warmup is best-effort.
+    """
+
+    async def ping(tier: ModelTier, temperature: float, max_tokens: int) -> None:
+        try:
+            llm = create_llm(tier, temperature, max_tokens)
+            await llm.ainvoke("Reply with OK.")
+        except Exception as e:
+            logger.warning("LLM warmup failed (non-critical)", tier=tier.value, error=str(e)[:100])
+
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(ping(*settings) for settings in WARMUP_LLM_SETTINGS)),
+            timeout=WARMUP_TIMEOUT_SECONDS,
+        )
+        logger.info("LLM connections warmed")
+    except TimeoutError:
+        logger.warning("LLM warmup timed out (non-critical)")
 
 
 # -----------------------------------------------------------------------------
@@ -379,12 +938,19 @@ def create_glm(
 # -----------------------------------------------------------------------------
 
 
+def _as_is(model: BaseChatModel) -> BaseChatModel:
+    """Fallback adapter for plain (unstructured) calls."""
+    return model
+
+
 class ResilientLLM:
     """
     Wrapper around BaseChatModel that provides automatic fallback on rate limits.
 
-    When a 429 rate limit error is encountered, automatically retries with
-    the next model in the fallback chain.
+    When a 429 rate limit error or connection failure is encountered,
+    automatically retries with the next model in the fallback chain.
+    Models whose circuit breaker is open or whose rate budget is spent
+    are skipped.
 
     Fallback chain:
     - Gemini 2.5 Flash-Lite → Haiku
@@ -395,6 +961,19 @@ class ResilientLLM:
         result = await llm.ainvoke(messages)  # Auto-fallback on 429
     """
 
+    # Wrappers are long-lived and read on every call; slots keep attribute
+    # access on the fast path and the instances small
+    __slots__ = (
+        "_structured",
+        "fallback_names",
+        "hedge_delay",
+        "max_tokens",
+        "primary",
+        "primary_model_name",
+        "temperature",
+        "tier",
+    )
+
     def __init__(
         self,
         tier: ModelTier,
@@ -410,7 +989,13 @@ class ResilientLLM:
         self.primary = create_llm(tier, temperature, max_tokens)
 
         # Get fallback model names
-        self.fallback_names = FALLBACK_CHAIN.get(self.primary_model_name, [])
+        self.fallback_names = tuple(FALLBACK_CHAIN.get(self.primary_model_name, ()))
+
+        # How long to wait on the primary before racing the first fallback
+        self.hedge_delay = HEDGE_DELAY_SECONDS.get(tier)
+
+        # Structured output wrappers, built once per schema
+        self._structured: dict[type[BaseModel], ResilientStructuredLLM] = {}
 
     async def ainvoke(
         self,
@@ -419,41 +1004,78 @@ class ResilientLLM:
     ) -> Any:  # noqa: ANN401
         """
         Invoke the LLM with automatic fallback on rate limit errors.
+
+        Low-temperature calls are answered from the call cache when the
+        same input was seen recently, and identical concurrent calls share
+        one request (see src.llm.call_cache).
         """
-        # Try primary model
-        try:
-            return await self.primary.ainvoke(input, **kwargs)
-        except Exception as e:
-            if not is_rate_limit_error(e):
-                raise
+        return await self._ainvoke(input, kwargs, self.primary, _as_is)
 
-            logger.warning(
-                "Rate limit hit, trying fallback",
-                primary=self.primary_model_name,
-                error=str(e)[:100],
+    async def _ainvoke(
+        self,
+        input: LanguageModelInput,
+        invoke_kwargs: dict[str, Any],
+        primary: Any,  # noqa: ANN401
+        adapt: Callable[[BaseChatModel], Any],
+        schema: type[BaseModel] | None = None,
+        cacheable: bool = True,
+    ) -> Any:  # noqa: ANN401
+        """
+        Shared call path for plain and structured invocations.
+
+        Args:
+            input: The model input
+            invoke_kwargs: Extra kwargs for ainvoke()
+            primary: Runnable for the primary model (raw or structured)
+            adapt: Turns a fallback model into the matching runnable
+            schema: Structured output schema, part of the cache key
+            cacheable: False to bypass the call cache (e.g. custom bind options)
+        """
+        if not cacheable or not call_cache.is_cacheable(self.temperature, invoke_kwargs):
+            _, result = await self._ainvoke_with_fallback(input, invoke_kwargs, primary, adapt)
+            return result
+
+        async def call() -> tuple[Any, bool]:
+            model_name, result = await self._ainvoke_with_fallback(
+                input, invoke_kwargs, primary, adapt
             )
+            # The key names the primary; a fallback's answer isn't stored under it
+            return result, model_name == self.primary_model_name
+
+        key = call_cache.make_key(
+            self.primary_model_name, self.temperature, self.max_tokens, input, schema
+        )
+        return await call_cache.get_or_call(key, call)
 
-        # Try fallback models
+    async def _ainvoke_with_fallback(
+        self,
+        input: LanguageModelInput,
+        invoke_kwargs: dict[str, Any],
+        primary: Any,  # noqa: ANN401
+        adapt: Callable[[BaseChatModel], Any],
+    ) -> tuple[str, Any]:
+        """
+        Walk the fallback chain until a model answers, hedging a slow primary.
+
+        Models whose circuit breaker is open or whose rate budget is spent
+        are skipped without a call.
+
+        Returns:
+            (name of the model that answered, its response)
+        """
+        candidates: list[tuple[str, Callable[[], Awaitable[Any]]]] = [
+            (self.primary_model_name, lambda: primary.ainvoke(input, **invoke_kwargs))
+        ]
         for fallback_name in self.fallback_names:
-            try:
-                logger.info("Trying fallback model", model=fallback_name)
-                fallback = _create_model_by_name(fallback_name, self.temperature, self.max_tokens)
-                return await fallback.ainvoke(input, **kwargs)
-            except Exception as e:
-                if not is_rate_limit_error(e):
-                    raise
-                logger.warning(
-                    "Fallback also rate limited",
-                    model=fallback_name,
-                    error=str(e)[:100],
-                )
-                continue
 
-        # All fallbacks exhausted
-        raise RuntimeError(
-            f"All models rate limited. Tried: {self.primary_model_name}, "
-            f"{', '.join(self.fallback_names)}"
-        )
+            def call_fallback(name: str = fallback_name) -> Awaitable[Any]:
+                fallback = _get_model_by_name(name, self.temperature, self.max_tokens)
+                return adapt(fallback).ainvoke(input, **invoke_kwargs)
+
+            candidates.append((fallback_name, call_fallback))
+
+        tokens = _estimate_tokens(input, self.max_tokens)
+        return await _invoke_chain(candidates, self.hedge_delay, tokens)
 
     def with_structured_output(
         self,
@@ -462,8 +1084,16 @@ class ResilientLLM:
     ) -> "ResilientStructuredLLM":
         """
         Return a wrapper that handles structured output with fallback.
+
+        Wrappers without extra options are cached per schema.
         """
-        return ResilientStructuredLLM(self, schema, **kwargs)
+        if kwargs:
+            return ResilientStructuredLLM(self, schema, **kwargs)
+
+        structured = self._structured.get(schema)
+        if structured is None:
+            structured = self._structured.setdefault(schema, ResilientStructuredLLM(self, schema))
+        return structured
 
 
 class ResilientStructuredLLM:
@@ -471,6 +1101,8 @@ class ResilientStructuredLLM:
     Wrapper for structured output with fallback support.
     """
 
+    __slots__ = ("kwargs", "primary", "resilient_llm", "schema")
+
     def __init__(
         self,
         resilient_llm: ResilientLLM,
@@ -481,6 +1113,9 @@ class ResilientStructuredLLM:
         self.schema = schema
         self.kwargs = kwargs
 
+        # Reuse the primary client the ResilientLLM already holds
+        self.primary = _bind_structured(resilient_llm.primary, schema, kwargs)
+
     async def ainvoke(
         self,
         input: LanguageModelInput,
@@ -488,51 +1123,24 @@ class ResilientStructuredLLM:
     ) -> Any:  # noqa: ANN401
         """
         Invoke structured LLM with automatic fallback on rate limit errors.
-        """
-        tier = self.resilient_llm.tier
-        temp = self.resilient_llm.temperature
-        max_tok = self.resilient_llm.max_tokens
-        primary_name = self.resilient_llm.primary_model_name
-        fallback_names = self.resilient_llm.fallback_names
 
-        # Try primary model
-        try:
-            primary = create_llm(tier, temp, max_tok)
-            structured = primary.with_structured_output(self.schema, **self.kwargs)
-            return await structured.ainvoke(input, **invoke_kwargs)
-        except Exception as e:
-            if not is_rate_limit_error(e):
-                raise
-
-            logger.warning(
-                "Rate limit hit on structured call, trying fallback",
-                primary=primary_name,
-                error=str(e)[:100],
-            )
-
-        # Try fallback models
-        for fallback_name in fallback_names:
-            try:
-                logger.info("Trying fallback model", model=fallback_name)
-                fallback = _create_model_by_name(fallback_name, temp, max_tok)
-                structured = fallback.with_structured_output(self.schema, **self.kwargs)
-                return await structured.ainvoke(input, **invoke_kwargs)
-            except Exception as e:
-                if not is_rate_limit_error(e):
-                    raise
-                logger.warning(
-                    "Fallback also rate limited",
-                    model=fallback_name,
-                    error=str(e)[:100],
-                )
-                continue
-
-        # All fallbacks exhausted
-        raise RuntimeError(
-            f"All models rate limited for structured output. "
-            f"Tried: {primary_name}, {', '.join(fallback_names)}"
+        Low-temperature calls are answered from the call cache when the
+        same input was seen recently, and identical concurrent calls share
+        one request (see src.llm.call_cache).
+        """
+        return await self.resilient_llm._ainvoke(
+            input,
+            invoke_kwargs,
+            self.primary,
+            self._bind,
+            schema=self.schema,
+            cacheable=not self.kwargs,
         )
 
+    def _bind(self, model: BaseChatModel) -> Any:  # noqa: ANN401
+        """Binds this wrapper's schema to a fallback model."""
+        return _bind_structured(model, self.schema, self.kwargs)
+
 
 def create_resilient_llm(
     tier: ModelTier = ModelTier.STANDARD,
@@ -560,5 +1168,15 @@ def create_resilient_llm(
         # With structured output
         structured = llm.with_structured_output(MySchema)
         result = await structured.ainvoke(prompt)
+
+    Note:
+        Instances are cached per (tier, temperature, max_tokens), like the
+        underlying models in create_llm().
     """
-    return ResilientLLM(tier, temperature, max_tokens)
+    key = (tier, temperature, max_tokens)
+    llm = _resilient_cache.get(key)
+    if llm is None:
+        # Built outside _llm_cache_lock: the constructor takes it via create_llm().
+        # setdefault keeps the first wrapper if two threads race here.
+        llm = _resilient_cache.setdefault(key, ResilientLLM(tier, temperature, max_tokens))
+    return llm
@@ -42,6 +42,15 @@ class Colors:
     VALUE = "\033[37m"  # White
 
 
+class NoColors(Colors):
+    """Empty color codes, for output that isn't a terminal (Docker, CI, files)."""
+
+    RESET = BOLD = DIM = ""
+    INFO = WARNING = ERROR = DEBUG = ""
+    NODE_START = NODE_END = ""
+    KEY = VALUE = ""
+
+
 # ============================================================================
 # Custom Formatter
 # ============================================================================
@@ -52,67 +61,53 @@ class ReadableFormatter(logging.Formatter):
     Custom log formatter with better readability.
 
     Features:
-    - Colored output based on log level
+    - Colored output based on log level (plain text when colors=False)
     - Clean timestamp format
     - Multi-line support
     - Context key-value pairs on separate lines
     """
 
+    def __init__(self, colors: bool = True) -> None:
+        super().__init__()
+        self.colors: type[Colors] = Colors if colors else NoColors
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with colors and structure."""
+        c = self.colors
+
         # Format timestamp
         timestamp = self.formatTime(record, "%H:%M:%S")
 
         # Color code based on level
         level_colors = {
-            "DEBUG": Colors.DEBUG,
-            "INFO": Colors.INFO,
-            "WARNING": Colors.WARNING,
-            "ERROR": Colors.ERROR,
+            "DEBUG": c.DEBUG,
+            "INFO": c.INFO,
+            "WARNING": c.WARNING,
+            "ERROR": c.ERROR,
         }
-        level_color = level_colors.get(record.levelname, Colors.RESET)
+        level_color = level_colors.get(record.levelname, c.RESET)
 
         # Build the main log line
         parts = [
-            f"{Colors.DIM}{timestamp}{Colors.RESET}",
-            f"{level_color}{record.levelname:8}{Colors.RESET}",
-            f"{Colors.BOLD}{record.name}{Colors.RESET}",
+            f"{c.DIM}{timestamp}{c.RESET}",
+            f"{level_color}{record.levelname:8}{c.RESET}",
+            f"{c.BOLD}{record.name}{c.RESET}",
             record.getMessage(),
         ]
 
         log_line = " | ".join(parts)
 
-        # Add context if available (stored in record.__dict__)
-        context_items = []
-        for key, value in record.__dict__.items():
-            # Skip standard logging attributes
-            if key not in {
-                "name",
-                "msg",
-                "args",
-                "created",
-                "filename",
-                "funcName",
-                "levelname",
-                "levelno",
-                "lineno",
-                "module",
-                "msecs",
-                "message",
-                "pathname",
-                "process",
-                "processName",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-                "taskName",
-            }:
-                context_items.append(
-                    f"  {Colors.KEY}{key}{Colors.RESET}: {Colors.VALUE}{value}{Colors.RESET}"
-                )
+        # Add context if available (NodeLogger stores it as a single record.ctx
+        # dict, so there's no need to scan and filter record.__dict__)
+        context = getattr(record, "ctx", None)
+        context_items = (
+            [
+                f"  {c.KEY}{key}{c.RESET}: {c.VALUE}{value}{c.RESET}"
+                for key, value in context.items()
+            ]
+            if context
+            else []
+        )
 
         if context_items:
             log_line += "\n" + "\n".join(context_items)
@@ -130,7 +125,8 @@ def configure_logging(dev_mode: bool = True) -> None:
     Configure application logging with readable formatting.
 
     Args:
-        dev_mode: If True, uses human-readable console output with colors.
+        dev_mode: If True, uses human-readable console output (colored
+                  only when stdout is a terminal).
                   If False, uses simple text formatting.
     """
     # Get root logger
@@ -146,7 +142,8 @@ def configure_logging(dev_mode: bool = True) -> None:
 
     # Set formatter based on mode
     if dev_mode:
-        formatter = ReadableFormatter()
+        # ANSI codes are just extra bytes in Docker logs, journald and CI
+        formatter = ReadableFormatter(colors=sys.stdout.isatty())
     else:
         # Production: Simple text format
         formatter = logging.Formatter(
@@ -175,6 +172,10 @@ def configure_logging(dev_mode: bool = True) -> None:
 # ============================================================================
 
 
+# Separator line around node start/end banners
+_SEP = "─" * 70
+
+
 class NodeLogger:
     """
     Specialized logger for LangGraph nodes with better formatting.
@@ -188,45 +189,61 @@ class NodeLogger:
         self.node_name = node_name
         self.logger = logging.getLogger(f"node.{node_name}")
 
+        # Banners are fixed per node, so build them once
+        self._start_msg = f"\n{_SEP}\n▶ {node_name.upper()}"
+        self._end_msg = f"✓ {node_name.upper()}\n{_SEP}\n"
+
     def node_start(self, **context: object) -> None:
         """Log node execution start with visual separator."""
-        separator = "─" * 70
-        message = f"\n{separator}\n▶ {self.node_name.upper()}"
-        self._log_with_context(logging.INFO, message, context)
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log_with_context(logging.INFO, self._start_msg, context)
 
     def node_end(self, **context: object) -> None:
         """Log node execution end with visual separator."""
-        separator = "─" * 70
-        message = f"✓ {self.node_name.upper()}\n{separator}\n"
-        self._log_with_context(logging.INFO, message, context)
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log_with_context(logging.INFO, self._end_msg, context)
 
     def info(self, message: str, **context: object) -> None:
         """Log info message with node context."""
-        formatted_msg = f"[{self.node_name}] {message}"
-        self._log_with_context(logging.INFO, formatted_msg, context)
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log_with_context(logging.INFO, f"[{self.node_name}] {message}", context)
 
     def debug(self, message: str, **context: object) -> None:
         """Log debug message with node context."""
-        formatted_msg = f"[{self.node_name}] {message}"
-        self._log_with_context(logging.DEBUG, formatted_msg, context)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log_with_context(logging.DEBUG, f"[{self.node_name}] {message}", context)
 
     def warning(self, message: str, **context: object) -> None:
         """Log warning message with node context."""
-        formatted_msg = f"[{self.node_name}] {message}"
-        self._log_with_context(logging.WARNING, formatted_msg, context)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._log_with_context(logging.WARNING, f"[{self.node_name}] {message}", context)
 
     def error(self, message: str, **context: object) -> None:
         """Log error message with node context."""
-        formatted_msg = f"[{self.node_name}] {message}"
-        self._log_with_context(logging.ERROR, formatted_msg, context)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._log_with_context(logging.ERROR, f"[{self.node_name}] {message}", context)
+
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Checks whether a message at this level would be logged.
+
+        Use it to skip building expensive context values (e.g. str() of an
+        exception carrying a full HTTP response body) when the level is filtered.
+        """
+        return self.logger.isEnabledFor(level)
 
     def _log_with_context(self, level: int, message: str, context: dict[str, object]) -> None:
         """
-        Internal method to log with context as extra fields.
+        Internal method to log with context as a single extra field.
 
-        This allows the formatter to access context values for pretty printing.
+        The context dict is attached as record.ctx, which the formatter reads
+        directly for pretty printing. Callers check the level first, so a
+        filtered message costs no string formatting.
         """
-        self.logger.log(level, message, extra=context)
+        if context:
+            self.logger.log(level, message, extra={"ctx": context})
+        else:
+            self.logger.log(level, message)
 
 
 # ============================================================================
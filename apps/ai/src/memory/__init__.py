@@ -30,16 +30,20 @@ Usage:
 from src.memory.embeddings import format_memory_text, generate_embedding
 from src.memory.store import (
     Memory,
+    MemoryPair,
     format_memories_for_prompt,
     search_memories,
+    store_memories_bulk,
     store_memory,
 )
 
 __all__ = [
     "Memory",
+    "MemoryPair",
     "format_memories_for_prompt",
     "format_memory_text",
     "generate_embedding",
     "search_memories",
+    "store_memories_bulk",
     "store_memory",
 ]
@@ -5,8 +5,10 @@ Cache Module
 Redis-based caching for embeddings and conversation messages.
 
 Features:
-- Embedding cache: Per-user isolation, LRU eviction, 7-day TTL
+- Embedding cache: Per-user isolation, LRU eviction, 7-day TTL,
+  stored quantized to int8 (approximate, ~1e-3 cosine error)
 - Message cache: Per-conversation storage, 24-hour TTL, write-through pattern
+- Recent memories: Hashes of each user's last few stored memory texts
 - Graceful fallback on Redis failures
 - Async operations using redis-py asyncio
 
@@ -18,6 +20,9 @@ Usage - Embeddings:
         embedding = await generate_embedding(text)
         await cache_embedding(user_id, text, embedding)
 
+    # Many texts at once: one MGET and one LRU update
+    embeddings = await get_cached_embeddings_bulk(user_id, texts)
+
 Usage - Messages:
     from src.memory.cache import get_cached_messages, cache_messages, append_messages
 
@@ -30,11 +35,15 @@ Usage - Messages:
 """
 
 import hashlib
-import json
 import os
+import re
 import time
+from functools import lru_cache
 
+import numpy as np
+import orjson
 import redis.asyncio as redis
+from redis.exceptions import NoScriptError
 
 from src.logging_config import NodeLogger
 
@@ -45,12 +54,34 @@ logger = NodeLogger("cache")
 MAX_ENTRIES_PER_USER = 1000
 EMBEDDING_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days
 REDIS_CONNECT_TIMEOUT = 2.0  # seconds
+REDIS_HEALTH_CHECK_SECONDS = 30.0  # Re-PING a cached client at most this often
+REDIS_MAX_CONNECTIONS = 8  # Per pool; callers wait for a free connection past this
+REDIS_POOL_TIMEOUT = 20.0  # seconds to wait for a free connection before failing
 
 # Message cache configuration
 MAX_CACHED_MESSAGES = 10_000  # Total messages across all cached conversations
 MESSAGES_TTL_SECONDS = 24 * 60 * 60  # 24 hours (matches frontend TTL)
 MESSAGES_LRU_KEY = "conv_msgs_lru"  # Sorted set: conversation_id -> last_access_timestamp
 MESSAGES_COUNTS_KEY = "conv_msgs_counts"  # Hash: conversation_id -> message_count
+MESSAGES_TOTAL_KEY = "conv_msgs_total"  # Integer: sum of MESSAGES_COUNTS_KEY values
+
+# Recent memory texts, for skipping repeated turns before they're embedded
+RECENT_MEMORIES_PER_USER = 16
+RECENT_MEMORIES_TTL_SECONDS = 24 * 60 * 60  # 24 hours
+
+# Embeddings are stored as a float32 scale followed by int8 values with a
+# symmetric per-vector scale (dim + 4 bytes, e.g. 772 for 768 dims). Cached
+# embeddings are only used for similarity lookups (memory search and the
+# semantic response cache), where the ~1e-3 cosine error doesn't matter.
+# The version in the key (value format + text hash) keeps entries written
+# in older formats, or under the old SHA-256 text hashes, from being read;
+# they expire on their own TTL.
+EMBEDDING_KEY_VERSION = "q8b2"
+_SCALE_DTYPE = np.dtype("<f4")
+_INT8_MAX = 127
+
+# Whitespace runs are collapsed before hashing embedding keys
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 def _get_redis_url() -> str | None:
@@ -73,9 +104,35 @@ def _get_shared_redis_url() -> str | None:
 
 # Global connection pools (initialized lazily)
 # Local Redis pool - for AI-only caching (embeddings)
-_redis_pool: redis.ConnectionPool | None = None
+_redis_pool: redis.BlockingConnectionPool | None = None
 # Shared Redis pool - for frontend/backend shared caching (messages)
-_shared_redis_pool: redis.ConnectionPool | None = None
+# (unused when REDIS_SHARED_URL is the same server as the local pool)
+_shared_redis_pool: redis.BlockingConnectionPool | None = None
+
+# Clients are reused across calls and only PINGed every
+# REDIS_HEALTH_CHECK_SECONDS (or after a failed PING), instead of costing
+# every cache operation an extra round-trip. A client is rebuilt whenever
+# its pool is replaced.
+_redis_client: redis.Redis | None = None
+_redis_checked_at = 0.0
+_shared_redis_client: redis.Redis | None = None
+_shared_redis_checked_at = 0.0
+
+
+def _create_pool(redis_url: str) -> redis.BlockingConnectionPool:
+    """
+    Creates a bounded connection pool for a Redis URL.
+
+    A blocking pool makes bursts wait for a free connection (up to
+    REDIS_POOL_TIMEOUT) instead of opening more than REDIS_MAX_CONNECTIONS.
+    """
+    return redis.BlockingConnectionPool.from_url(
+        redis_url,
+        max_connections=REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        socket_keepalive=True,
+    )
 
 
 async def get_redis_client() -> redis.Redis | None:
@@ -86,12 +143,13 @@ async def get_redis_client() -> redis.Redis | None:
     Uses REDIS_URL/REDIS_URI environment variable.
 
     Returns None if Redis is not configured or unavailable.
-    Uses a global connection pool for efficiency.
+    Uses a global connection pool for efficiency; the client is reused and
+    health-checked at most every REDIS_HEALTH_CHECK_SECONDS.
 
     Returns:
         redis.Redis instance or None if unavailable.
     """
-    global _redis_pool
+    global _redis_pool, _redis_client, _redis_checked_at
 
     redis_url = _get_redis_url()
     if not redis_url:
@@ -103,17 +161,20 @@ async def get_redis_client() -> redis.Redis | None:
             # Log the Redis URL (mask password for security)
             masked_url = redis_url.split("@")[-1] if "@" in redis_url else redis_url[:30] + "..."
             logger.info("Creating LOCAL Redis connection pool", redis_host=masked_url)
-            _redis_pool = redis.ConnectionPool.from_url(
-                redis_url,
-                max_connections=10,
-                socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
-            )
-
-        client = redis.Redis(connection_pool=_redis_pool)
-        # Quick health check
-        await client.ping()
-        return client
+            _redis_pool = _create_pool(redis_url)
+
+        if _redis_client is None or _redis_client.connection_pool is not _redis_pool:
+            _redis_client = redis.Redis(connection_pool=_redis_pool)
+            _redis_checked_at = 0.0
+
+        # Quick health check, skipped if one passed recently
+        now = time.monotonic()
+        if now - _redis_checked_at >= REDIS_HEALTH_CHECK_SECONDS:
+            await _redis_client.ping()
+            _redis_checked_at = now
+        return _redis_client
     except Exception as e:
+        _redis_checked_at = 0.0
         logger.error("Local Redis connection FAILED", error=str(e))
         return None
 
@@ -127,44 +188,76 @@ async def get_shared_redis_client() -> redis.Redis | None:
     should point to a remote Redis instance (e.g., Upstash).
 
     Returns None if Redis is not configured or unavailable.
-    Uses a global connection pool for efficiency.
+    Uses a global connection pool for efficiency; the client is reused and
+    health-checked at most every REDIS_HEALTH_CHECK_SECONDS. If
+    REDIS_SHARED_URL points at the same server as the local client, that
+    client (and its pool) is returned instead of opening a second pool.
 
     Returns:
         redis.Redis instance or None if unavailable.
     """
-    global _shared_redis_pool
+    global _shared_redis_pool, _shared_redis_client, _shared_redis_checked_at
 
     redis_url = _get_shared_redis_url()
     if not redis_url:
         logger.warning("REDIS_SHARED_URL not configured - shared message cache disabled")
         return None
+    if redis_url == _get_redis_url():
+        return await get_redis_client()
 
     try:
         if _shared_redis_pool is None:
             # Log the Redis URL (mask password for security)
             masked_url = redis_url.split("@")[-1] if "@" in redis_url else redis_url[:30] + "..."
             logger.info("Creating SHARED Redis connection pool (Upstash)", redis_host=masked_url)
-            _shared_redis_pool = redis.ConnectionPool.from_url(
-                redis_url,
-                max_connections=10,
-                socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
-            )
-
-        client = redis.Redis(connection_pool=_shared_redis_pool)
-        # Quick health check
-        await client.ping()
-        return client
+            _shared_redis_pool = _create_pool(redis_url)
+
+        if (
+            _shared_redis_client is None
+            or _shared_redis_client.connection_pool is not _shared_redis_pool
+        ):
+            _shared_redis_client = redis.Redis(connection_pool=_shared_redis_pool)
+            _shared_redis_checked_at = 0.0
+
+        # Quick health check, skipped if one passed recently
+        now = time.monotonic()
+        if now - _shared_redis_checked_at >= REDIS_HEALTH_CHECK_SECONDS:
+            await _shared_redis_client.ping()
+            _shared_redis_checked_at = now
+        return _shared_redis_client
     except Exception as e:
+        _shared_redis_checked_at = 0.0
         logger.error("Shared Redis connection FAILED", error=str(e))
         return None
 
 
+async def _run_script(client: redis.Redis, script: str, sha: str, *keys_and_args: object) -> object:
+    """
+    Runs a Lua script by SHA, sending the source only if Redis hasn't cached it.
+
+    Args:
+        client: The Redis client instance.
+        script: The Lua source.
+        sha: SHA-1 of the source (what EVALSHA looks up).
+        *keys_and_args: numkeys, then the keys, then the arguments.
+    """
+    try:
+        return await client.evalsha(sha, *keys_and_args)
+    except NoScriptError:
+        # First run on this server (or after SCRIPT FLUSH); EVAL also caches it
+        return await client.eval(script, *keys_and_args)
+
+
+@lru_cache(maxsize=4096)
 def _hash_text(text: str) -> str:
     """
     Creates a deterministic hash of text for cache keys.
 
-    Normalizes text before hashing for consistent cache hits.
-    Returns first 16 chars of SHA-256 hash.
+    Normalizes text (lowercase, whitespace runs collapsed) before hashing
+    for consistent cache hits. Uses an 8-byte BLAKE2b digest, which is
+    faster than SHA-256 for short inputs and gives the same key length.
+    Results are memoized, since a lookup and the store after a miss hash
+    the same text and common prompts repeat across users.
 
     Args:
         text: The text to hash.
@@ -172,14 +265,28 @@ def _hash_text(text: str) -> str:
     Returns:
         16-character hex string hash.
     """
-    normalized = text.strip().lower()
-    hash_bytes = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
-    return hash_bytes[:16]
+    normalized = _WHITESPACE_RE.sub(" ", text.lower()).strip()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
 
 
 def _embedding_key(user_id: str, text_hash: str) -> str:
     """Constructs the Redis key for an embedding."""
-    return f"embedding:{user_id}:{text_hash}"
+    return f"embedding:{EMBEDDING_KEY_VERSION}:{user_id}:{text_hash}"
+
+
+def _pack_embedding(embedding: list[float]) -> bytes:
+    """Quantizes an embedding to int8 bytes prefixed with its float32 scale."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    scale = np.float32(np.abs(vector).max(initial=0.0) / _INT8_MAX) or np.float32(1.0)
+    values = np.round(vector / scale).astype(np.int8)
+    return np.array(scale, dtype=_SCALE_DTYPE).tobytes() + values.tobytes()
+
+
+def _unpack_embedding(data: bytes) -> list[float]:
+    """Dequantizes bytes from _pack_embedding back into a list of floats."""
+    scale = np.frombuffer(data, dtype=_SCALE_DTYPE, count=1)[0]
+    values = np.frombuffer(data, dtype=np.int8, offset=_SCALE_DTYPE.itemsize)
+    return (values.astype(np.float32) * scale).tolist()
 
 
 def _lru_key(user_id: str) -> str:
@@ -206,20 +313,61 @@ async def get_cached_embedding(user_id: str, text: str) -> list[float] | None:
     key = _embedding_key(user_id, text_hash)
 
     try:
-        data = await client.get(key)
+        # GET and the LRU touch share one round-trip. XX only updates hashes
+        # that are already tracked, so a miss doesn't add an LRU entry.
+        pipe = client.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.zadd(_lru_key(user_id), {text_hash: time.time()}, xx=True)
+        data, _ = await pipe.execute()
         if data is None:
             return None
 
-        # Update LRU timestamp on cache hit
-        lru_key = _lru_key(user_id)
-        await client.zadd(lru_key, {text_hash: time.time()})
-
-        return json.loads(data)
+        return _unpack_embedding(data)
     except Exception as e:
         print(f"[cache] Error retrieving embedding: {e}")
         return None
 
 
+async def get_cached_embeddings_bulk(user_id: str, texts: list[str]) -> list[list[float] | None]:
+    """
+    Retrieves cached embeddings for several texts in one round-trip.
+
+    Pipelines a single MGET for every key with a single ZADD XX that
+    refreshes the LRU timestamps of the hits, instead of a GET and ZADD
+    per text.
+
+    Args:
+        user_id: The user ID for cache isolation.
+        texts: The texts whose embeddings to retrieve.
+
+    Returns:
+        One entry per text, in order: the cached embedding, or None on a miss.
+        All None if Redis is unavailable or errors.
+    """
+    misses: list[list[float] | None] = [None] * len(texts)
+    if not texts:
+        return misses
+
+    client = await get_redis_client()
+    if client is None:
+        return misses
+
+    hashes = [_hash_text(text) for text in texts]
+    keys = [_embedding_key(user_id, text_hash) for text_hash in hashes]
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.mget(keys)
+        # XX: only hashes already tracked (i.e. the hits) are updated
+        pipe.zadd(_lru_key(user_id), dict.fromkeys(hashes, time.time()), xx=True)
+        values, _ = await pipe.execute()
+
+        return [_unpack_embedding(value) if value is not None else None for value in values]
+    except Exception as e:
+        print(f"[cache] Error retrieving embeddings: {e}")
+        return misses
+
+
 async def cache_embedding(user_id: str, text: str, embedding: list[float]) -> bool:
     """
     Stores an embedding in the cache.
@@ -241,14 +389,15 @@ async def cache_embedding(user_id: str, text: str, embedding: list[float]) -> bo
     lru_key = _lru_key(user_id)
 
     try:
-        # Store embedding with TTL
-        await client.setex(key, EMBEDDING_TTL_SECONDS, json.dumps(embedding))
-
-        # Update LRU sorted set
-        await client.zadd(lru_key, {text_hash: time.time()})
+        # Store embedding with TTL, update the LRU sorted set and read its
+        # size in one round-trip
+        pipe = client.pipeline(transaction=False)
+        pipe.setex(key, EMBEDDING_TTL_SECONDS, _pack_embedding(embedding))
+        pipe.zadd(lru_key, {text_hash: time.time()})
+        pipe.zcard(lru_key)
+        _, _, count = await pipe.execute()
 
         # Check if eviction needed
-        count = await client.zcard(lru_key)
         if count > MAX_ENTRIES_PER_USER:
             await _evict_oldest_entries(client, user_id, lru_key)
 
@@ -258,6 +407,23 @@ async def cache_embedding(user_id: str, text: str, embedding: list[float]) -> bo
         return False
 
 
+# Pops the oldest hashes from a user's LRU set and deletes their embedding
+# keys, all inside Redis in one call.
+# KEYS: LRU sorted set. ARGV: embedding key prefix, entries to keep.
+_EVICT_ENTRIES_LUA = """
+local remove = redis.call('ZCARD', KEYS[1]) - tonumber(ARGV[2])
+if remove <= 0 then
+    return 0
+end
+local oldest = redis.call('ZPOPMIN', KEYS[1], remove)
+for i = 1, #oldest, 2 do
+    redis.call('DEL', ARGV[1] .. oldest[i])
+end
+return #oldest / 2
+"""
+_EVICT_ENTRIES_SHA = hashlib.sha1(_EVICT_ENTRIES_LUA.encode()).hexdigest()
+
+
 async def _evict_oldest_entries(
     client: redis.Redis,
     user_id: str,
@@ -267,7 +433,9 @@ async def _evict_oldest_entries(
     """
     Removes the oldest cache entries beyond the keep_count limit.
 
-    Uses the LRU sorted set to identify oldest entries by timestamp.
+    Uses the LRU sorted set to identify oldest entries by timestamp. Runs
+    as one server-side script, so the whole eviction is a single round-trip
+    and atomic.
 
     Args:
         client: The Redis client instance.
@@ -279,34 +447,82 @@ async def _evict_oldest_entries(
         Number of entries evicted.
     """
     try:
-        # Get count of entries to remove
-        total_count = await client.zcard(lru_key)
-        remove_count = total_count - keep_count
+        evicted = await _run_script(
+            client,
+            _EVICT_ENTRIES_LUA,
+            _EVICT_ENTRIES_SHA,
+            1,
+            lru_key,
+            _embedding_key(user_id, ""),
+            keep_count,
+        )
+        return int(evicted)
 
-        if remove_count <= 0:
-            return 0
+    except Exception as e:
+        print(f"[cache] Error during eviction: {e}")
+        return 0
 
-        # Get the oldest entries (lowest timestamps)
-        oldest_hashes = await client.zrange(lru_key, 0, remove_count - 1)
 
-        if not oldest_hashes:
-            return 0
+def _recent_memories_key(user_id: str) -> str:
+    """Constructs the Redis key for a user's recent memory hashes."""
+    return f"memory_recent:{user_id}"
 
-        # Delete embedding keys and remove from sorted set
-        pipe = client.pipeline()
-        for text_hash in oldest_hashes:
-            # text_hash might be bytes, decode if needed
-            if isinstance(text_hash, bytes):
-                text_hash = text_hash.decode("utf-8")
-            pipe.delete(_embedding_key(user_id, text_hash))
-            pipe.zrem(lru_key, text_hash)
 
-        await pipe.execute()
-        return len(oldest_hashes)
+async def is_recent_memory(user_id: str, text: str) -> bool:
+    """
+    Checks whether a memory text repeats one of the user's recent memories.
+
+    Read-only: hashes are only recorded by remember_memory_hash() once the
+    memory has been stored, so a failed write doesn't block later repeats.
+    Text is normalized like embedding keys, so repeats differing only in
+    case or spacing match.
+
+    Args:
+        user_id: The user ID for cache isolation.
+        text: The memory text (formatted user message + AI response).
+
+    Returns:
+        True if the text was already recorded, False otherwise (including
+        when Redis is unavailable, so the memory is stored).
+    """
+    client = await get_redis_client()
+    if client is None:
+        return False
 
+    try:
+        score = await client.zscore(_recent_memories_key(user_id), _hash_text(text))
+        return score is not None
     except Exception as e:
-        print(f"[cache] Error during eviction: {e}")
-        return 0
+        print(f"[cache] Error checking recent memories: {e}")
+        return False
+
+
+async def remember_memory_hash(user_id: str, text: str) -> None:
+    """
+    Records a stored memory text so is_recent_memory() reports its repeats.
+
+    Keeps only the RECENT_MEMORIES_PER_USER most recent hashes, in a sorted
+    set that expires after RECENT_MEMORIES_TTL_SECONDS without writes.
+    Errors are logged and ignored (the worst case is embedding a repeat).
+
+    Args:
+        user_id: The user ID for cache isolation.
+        text: The memory text that was just stored.
+    """
+    client = await get_redis_client()
+    if client is None:
+        return
+
+    key = _recent_memories_key(user_id)
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.zadd(key, {_hash_text(text): time.time()})
+        pipe.zremrangebyrank(key, 0, -(RECENT_MEMORIES_PER_USER + 1))
+        pipe.expire(key, RECENT_MEMORIES_TTL_SECONDS)
+        await pipe.execute()
+    except Exception as e:
+        print(f"[cache] Error recording recent memory: {e}")
 
 
 async def get_cache_stats(user_id: str) -> dict[str, object]:
@@ -345,7 +561,10 @@ async def get_cache_stats(user_id: str) -> dict[str, object]:
 
 async def close_redis_pool() -> None:
     """Closes both Redis connection pools. Call during shutdown."""
-    global _redis_pool, _shared_redis_pool
+    global _redis_pool, _shared_redis_pool, _redis_client, _shared_redis_client
+
+    _redis_client = None
+    _shared_redis_client = None
 
     if _redis_pool is not None:
         await _redis_pool.aclose()
@@ -366,32 +585,112 @@ async def close_redis_pool() -> None:
 # Eviction Strategy:
 # - Total message count across all conversations is limited to MAX_CACHED_MESSAGES
 # - When limit is exceeded, oldest-accessed conversations are evicted (LRU)
-# - Uses two tracking structures:
+# - Uses three tracking structures:
 #   - MESSAGES_LRU_KEY: sorted set (conversation_id -> access_timestamp) for LRU ordering
 #   - MESSAGES_COUNTS_KEY: hash (conversation_id -> message_count) for counting
+#   - MESSAGES_TOTAL_KEY: running sum of the counts, so the total is one GET
+#     instead of an HGETALL over every cached conversation
 # =============================================================================
 
+# Shared prologue for the count-maintaining scripts: rebuilds the total
+# from the counts hash when it's missing (first use after an upgrade, or if
+# it was deleted), so moving it by a delta stays exact.
+# KEYS[1]: counts hash, KEYS[2]: total key.
+_ENSURE_TOTAL_LUA = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    local total = 0
+    for _, count in ipairs(redis.call('HVALS', KEYS[1])) do
+        total = total + tonumber(count)
+    end
+    redis.call('SET', KEYS[2], total)
+end
+"""
+
+# Sets (or, with a count of 0, removes) a conversation's message count and
+# moves the total by the difference, atomically on the server. Applying the
+# delta against the stored count keeps the total exact even when writers
+# race or eviction removed the conversation in between.
+# KEYS: counts hash, total key. ARGV: conversation_id, new count.
+# Returns the new total.
+_SET_COUNT_LUA = (
+    _ENSURE_TOTAL_LUA
+    + """
+local old = tonumber(redis.call('HGET', KEYS[1], ARGV[1])) or 0
+local new = tonumber(ARGV[2])
+if new > 0 then
+    redis.call('HSET', KEYS[1], ARGV[1], new)
+else
+    redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return redis.call('INCRBY', KEYS[2], new - old)
+"""
+)
+
 
 def _messages_key(conversation_id: str) -> str:
     """Constructs the Redis key for cached conversation messages."""
     return f"conv_msgs:{conversation_id}"
 
 
-async def _get_total_cached_messages(client: redis.Redis) -> int:
-    """Returns the total number of messages across all cached conversations."""
-    try:
-        # Sum all values in the counts hash
-        counts = await client.hgetall(MESSAGES_COUNTS_KEY)
-        total = sum(int(v) for v in counts.values())
-        return total
-    except Exception:
-        return 0
+def _sum_counts(counts: dict[bytes, bytes]) -> int:
+    """Returns the total number of messages from an HGETALL of the counts hash."""
+    return sum(int(v) for v in counts.values())
+
+
+def _queue_set_count(pipe: redis.client.Pipeline, conversation_id: str, count: int) -> None:
+    """Queues _SET_COUNT_LUA on a pipeline (count 0 removes the conversation)."""
+    pipe.eval(_SET_COUNT_LUA, 2, MESSAGES_COUNTS_KEY, MESSAGES_TOTAL_KEY, conversation_id, count)
+
+
+async def _total_from_reply(client: redis.Redis, raw_total: bytes | None) -> int:
+    """
+    Parses a GET of MESSAGES_TOTAL_KEY, rebuilding the counter if it's missing.
+
+    The counter is missing on first use after an upgrade (or if it was
+    deleted); it's then recomputed once from the counts hash.
+    """
+    if raw_total is not None:
+        return int(raw_total)
+    total = _sum_counts(await client.hgetall(MESSAGES_COUNTS_KEY))
+    await client.set(MESSAGES_TOTAL_KEY, total, nx=True)
+    return total
+
+
+# Pops the least recently accessed conversations until at least ARGV[1]
+# messages are freed, deleting each one's messages and count and moving the
+# total, all inside Redis in one call.
+# KEYS: LRU sorted set, counts hash, total key.
+# ARGV: messages to free, messages key prefix.
+# Returns {messages freed, conversations evicted}.
+_EVICT_CONVERSATIONS_LUA = """
+local target = tonumber(ARGV[1])
+local freed = 0
+local conversations = 0
+while freed < target do
+    local oldest = redis.call('ZPOPMIN', KEYS[1])
+    if #oldest == 0 then
+        break
+    end
+    local conv = oldest[1]
+    local count = tonumber(redis.call('HGET', KEYS[2], conv)) or 0
+    redis.call('DEL', ARGV[2] .. conv)
+    redis.call('HDEL', KEYS[2], conv)
+    redis.call('INCRBY', KEYS[3], -count)
+    freed = freed + count
+    conversations = conversations + 1
+end
+return {freed, conversations}
+"""
+_EVICT_CONVERSATIONS_SHA = hashlib.sha1(_EVICT_CONVERSATIONS_LUA.encode()).hexdigest()
 
 
 async def _evict_oldest_conversations(client: redis.Redis, messages_to_free: int) -> int:
     """
     Evicts oldest-accessed conversations until messages_to_free are removed.
 
+    Runs as one server-side script: a single round-trip, atomic with
+    respect to other writers.
+
     Args:
         client: Redis client instance.
         messages_to_free: Minimum number of messages to evict.
@@ -399,37 +698,59 @@ async def _evict_oldest_conversations(client: redis.Redis, messages_to_free: int
     Returns:
         Number of messages actually evicted.
     """
-    evicted = 0
     try:
-        while evicted < messages_to_free:
-            # Get oldest conversation (lowest score = oldest access time)
-            oldest = await client.zrange(MESSAGES_LRU_KEY, 0, 0)
-            if not oldest:
-                break
-
-            conv_id_bytes = oldest[0]
-            conv_id = (
-                conv_id_bytes.decode("utf-8") if isinstance(conv_id_bytes, bytes) else conv_id_bytes
-            )
-
-            # Get message count for this conversation
-            msg_count_raw = await client.hget(MESSAGES_COUNTS_KEY, conv_id)
-            msg_count = int(msg_count_raw) if msg_count_raw else 0
-
-            # Remove the conversation data and tracking entries
-            pipe = client.pipeline()
-            pipe.delete(_messages_key(conv_id))
-            pipe.zrem(MESSAGES_LRU_KEY, conv_id)
-            pipe.hdel(MESSAGES_COUNTS_KEY, conv_id)
-            await pipe.execute()
-
-            evicted += msg_count
-            print(f"[cache] Evicted conversation {conv_id[:8]}... ({msg_count} msgs)")
-
+        evicted, conversations = await _run_script(
+            client,
+            _EVICT_CONVERSATIONS_LUA,
+            _EVICT_CONVERSATIONS_SHA,
+            3,
+            MESSAGES_LRU_KEY,
+            MESSAGES_COUNTS_KEY,
+            MESSAGES_TOTAL_KEY,
+            messages_to_free,
+            _messages_key(""),
+        )
     except Exception as e:
         print(f"[cache] Error during eviction: {e}")
+        return 0
 
-    return evicted
+    print(f"[cache] Evicted {conversations} conversations ({evicted} msgs)")
+    return int(evicted)
+
+
+# Appends messages to the cached JSON array in place and records the new
+# count, so an append ships only the new messages instead of reading and
+# rewriting the whole conversation. The array's closing bracket is
+# overwritten with SETRANGE; a missing (or empty) array is created. The
+# stored count is trusted when present; an untracked array (written by the
+# web app) is counted once with cjson.
+# KEYS: counts hash, total key, messages key, LRU sorted set.
+# ARGV: conversation_id, new messages JSON without brackets, number of new
+#       messages, TTL seconds, access timestamp.
+# Returns {new message count, new total, 1 if the array was created}.
+_APPEND_MESSAGES_LUA = (
+    _ENSURE_TOTAL_LUA
+    + """
+local added = tonumber(ARGV[3])
+local size = redis.call('STRLEN', KEYS[3])
+local old = tonumber(redis.call('HGET', KEYS[1], ARGV[1]))
+local count
+if size <= 2 then
+    redis.call('SET', KEYS[3], '[' .. ARGV[2] .. ']')
+    count = added
+else
+    local existing = old or #cjson.decode(redis.call('GET', KEYS[3]))
+    redis.call('SETRANGE', KEYS[3], size - 1, ',' .. ARGV[2] .. ']')
+    count = existing + added
+end
+redis.call('EXPIRE', KEYS[3], ARGV[4])
+redis.call('ZADD', KEYS[4], ARGV[5], ARGV[1])
+redis.call('HSET', KEYS[1], ARGV[1], count)
+local total = redis.call('INCRBY', KEYS[2], count - (old or 0))
+return {count, total, size <= 2 and 1 or 0}
+"""
+)
+_APPEND_MESSAGES_SHA = hashlib.sha1(_APPEND_MESSAGES_LUA.encode()).hexdigest()
 
 
 async def get_cached_messages(conversation_id: str) -> list[dict[str, object]] | None:
@@ -452,7 +773,13 @@ async def get_cached_messages(conversation_id: str) -> list[dict[str, object]] |
     key = _messages_key(conversation_id)
 
     try:
-        data = await client.get(key)
+        # Read and update access time in the LRU index (keeps frequently
+        # accessed convos in cache) in one round-trip. XX: a miss doesn't
+        # add the conversation to the index.
+        pipe = client.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.zadd(MESSAGES_LRU_KEY, {conversation_id: time.time()}, xx=True)
+        data, _ = await pipe.execute()
         if data is None:
             logger.info(
                 "Cache MISS",
@@ -460,10 +787,7 @@ async def get_cached_messages(conversation_id: str) -> list[dict[str, object]] |
             )
             return None
 
-        messages = json.loads(data)
-
-        # Update access time in LRU index (keeps frequently accessed convos in cache)
-        await client.zadd(MESSAGES_LRU_KEY, {conversation_id: time.time()})
+        messages = orjson.loads(data)
 
         logger.info(
             "Cache HIT",
@@ -486,7 +810,9 @@ async def cache_messages(conversation_id: str, messages: list[dict[str, object]]
 
     Uses the shared Redis (Upstash) so both frontend and backend see the same data.
     Used when populating cache from a database read.
-    Triggers eviction if total message count exceeds limit.
+    Triggers eviction if total message count exceeds limit. The write and
+    the count update go in one round-trip; eviction (if needed) follows,
+    using the total the write returned.
 
     Args:
         conversation_id: The conversation UUID.
@@ -500,27 +826,19 @@ async def cache_messages(conversation_id: str, messages: list[dict[str, object]]
         return False
 
     key = _messages_key(conversation_id)
-    msg_count = len(messages)
 
     try:
-        # Get current count for this conversation (if already cached)
-        existing_count_raw = await client.hget(MESSAGES_COUNTS_KEY, conversation_id)
-        existing_count = int(existing_count_raw) if existing_count_raw else 0
-
-        # Check if we need to evict before adding
-        current_total = await _get_total_cached_messages(client)
-        new_total = current_total - existing_count + msg_count
-
-        if new_total > MAX_CACHED_MESSAGES:
-            messages_to_free = new_total - MAX_CACHED_MESSAGES + msg_count
-            await _evict_oldest_conversations(client, messages_to_free)
-
         # Store messages with TTL and update tracking
         pipe = client.pipeline()
-        pipe.setex(key, MESSAGES_TTL_SECONDS, json.dumps(messages))
+        pipe.setex(key, MESSAGES_TTL_SECONDS, orjson.dumps(messages))
         pipe.zadd(MESSAGES_LRU_KEY, {conversation_id: time.time()})
-        pipe.hset(MESSAGES_COUNTS_KEY, conversation_id, msg_count)
-        await pipe.execute()
+        _queue_set_count(pipe, conversation_id, len(messages))
+        *_, new_total = await pipe.execute()
+
+        # This conversation is now the most recently used, so eviction
+        # takes older ones first
+        if int(new_total) > MAX_CACHED_MESSAGES:
+            await _evict_oldest_conversations(client, int(new_total) - MAX_CACHED_MESSAGES)
 
         return True
     except Exception as e:
@@ -537,6 +855,12 @@ async def append_messages(conversation_id: str, new_messages: list[dict[str, obj
     If the conversation is not in cache, creates a new entry with just the
     new messages (ensures write-through works even if cache was evicted).
 
+    The existing messages never leave Redis: the new ones are spliced onto
+    the stored JSON array by a server-side script, so an append costs the
+    size of what's added rather than of the whole conversation. The same
+    call updates the count and returns the new total, so eviction (if
+    needed) follows without another read.
+
     Args:
         conversation_id: The conversation UUID.
         new_messages: New message dicts to append.
@@ -552,48 +876,49 @@ async def append_messages(conversation_id: str, new_messages: list[dict[str, obj
         )
         return False
 
+    if not new_messages:
+        return True
+
     key = _messages_key(conversation_id)
 
     try:
-        # Get existing messages (may be empty if cache miss)
-        data = await client.get(key)
-        if data is None:
-            # Cache miss - create new entry with just the new messages
+        # Splice the new messages onto the stored array (or create it) and
+        # update tracking
+        new_count, new_total, created = await _run_script(
+            client,
+            _APPEND_MESSAGES_LUA,
+            _APPEND_MESSAGES_SHA,
+            4,
+            MESSAGES_COUNTS_KEY,
+            MESSAGES_TOTAL_KEY,
+            key,
+            MESSAGES_LRU_KEY,
+            conversation_id,
+            orjson.dumps(new_messages)[1:-1],
+            len(new_messages),
+            MESSAGES_TTL_SECONDS,
+            time.time(),
+        )
+        if created:
+            # Cache miss - the entry holds just the new messages
             # This ensures write-through pattern works even if cache was evicted
-            existing = []
-            old_count = 0
             logger.info(
-                "Cache miss - creating new entry",
+                "Cache miss - created new entry",
                 conversation_id=conversation_id[:8] + "...",
                 new_message_count=len(new_messages),
             )
         else:
-            existing = json.loads(data)
-            old_count = len(existing)
             logger.info(
-                "Appending to existing cache",
+                "Appended to existing cache",
                 conversation_id=conversation_id[:8] + "...",
-                existing_count=old_count,
+                existing_count=new_count - len(new_messages),
                 new_message_count=len(new_messages),
             )
 
-        updated = existing + new_messages
-        new_count = len(updated)
-
-        # Check if we need to evict before adding
-        current_total = await _get_total_cached_messages(client)
-        new_total = current_total - old_count + new_count
-
+        # This conversation is now the most recently used, so eviction
+        # takes older ones first
         if new_total > MAX_CACHED_MESSAGES:
-            messages_to_free = new_total - MAX_CACHED_MESSAGES + len(new_messages)
-            await _evict_oldest_conversations(client, messages_to_free)
-
-        # Store updated messages with TTL and update tracking
-        pipe = client.pipeline()
-        pipe.setex(key, MESSAGES_TTL_SECONDS, json.dumps(updated))
-        pipe.zadd(MESSAGES_LRU_KEY, {conversation_id: time.time()})
-        pipe.hset(MESSAGES_COUNTS_KEY, conversation_id, new_count)
-        await pipe.execute()
+            await _evict_oldest_conversations(client, new_total - MAX_CACHED_MESSAGES)
 
         logger.info(
             "Cache append SUCCESS",
@@ -634,7 +959,7 @@ async def invalidate_conversation_cache(conversation_id: str) -> bool:
         pipe = client.pipeline()
         pipe.delete(key)
         pipe.zrem(MESSAGES_LRU_KEY, conversation_id)
-        pipe.hdel(MESSAGES_COUNTS_KEY, conversation_id)
+        _queue_set_count(pipe, conversation_id, 0)
         await pipe.execute()
         return True
     except Exception as e:
@@ -656,11 +981,15 @@ async def get_message_cache_stats() -> dict[str, object]:
         return {"error": "Shared Redis not available"}
 
     try:
-        total_messages = await _get_total_cached_messages(client)
-        conv_count = await client.zcard(MESSAGES_LRU_KEY)
+        # Total (a counter, not a sum over conversations), conversation
+        # count and oldest conversation in one round-trip
+        pipe = client.pipeline(transaction=False)
+        pipe.get(MESSAGES_TOTAL_KEY)
+        pipe.zcard(MESSAGES_LRU_KEY)
+        pipe.zrange(MESSAGES_LRU_KEY, 0, 0, withscores=True)
+        raw_total, conv_count, oldest = await pipe.execute()
+        total_messages = await _total_from_reply(client, raw_total)
 
-        # Get oldest conversation
-        oldest = await client.zrange(MESSAGES_LRU_KEY, 0, 0, withscores=True)
         oldest_age = None
         if oldest:
             oldest_timestamp = oldest[0][1]
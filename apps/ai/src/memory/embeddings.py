@@ -26,6 +26,21 @@ from google.genai import types
 # Gemini supports 128 to 3072 dimensions
 EMBEDDING_DIMENSIONS = 768
 
+EMBEDDING_MODEL = "gemini-embedding-001"
+_EMBED_CONFIG = types.EmbedContentConfig(
+    task_type="SEMANTIC_SIMILARITY",
+    output_dimensionality=EMBEDDING_DIMENSIONS,
+)
+
+# Concurrent generate_embedding() calls made within this window are sent as
+# one batch request (flushed early once EMBED_MAX_BATCH texts are waiting)
+EMBED_BATCH_WINDOW_SECONDS = 0.005
+EMBED_MAX_BATCH = 64
+
+# Larger generate_embeddings_batch() inputs are split into EMBED_MAX_BATCH
+# chunks (the API caps texts per request), at most this many in flight
+EMBED_MAX_INFLIGHT = 8
+
 
 @lru_cache(maxsize=1)
 def get_genai_client() -> genai.Client:
@@ -51,6 +66,94 @@ def get_genai_client() -> genai.Client:
     return genai.Client(api_key=api_key)
 
 
+async def _embed_content(contents: str | list[str]) -> types.EmbedContentResponse:
+    """
+    Calls the embedding API on the client's native async transport.
+
+    Using client.aio keeps the request on the event loop instead of a
+    thread-pool worker, so concurrent embeddings aren't capped by the
+    default executor's size.
+    """
+    return await get_genai_client().aio.models.embed_content(
+        model=EMBEDDING_MODEL,
+        contents=contents,
+        config=_EMBED_CONFIG,
+    )
+
+
+def _vectors(result: types.EmbedContentResponse) -> list[list[float]]:
+    """
+    Returns the response's vectors as-is.
+
+    The SDK already parses each vector into a list of floats, so there's
+    no need to copy 768 floats per vector again.
+    """
+    vectors = [emb.values for emb in result.embeddings or []]
+    if any(values is None for values in vectors):
+        raise ValueError("Embedding response is missing vector values")
+    return vectors  # type: ignore[return-value]
+
+
+class _EmbeddingBatcher:
+    """
+    Collects concurrent single-text embedding requests into batch calls.
+
+    The first request starts a short timer; every request arriving before
+    it fires joins the same embed_content call, and each caller gets its
+    own vector back. Errors are raised to every caller in the batch.
+    """
+
+    def __init__(self, window: float, max_batch: int) -> None:
+        self._window = window
+        self._max_batch = max_batch
+        self._pending: list[tuple[str, asyncio.Future[list[float]]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._inflight: set[asyncio.Task[None]] = set()
+
+    async def embed(self, text: str) -> list[float]:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Anything queued belonged to a loop that's gone (e.g. between tests)
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+
+        future: asyncio.Future[list[float]] = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._send(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    @staticmethod
+    async def _send(batch: list[tuple[str, asyncio.Future[list[float]]]]) -> None:
+        try:
+            embeddings = await generate_embeddings_batch([text for text, _ in batch])
+            for (_, future), embedding in zip(batch, embeddings, strict=True):
+                if not future.done():
+                    future.set_result(embedding)
+        except Exception as e:
+            # Includes a response with the wrong number of vectors
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+_batcher = _EmbeddingBatcher(EMBED_BATCH_WINDOW_SECONDS, EMBED_MAX_BATCH)
+
+
 async def generate_embedding(text: str) -> list[float]:
     """
     Generates an embedding vector for the given text.
@@ -58,6 +161,10 @@ async def generate_embedding(text: str) -> list[float]:
     Uses Gemini's gemini-embedding-001 model with SEMANTIC_SIMILARITY task type
     for optimal performance in memory retrieval use cases.
 
+    Calls made concurrently (e.g. storing one memory while searching for
+    another) are coalesced into a single batch request, at the cost of
+    waiting up to EMBED_BATCH_WINDOW_SECONDS for others to join.
+
     Args:
         text: The text to embed. For memories, this should be
               the combined user message + AI response.
@@ -70,24 +177,7 @@ async def generate_embedding(text: str) -> list[float]:
         >>> len(embedding)
         768
     """
-    client = get_genai_client()
-
-    # Wrap blocking API call in thread pool to avoid blocking the event loop
-    # The google-genai client uses synchronous HTTP calls
-    def _embed() -> genai.types.EmbedContentResponse:
-        return client.models.embed_content(
-            model="gemini-embedding-001",
-            contents=text,
-            config=types.EmbedContentConfig(
-                task_type="SEMANTIC_SIMILARITY",
-                output_dimensionality=EMBEDDING_DIMENSIONS,
-            ),
-        )
-
-    result = await asyncio.to_thread(_embed)
-
-    # The API returns a list of embeddings, we only sent one text
-    return list(result.embeddings[0].values)
+    return await _batcher.embed(text)
 
 
 async def generate_embeddings_batch(texts: list[str]) -> list[list[float]]:
@@ -95,7 +185,10 @@ async def generate_embeddings_batch(texts: list[str]) -> list[list[float]]:
     Generates embeddings for multiple texts in a single API call.
 
     More efficient than calling generate_embedding() multiple times
-    when you have several texts to embed.
+    when you have several texts to embed. Lists longer than
+    EMBED_MAX_BATCH are split into chunks sent concurrently (up to
+    EMBED_MAX_INFLIGHT at a time); results keep the input order.
+    Duplicate texts are embedded once and share the same vector.
 
     Args:
         texts: List of texts to embed.
@@ -111,22 +204,46 @@ async def generate_embeddings_batch(texts: list[str]) -> list[list[float]]:
     if not texts:
         return []
 
-    client = get_genai_client()
-
-    # Wrap blocking API call in thread pool to avoid blocking the event loop
-    def _embed_batch() -> genai.types.EmbedContentResponse:
-        return client.models.embed_content(
-            model="gemini-embedding-001",
-            contents=texts,
-            config=types.EmbedContentConfig(
-                task_type="SEMANTIC_SIMILARITY",
-                output_dimensionality=EMBEDDING_DIMENSIONS,
-            ),
+    unique_texts = list(dict.fromkeys(texts))
+    if len(unique_texts) < len(texts):
+        embeddings = await generate_embeddings_batch(unique_texts)
+        by_text = dict(zip(unique_texts, embeddings, strict=True))
+        return [by_text[text] for text in texts]
+
+    if len(texts) <= EMBED_MAX_BATCH:
+        result = await _embed_content(texts)
+        return _vectors(result)
+
+    semaphore = asyncio.Semaphore(EMBED_MAX_INFLIGHT)
+
+    async def _embed_chunk(chunk: list[str]) -> list[list[float]]:
+        async with semaphore:
+            result = await _embed_content(chunk)
+        return _vectors(result)
+
+    chunks = await asyncio.gather(
+        *(
+            _embed_chunk(texts[start : start + EMBED_MAX_BATCH])
+            for start in range(0, len(texts), EMBED_MAX_BATCH)
         )
+    )
+    return [embedding for chunk in chunks for embedding in chunk]
+
 
-    result = await asyncio.to_thread(_embed_batch)
+def to_halfvec_literal(embedding: list[float]) -> str:
+    """
+    Formats an embedding as a pgvector literal for halfvec(768) columns.
+
+    Embeddings are stored as halfvec (float16), which holds ~3-4 significant
+    digits, so 5 digits per value round-trip exactly. The literal is about
+    half the size of the JSON array of full-precision floats PostgREST would
+    otherwise receive and parse.
 
-    return [list(emb.values) for emb in result.embeddings]
+    Example:
+        >>> to_halfvec_literal([0.0123456789, -0.5])
+        '[0.012346,-0.5]'
+    """
+    return "[" + ",".join(f"{value:.5g}" for value in embedding) + "]"
 
 
 def format_memory_text(user_message: str, ai_response: str) -> str:
@@ -5,7 +5,7 @@ Memory Store Module
 Handles storage and retrieval of conversation memories in Supabase.
 
 This module provides:
-1. Storing new memories with embeddings
+1. Storing new memories with embeddings (one at a time, or in bulk)
 2. Searching for relevant past conversations via semantic similarity
 3. Formatting memories for injection into system prompts
 
@@ -17,7 +17,9 @@ Security:
 """
 
 import os
+from collections import OrderedDict
 from dataclasses import dataclass
+from typing import NotRequired, TypedDict
 
 from supabase import acreate_client
 from supabase._async.client import AsyncClient
@@ -30,7 +32,12 @@ from src.memory.cache import (
     cache_embedding,
     get_cached_embedding,
 )
-from src.memory.embeddings import format_memory_text, generate_embedding
+from src.memory.embeddings import (
+    format_memory_text,
+    generate_embedding,
+    generate_embeddings_batch,
+    to_halfvec_literal,
+)
 
 # Logger for memory store operations
 logger = NodeLogger("memory_store")
@@ -39,6 +46,16 @@ logger = NodeLogger("memory_store")
 # This avoids creating a new client for every operation
 _async_client: AsyncClient | None = None
 
+# In-process tier in front of the Redis embedding cache. Repeated queries in
+# this worker (e.g. a check-in opener, or the semantic cache re-embedding the
+# message memory retrieval just embedded) skip the network entirely.
+# (user_id, query) -> embedding; ordered least recently used first
+LOCAL_QUERY_EMBEDDINGS_MAX = 1024
+_local_query_embeddings: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+
+# Rows per insert request in store_memories_bulk()
+MEMORY_INSERT_BATCH = 500
+
 
 @dataclass
 class Memory:
@@ -62,6 +79,16 @@ class Memory:
     metadata: dict[str, object]
 
 
+class MemoryPair(TypedDict):
+    """A conversation pair to store with store_memories_bulk()."""
+
+    user_id: str
+    user_message: str
+    ai_response: str
+    conversation_id: NotRequired[str | None]
+    metadata: NotRequired[dict[str, object] | None]
+
+
 async def get_async_supabase_client() -> AsyncClient:
     """
     Gets or creates an async Supabase client for memory operations.
@@ -100,6 +127,7 @@ async def store_memory(
     ai_response: str,
     conversation_id: str | None = None,
     metadata: dict[str, object] | None = None,
+    embedding: list[float] | None = None,
 ) -> str:
     """
     Stores a conversation pair as a memory with its embedding.
@@ -115,6 +143,8 @@ async def store_memory(
         ai_response: The AI's response
         conversation_id: Optional link to the source conversation
         metadata: Additional context to store (topics, emotions, etc.)
+        embedding: Embedding of format_memory_text(user_message, ai_response),
+                   if the caller already generated it (generated here if None)
 
     Returns:
         The ID of the created memory.
@@ -129,25 +159,86 @@ async def store_memory(
     """
     # Format and embed the conversation
     combined_text = format_memory_text(user_message, ai_response)
-    embedding = await generate_embedding(combined_text)
+    if embedding is None:
+        embedding = await generate_embedding(combined_text)
 
     # Prepare the record
-    record = {
+    record = _memory_record(
+        user_id, user_message, ai_response, combined_text, embedding, conversation_id, metadata
+    )
+
+    # Insert into Supabase (async)
+    supabase = await get_async_supabase_client()
+    result = await supabase.table("memories").insert(record).execute()
+
+    return result.data[0]["id"]
+
+
+async def store_memories_bulk(pairs: list[MemoryPair]) -> list[str]:
+    """
+    Stores many conversation pairs as memories (e.g. for backfills).
+
+    Calling store_memory() in a loop costs an embedding request and an
+    insert per pair. This embeds all pairs with generate_embeddings_batch()
+    and inserts them MEMORY_INSERT_BATCH rows per request.
+
+    Args:
+        pairs: The conversation pairs, with the same fields as the
+               store_memory() arguments.
+
+    Returns:
+        The IDs of the created memories, in input order.
+    """
+    if not pairs:
+        return []
+
+    texts = [format_memory_text(pair["user_message"], pair["ai_response"]) for pair in pairs]
+    embeddings = await generate_embeddings_batch(texts)
+
+    records = [
+        _memory_record(
+            pair["user_id"],
+            pair["user_message"],
+            pair["ai_response"],
+            text,
+            embedding,
+            pair.get("conversation_id"),
+            pair.get("metadata"),
+        )
+        for pair, text, embedding in zip(pairs, texts, embeddings, strict=True)
+    ]
+
+    supabase = await get_async_supabase_client()
+    memory_ids: list[str] = []
+    for start in range(0, len(records), MEMORY_INSERT_BATCH):
+        batch = records[start : start + MEMORY_INSERT_BATCH]
+        result = await supabase.table("memories").insert(batch).execute()
+        memory_ids.extend(row["id"] for row in result.data)
+
+    logger.info("Stored memories in bulk", count=len(memory_ids))
+    return memory_ids
+
+
+def _memory_record(
+    user_id: str,
+    user_message: str,
+    ai_response: str,
+    combined_text: str,
+    embedding: list[float],
+    conversation_id: str | None,
+    metadata: dict[str, object] | None,
+) -> dict[str, object]:
+    """Builds a memories table row."""
+    return {
         "user_id": user_id,
         "user_message": user_message,
         "ai_response": ai_response,
         "combined_text": combined_text,
-        "embedding": embedding,  # Will be serialized as JSON array
+        "embedding": to_halfvec_literal(embedding),
         "conversation_id": conversation_id,
         "metadata": metadata or {},
     }
 
-    # Insert into Supabase (async)
-    supabase = await get_async_supabase_client()
-    result = await supabase.table("memories").insert(record).execute()
-
-    return result.data[0]["id"]
-
 
 async def save_messages(
     conversation_id: str,
@@ -259,6 +350,42 @@ async def save_messages(
     return (supabase_success, cache_success)
 
 
+async def get_query_embedding(user_id: str, query: str) -> list[float]:
+    """
+    Gets the embedding for a user's query, using the caches when possible.
+
+    Tries the in-process LRU, then the per-user Redis embedding cache, and
+    falls back to generating (and caching) a fresh embedding on a miss.
+
+    Args:
+        user_id: The user whose cache to check (cache is isolated per user)
+        query: The text to embed (usually the current user message)
+
+    Returns:
+        The query embedding as a list of floats.
+    """
+    key = (user_id, query)
+    query_embedding = _local_query_embeddings.get(key)
+    if query_embedding is not None:
+        _local_query_embeddings.move_to_end(key)
+        return query_embedding
+
+    query_embedding = await get_cached_embedding(user_id, query)
+    if query_embedding is None:
+        query_embedding = await generate_embedding(query)
+        await cache_embedding(user_id, query, query_embedding)
+
+    _local_query_embeddings[key] = query_embedding
+    if len(_local_query_embeddings) > LOCAL_QUERY_EMBEDDINGS_MAX:
+        _local_query_embeddings.popitem(last=False)
+    return query_embedding
+
+
+def clear_query_embedding_cache() -> None:
+    """Empties the in-process query embedding cache (for tests)."""
+    _local_query_embeddings.clear()
+
+
 async def search_memories(
     user_id: str,
     query: str,
@@ -288,11 +415,7 @@ async def search_memories(
         >>> for m in memories:
         ...     print(f"{m.similarity:.2f}: {m.user_message[:50]}...")
     """
-    # Try to get cached embedding first, fall back to generating
-    query_embedding = await get_cached_embedding(user_id, query)
-    if query_embedding is None:
-        query_embedding = await generate_embedding(query)
-        await cache_embedding(user_id, query, query_embedding)
+    query_embedding = await get_query_embedding(user_id, query)
 
     # Call the Supabase RPC function (async)
     supabase = await get_async_supabase_client()
@@ -300,7 +423,7 @@ async def search_memories(
         "search_memories",
         {
             "p_user_id": user_id,
-            "p_embedding": query_embedding,
+            "p_embedding": to_halfvec_literal(query_embedding),
             "p_limit": limit,
             "p_similarity_threshold": similarity_threshold,
         },
@@ -351,26 +474,24 @@ def format_memories_for_prompt(memories: list[Memory], max_chars: int = 2000) ->
     total_chars = sum(len(line) for line in lines)
 
     for i, memory in enumerate(memories, 1):
-        # Format this memory
-        memory_lines = [
-            f"### Memory {i} (Relevance: {memory.similarity:.0%})",
-            f"**User said:** {memory.user_message}",
-        ]
-
         # Truncate long AI responses
         ai_response = memory.ai_response
         if len(ai_response) > 300:
             ai_response = ai_response[:300] + "..."
-        memory_lines.append(f"**You responded:** {ai_response}")
-        memory_lines.append("")
 
-        memory_text = "\n".join(memory_lines)
+        # Format this memory as one block (the trailing newline leaves a
+        # blank line before the next one)
+        memory_text = (
+            f"### Memory {i} (Relevance: {memory.similarity:.0%})\n"
+            f"**User said:** {memory.user_message}\n"
+            f"**You responded:** {ai_response}\n"
+        )
 
         # Check if adding this would exceed max_chars
         if total_chars + len(memory_text) > max_chars:
             break
 
-        lines.extend(memory_lines)
+        lines.append(memory_text)
         total_chars += len(memory_text)
 
     lines.append(
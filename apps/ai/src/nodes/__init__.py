@@ -12,6 +12,7 @@ Nodes are functions that:
 Directory structure:
 - generate_response/    Main AI response generation
 - detect_activity/      Detect when to suggest activities
+- prepare_request/      Fused user context injection + activity detection
 - breathing_exercise/   Guide breathing exercises
 - meditation_guidance/  Provide meditation guidance
 - journaling_prompt/    Offer journaling prompts
@@ -4,7 +4,8 @@ Analyze Profile Node
 ============================================================================
 Analyzes conversations and updates user wellness profiles.
 
-This node runs after store_memory to analyze the conversation and extract:
+Runs in the background (scheduled by store_memory) to analyze the
+conversation and extract:
 - Emotional state and trends
 - Topics and concerns
 - Activity effectiveness
@@ -14,6 +15,6 @@ Uses FAST tier (Gemini Flash) for cost-effective analysis.
 ============================================================================
 """
 
-from .node import analyze_profile
+from .node import analyze_profile, schedule_profile_analysis, wait_for_profile_analyses
 
-__all__ = ["analyze_profile"]
+__all__ = ["analyze_profile", "schedule_profile_analysis", "wait_for_profile_analyses"]
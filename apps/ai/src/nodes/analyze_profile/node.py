@@ -4,9 +4,9 @@ Analyze Profile Node
 ============================================================================
 Analyzes conversations at the end of the graph and updates user profiles.
 
-This node runs AFTER store_memory (and therefore after the response is
-already streamed to the user), so it has ZERO latency impact on user
-experience.
+This runs as a background task scheduled by store_memory, outside the
+graph run. The run reaches END (and the client's stream completes) without
+waiting for the analysis LLM call.
 
 Key behaviors:
 1. Uses FAST tier LLM (Gemini Flash) for cost-effective analysis (~100ms)
@@ -15,16 +15,20 @@ Key behaviors:
 4. Updates user wellness profile with aggregated insights
 5. Never fails the graph - errors are logged but don't affect user
 
-Position in graph: store_memory -> analyze_profile -> END
+Position: scheduled by store_memory via schedule_profile_analysis()
+(not a graph node)
 ============================================================================
 """
 
+import asyncio
+
 from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 
 from src.graph.state import WellnessState
 from src.llm.providers import ModelTier, create_resilient_llm
 from src.logging_config import NodeLogger
+from src.memory.embeddings import generate_embedding
 
 from .models import ConversationAnalysis
 from .storage import (
@@ -36,6 +40,88 @@ from .storage import (
 
 logger = NodeLogger("analyze_profile")
 
+# How long shutdown waits for in-flight analyses before giving up
+PROFILE_ANALYSIS_SHUTDOWN_TIMEOUT_SECONDS = 30.0
+
+# In-flight background analyses (strong references so tasks aren't GC'd)
+_background_tasks: set[asyncio.Task[dict[str, object]]] = set()
+
+
+# Analysis instructions; only the conversation is filled in per call
+_ANALYSIS_PROMPT_TEMPLATE = """Analyze this wellness conversation and extract structured insights.
+Focus on the user's emotional state, concerns, and what might help them.
+
+## Conversation
+{conversation_text}
+
+## Instructions
+Analyze the conversation above and extract:
+
+1. **Emotional State**: Identify the primary emotion, its intensity (0-1), and valence (-1 to 1).
+   Consider: anxiety, stress, sadness, calm, joy, neutral, frustration, hope, etc.
+
+2. **Trajectory**: How did the user's emotional state change during the conversation?
+   Options: improving, stable, declining, fluctuating
+
+3. **Topics & Concerns**: What were the main topics discussed? What specific concerns did the user raise?
+
+4. **Positive Aspects**: Note any positive things mentioned (achievements, gratitude, progress).
+
+5. **Triggers**: Identify any stress triggers mentioned (work, relationships, health, finances, etc.).
+
+6. **Conversation Type**: Categorize the conversation:
+   - venting: User expressing feelings without seeking solutions
+   - seeking_advice: User wants guidance or suggestions
+   - checking_in: Brief status update or casual chat
+   - doing_activity: User participated in an activity (breathing, meditation)
+   - general_chat: Light conversation without specific wellness focus
+
+7. **Engagement Level**: Rate user engagement as high, medium, or low.
+
+8. **Follow-ups**: What topics should be revisited in future conversations?
+
+9. **Activities**: What activities might help this user? (breathing, meditation, journaling, grounding)
+
+Be specific and actionable in your analysis. Base your assessment on concrete evidence from the conversation."""
+
+
+def schedule_profile_analysis(state: WellnessState, config: RunnableConfig) -> None:
+    """
+    Starts profile analysis for this turn as a background task.
+
+    The graph run doesn't wait for it, so the analysis LLM call adds no
+    latency to turn completion. The state is shallow-copied so later
+    turns can't change what this analysis sees.
+
+    Args:
+        state: Graph state at the end of the turn
+        config: LangGraph config containing thread_id
+    """
+    task = asyncio.create_task(analyze_profile(dict(state), config))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def wait_for_profile_analyses(
+    timeout: float = PROFILE_ANALYSIS_SHUTDOWN_TIMEOUT_SECONDS,
+) -> None:
+    """
+    Waits for in-flight profile analyses to finish.
+
+    Call this during application shutdown. Analyses still running after
+    the timeout are cancelled.
+    """
+    if not _background_tasks:
+        return
+
+    logger.info("Waiting for profile analyses", count=len(_background_tasks))
+    _, pending = await asyncio.wait(set(_background_tasks), timeout=timeout)
+    if pending:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning("Cancelled unfinished profile analyses", count=len(pending))
+
 
 async def analyze_profile(state: WellnessState, config: RunnableConfig) -> dict[str, object]:
     """
@@ -57,7 +143,7 @@ async def analyze_profile(state: WellnessState, config: RunnableConfig) -> dict[
         Empty dict (side-effect only node)
 
     Note:
-        - Runs after response is streamed (zero latency impact)
+        - Runs in the background after the graph run ends (zero latency impact)
         - Errors are logged but never fail the graph
         - Skips analysis for very short conversations (< 2 messages)
     """
@@ -109,27 +195,29 @@ async def analyze_profile(state: WellnessState, config: RunnableConfig) -> dict[
             type=analysis.conversation_type,
         )
 
-        # Generate summary for semantic search (used in Phase 4)
+        # Generate summary for semantic search across past analyses
         analysis_summary = _generate_analysis_summary(analysis)
 
-        # Store the analysis (awaited for reliability)
-        await store_conversation_analysis(
-            user_id=user_id,
-            conversation_id=conversation_id,
-            analysis=analysis,
-            analysis_summary=analysis_summary,
-        )
-
-        # Record emotional snapshot for time-series tracking
-        await store_emotional_snapshot(
-            user_id=user_id,
-            analysis=analysis,
-            conversation_id=conversation_id,
-            source="conversation",
-        )
-
-        # Update wellness profile with aggregated insights
-        await update_wellness_profile(user_id=user_id, analysis=analysis)
+        # The writes below touch different tables and don't read each
+        # other's results, so they run concurrently (each logs its own errors)
+        writes = [
+            # Embed the summary and store the analysis
+            _store_analysis(
+                user_id=user_id,
+                conversation_id=conversation_id,
+                analysis=analysis,
+                analysis_summary=analysis_summary,
+            ),
+            # Record emotional snapshot for time-series tracking
+            store_emotional_snapshot(
+                user_id=user_id,
+                analysis=analysis,
+                conversation_id=conversation_id,
+                source="conversation",
+            ),
+            # Update wellness profile with aggregated insights
+            update_wellness_profile(user_id=user_id, analysis=analysis),
+        ]
 
         # If an activity was completed, update effectiveness metrics
         if state.get("exercise_completed"):
@@ -139,15 +227,21 @@ async def analyze_profile(state: WellnessState, config: RunnableConfig) -> dict[
             if activity_type:
                 # For now, we don't have mood_before/after from state
                 # This will be enhanced when BreathingExercise passes mood data
-                await update_activity_effectiveness(
-                    user_id=user_id,
-                    activity_type=activity_type,
-                    technique=technique,
-                    mood_before=None,
-                    mood_after=None,
-                    completed=True,
+                writes.append(
+                    update_activity_effectiveness(
+                        user_id=user_id,
+                        activity_type=activity_type,
+                        technique=technique,
+                        mood_before=None,
+                        mood_after=None,
+                        completed=True,
+                    )
                 )
 
+        for result in await asyncio.gather(*writes, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error("Profile write failed", error=str(result))
+
         logger.info("Profile analysis complete")
 
     except Exception as e:
@@ -158,6 +252,37 @@ async def analyze_profile(state: WellnessState, config: RunnableConfig) -> dict[
     return {}
 
 
+async def _store_analysis(
+    user_id: str,
+    conversation_id: str,
+    analysis: ConversationAnalysis,
+    analysis_summary: str,
+) -> str | None:
+    """
+    Embeds the analysis summary and stores the analysis with it.
+
+    The embedding goes through generate_embedding(), so it shares a batch
+    request with any other embeddings requested at the same moment. If it
+    fails, the analysis is still stored, just without an embedding.
+
+    Returns:
+        The UUID of the created analysis, or None on error
+    """
+    try:
+        summary_embedding = await generate_embedding(analysis_summary)
+    except Exception as e:
+        logger.warning("Analysis summary embedding failed", error=str(e))
+        summary_embedding = None
+
+    return await store_conversation_analysis(
+        user_id=user_id,
+        conversation_id=conversation_id,
+        analysis=analysis,
+        analysis_summary=analysis_summary,
+        summary_embedding=summary_embedding,
+    )
+
+
 def _build_analysis_prompt(messages: list[BaseMessage]) -> str:
     """
     Builds the analysis prompt from conversation messages.
@@ -178,56 +303,22 @@ def _build_analysis_prompt(messages: list[BaseMessage]) -> str:
     formatted_messages = []
     for msg in recent:
         role = "User" if isinstance(msg, HumanMessage) else "Assistant"
-        content = str(msg.content)[:500]
-        if len(str(msg.content)) > 500:
-            content += "..."
+        content = str(msg.content)
+        if len(content) > 500:
+            content = content[:500] + "..."
         formatted_messages.append(f"{role}: {content}")
 
     conversation_text = "\n".join(formatted_messages)
 
-    return f"""Analyze this wellness conversation and extract structured insights.
-Focus on the user's emotional state, concerns, and what might help them.
-
-## Conversation
-{conversation_text}
-
-## Instructions
-Analyze the conversation above and extract:
-
-1. **Emotional State**: Identify the primary emotion, its intensity (0-1), and valence (-1 to 1).
-   Consider: anxiety, stress, sadness, calm, joy, neutral, frustration, hope, etc.
-
-2. **Trajectory**: How did the user's emotional state change during the conversation?
-   Options: improving, stable, declining, fluctuating
-
-3. **Topics & Concerns**: What were the main topics discussed? What specific concerns did the user raise?
-
-4. **Positive Aspects**: Note any positive things mentioned (achievements, gratitude, progress).
-
-5. **Triggers**: Identify any stress triggers mentioned (work, relationships, health, finances, etc.).
-
-6. **Conversation Type**: Categorize the conversation:
-   - venting: User expressing feelings without seeking solutions
-   - seeking_advice: User wants guidance or suggestions
-   - checking_in: Brief status update or casual chat
-   - doing_activity: User participated in an activity (breathing, meditation)
-   - general_chat: Light conversation without specific wellness focus
-
-7. **Engagement Level**: Rate user engagement as high, medium, or low.
-
-8. **Follow-ups**: What topics should be revisited in future conversations?
-
-9. **Activities**: What activities might help this user? (breathing, meditation, journaling, grounding)
-
-Be specific and actionable in your analysis. Base your assessment on concrete evidence from the conversation."""
+    return _ANALYSIS_PROMPT_TEMPLATE.format(conversation_text=conversation_text)
 
 
 def _generate_analysis_summary(analysis: ConversationAnalysis) -> str:
     """
     Generates a text summary of the analysis for semantic search.
 
-    This summary will be embedded for similarity search across
-    past conversation analyses (Phase 4).
+    This summary is embedded for similarity search across
+    past conversation analyses (search_conversation_analyses).
 
     Args:
         analysis: The structured analysis
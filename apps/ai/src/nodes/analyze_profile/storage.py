@@ -6,25 +6,75 @@ Async Supabase storage functions for persisting conversation analyses
 and updating user wellness profiles.
 
 Uses the service role key to bypass RLS for backend operations.
+
+Writes go through _write_with_retry(): transient failures are retried with
+jittered exponential backoff, and after repeated failures writes are
+skipped for a cooldown instead of each waiting out a dead connection.
 ============================================================================
 """
 
+import asyncio
 import os
-from datetime import UTC, datetime
-from typing import Any
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
 from uuid import uuid4
 
+import httpx
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
 from supabase import AsyncClient, acreate_client
 
 from src.logging_config import NodeLogger
+from src.memory.embeddings import generate_embeddings_batch, to_halfvec_literal
 
 from .models import ConversationAnalysis
 
 logger = NodeLogger("analyze_profile_storage")
 
+# Writes here generate their own ids and never read the written row back, so
+# they ask PostgREST not to echo it (the analysis row includes its JSON and
+# 768-dim embedding)
+_NO_ECHO = ReturnMethod.minimal
+
+# Rows per insert request in store_conversation_analyses_bulk()
+ANALYSIS_INSERT_BATCH = 500
+
+# Write retries: up to WRITE_RETRY_ATTEMPTS tries, sleeping a random
+# 0..min(max, base * 2^attempt) seconds between them
+WRITE_RETRY_ATTEMPTS = 3
+WRITE_RETRY_BASE_DELAY = 0.1
+WRITE_RETRY_MAX_DELAY = 2.0
+
+# After WRITE_FAILURE_THRESHOLD consecutive transient failures, writes fail
+# fast for WRITE_COOLDOWN_SECONDS
+WRITE_FAILURE_THRESHOLD = 5
+WRITE_COOLDOWN_SECONDS = 30.0
+
+# Failures where the request never reached the database: safe to retry any write
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+_DB_UNREACHABLE_CODES = {"PGRST000", "PGRST001", "PGRST002"}
+
+# Failures that may have happened after the write was applied: only retried
+# for idempotent writes (inserts with client-generated ids)
+_AMBIGUOUS_ERRORS = (httpx.TimeoutException, httpx.RemoteProtocolError)
+_GATEWAY_STATUS_CODES = {408, 502, 503, 504}
+
+_UNIQUE_VIOLATION = "23505"
+
+_consecutive_write_failures = 0
+_writes_paused_until = 0.0
+
+T = TypeVar("T")
+
 # Singleton async client
 _supabase_client: AsyncClient | None = None
 
+# Held while the client is created, so the concurrent writes of the first
+# analysis don't each create (and leak) their own client
+_supabase_client_lock = asyncio.Lock()
+
 
 async def get_supabase_client() -> AsyncClient:
     """
@@ -34,23 +84,113 @@ async def get_supabase_client() -> AsyncClient:
     """
     global _supabase_client
 
-    if _supabase_client is None:
-        url = os.environ.get("SUPABASE_URL")
-        key = os.environ.get("SUPABASE_SERVICE_KEY")
+    if _supabase_client is not None:
+        return _supabase_client
 
-        if not url or not key:
-            raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+    async with _supabase_client_lock:
+        if _supabase_client is None:
+            url = os.environ.get("SUPABASE_URL")
+            key = os.environ.get("SUPABASE_SERVICE_KEY")
 
-        _supabase_client = await acreate_client(url, key)
+            if not url or not key:
+                raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set")
+
+            _supabase_client = await acreate_client(url, key)
 
     return _supabase_client
 
 
+def _is_transient(error: Exception, idempotent: bool) -> bool:
+    """Checks whether a failed write may be retried."""
+    if isinstance(error, _UNSENT_ERRORS):
+        return True
+    if isinstance(error, APIError) and error.code in _DB_UNREACHABLE_CODES:
+        return True
+    if not idempotent:
+        return False
+    if isinstance(error, _AMBIGUOUS_ERRORS):
+        return True
+    # Gateway errors have no PostgREST body, so the code is the HTTP status
+    return isinstance(error, APIError) and error.code in _GATEWAY_STATUS_CODES
+
+
+def _record_write_failure() -> None:
+    """Counts a transient failure, pausing writes at the threshold."""
+    global _consecutive_write_failures, _writes_paused_until
+
+    _consecutive_write_failures += 1
+    if _consecutive_write_failures >= WRITE_FAILURE_THRESHOLD:
+        _writes_paused_until = time.monotonic() + WRITE_COOLDOWN_SECONDS
+        logger.warning(
+            "Pausing profile writes after repeated failures",
+            failures=_consecutive_write_failures,
+            cooldown_seconds=WRITE_COOLDOWN_SECONDS,
+        )
+
+
+async def _write_with_retry(
+    write: Callable[[], Awaitable[T]],
+    idempotent: bool = False,
+) -> T | None:
+    """
+    Runs a database write, retrying transient failures.
+
+    Args:
+        write: Zero-argument factory for the write (called once per attempt)
+        idempotent: True if replaying a write that was already applied is
+                    harmless (inserts with client-generated ids). Only then
+                    are timeouts and gateway errors retried, since the first
+                    attempt may have been applied.
+
+    Returns:
+        The write's result; None when a retried insert turned out to have
+        been applied by an earlier attempt.
+
+    Raises:
+        RuntimeError: If writes are paused after repeated failures.
+        Exception: The last error, if it isn't transient or retries ran out.
+    """
+    global _consecutive_write_failures
+
+    if time.monotonic() < _writes_paused_until:
+        raise RuntimeError("Profile writes paused after repeated failures")
+
+    for attempt in range(WRITE_RETRY_ATTEMPTS):
+        try:
+            result = await write()
+        except Exception as e:
+            if attempt > 0 and isinstance(e, APIError) and e.code == _UNIQUE_VIOLATION:
+                # An earlier attempt was applied before its response was lost
+                _consecutive_write_failures = 0
+                return None
+            if not _is_transient(e, idempotent):
+                raise
+            _record_write_failure()
+            if attempt == WRITE_RETRY_ATTEMPTS - 1 or time.monotonic() < _writes_paused_until:
+                raise
+            delay = min(WRITE_RETRY_MAX_DELAY, WRITE_RETRY_BASE_DELAY * 2**attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+        else:
+            _consecutive_write_failures = 0
+            return result
+
+    raise AssertionError("unreachable")
+
+
+def reset_write_circuit() -> None:
+    """Clears the write failure count and any pause (for tests)."""
+    global _consecutive_write_failures, _writes_paused_until
+
+    _consecutive_write_failures = 0
+    _writes_paused_until = 0.0
+
+
 async def store_conversation_analysis(
     user_id: str,
     conversation_id: str,
     analysis: ConversationAnalysis,
     analysis_summary: str | None = None,
+    summary_embedding: list[float] | None = None,
 ) -> str | None:
     """
     Stores a conversation analysis in the database.
@@ -60,6 +200,7 @@ async def store_conversation_analysis(
         conversation_id: Conversation's UUID
         analysis: Structured analysis from LLM
         analysis_summary: Optional text summary for semantic search
+        summary_embedding: Optional embedding of analysis_summary
 
     Returns:
         The UUID of the created analysis, or None on error
@@ -68,29 +209,16 @@ async def store_conversation_analysis(
         client = await get_supabase_client()
 
         analysis_id = str(uuid4())
+        data = _analysis_record(
+            analysis_id, user_id, conversation_id, analysis, analysis_summary, summary_embedding
+        )
 
-        data = {
-            "id": analysis_id,
-            "user_id": user_id,
-            "conversation_id": conversation_id,
-            "primary_emotion": analysis.primary_emotion,
-            "emotion_intensity": analysis.emotion_intensity,
-            "emotional_valence": analysis.emotional_valence,
-            "emotional_trajectory": analysis.emotional_trajectory,
-            "topics_discussed": analysis.topics_discussed,
-            "concerns_raised": analysis.concerns_raised,
-            "positive_aspects": analysis.positive_aspects,
-            "detected_triggers": analysis.detected_triggers,
-            "conversation_type": analysis.conversation_type,
-            "engagement_level": analysis.engagement_level,
-            "follow_up_topics": analysis.follow_up_topics,
-            "suggested_activities": analysis.suggested_activities,
-            "analysis_json": analysis.model_dump(),
-            "analysis_summary": analysis_summary,
-            # Note: embedding will be added later in Phase 4
-        }
-
-        await client.table("conversation_analyses").insert(data).execute()
+        await _write_with_retry(
+            lambda: (
+                client.table("conversation_analyses").insert(data, returning=_NO_ECHO).execute()
+            ),
+            idempotent=True,
+        )
         logger.info("Conversation analysis stored", analysis_id=analysis_id)
 
         return analysis_id
@@ -100,6 +228,101 @@ async def store_conversation_analysis(
         return None
 
 
+async def store_conversation_analyses_bulk(
+    analyses: list[tuple[str, str, ConversationAnalysis, str | None]],
+) -> list[str]:
+    """
+    Stores many conversation analyses at once (e.g. batch re-analysis jobs).
+
+    Summaries are embedded in one generate_embeddings_batch() call and the
+    rows are inserted ANALYSIS_INSERT_BATCH per request, instead of one
+    embedding request and one insert per analysis.
+
+    Args:
+        analyses: (user_id, conversation_id, analysis, analysis_summary) tuples
+
+    Returns:
+        The UUIDs of the stored analyses, in input order. Stops at the first
+        failed batch, so on error only the analyses stored before it are
+        returned.
+    """
+    analysis_ids: list[str] = []
+    if not analyses:
+        return analysis_ids
+
+    try:
+        client = await get_supabase_client()
+
+        summaries = [summary for _, _, _, summary in analyses if summary]
+        embeddings = iter(await generate_embeddings_batch(summaries))
+
+        records = [
+            _analysis_record(
+                str(uuid4()),
+                user_id,
+                conversation_id,
+                analysis,
+                summary,
+                next(embeddings) if summary else None,
+            )
+            for user_id, conversation_id, analysis, summary in analyses
+        ]
+
+        for start in range(0, len(records), ANALYSIS_INSERT_BATCH):
+            batch = records[start : start + ANALYSIS_INSERT_BATCH]
+            await _write_with_retry(
+                lambda batch=batch: (
+                    client.table("conversation_analyses")
+                    .insert(batch, returning=_NO_ECHO)
+                    .execute()
+                ),
+                idempotent=True,
+            )
+            analysis_ids.extend(str(record["id"]) for record in batch)
+
+        logger.info("Conversation analyses stored in bulk", count=len(analysis_ids))
+
+    except Exception as e:
+        logger.error(
+            "Failed to store conversation analyses in bulk",
+            error=str(e),
+            stored=len(analysis_ids),
+        )
+
+    return analysis_ids
+
+
+def _analysis_record(
+    analysis_id: str,
+    user_id: str,
+    conversation_id: str,
+    analysis: ConversationAnalysis,
+    analysis_summary: str | None,
+    summary_embedding: list[float] | None,
+) -> dict[str, Any]:
+    """Builds a conversation_analyses table row."""
+    return {
+        "id": analysis_id,
+        "user_id": user_id,
+        "conversation_id": conversation_id,
+        "primary_emotion": analysis.primary_emotion,
+        "emotion_intensity": analysis.emotion_intensity,
+        "emotional_valence": analysis.emotional_valence,
+        "emotional_trajectory": analysis.emotional_trajectory,
+        "topics_discussed": analysis.topics_discussed,
+        "concerns_raised": analysis.concerns_raised,
+        "positive_aspects": analysis.positive_aspects,
+        "detected_triggers": analysis.detected_triggers,
+        "conversation_type": analysis.conversation_type,
+        "engagement_level": analysis.engagement_level,
+        "follow_up_topics": analysis.follow_up_topics,
+        "suggested_activities": analysis.suggested_activities,
+        "analysis_json": analysis.model_dump(),
+        "analysis_summary": analysis_summary,
+        "embedding": to_halfvec_literal(summary_embedding) if summary_embedding else None,
+    }
+
+
 async def store_emotional_snapshot(
     user_id: str,
     analysis: ConversationAnalysis,
@@ -138,7 +361,10 @@ async def store_emotional_snapshot(
             "confidence": 0.8,  # Default confidence for LLM-inferred emotions
         }
 
-        await client.table("emotional_snapshots").insert(data).execute()
+        await _write_with_retry(
+            lambda: client.table("emotional_snapshots").insert(data, returning=_NO_ECHO).execute(),
+            idempotent=True,
+        )
         logger.info("Emotional snapshot stored", snapshot_id=snapshot_id)
 
         return snapshot_id
@@ -155,7 +381,10 @@ async def update_wellness_profile(
     """
     Updates the user's wellness profile with insights from the analysis.
 
-    This updates aggregate fields and tracking counters.
+    This updates aggregate fields and tracking counters. The merge runs in
+    the record_conversation_in_profile database function as one upsert, so
+    it's a single round-trip and concurrent conversations can't overwrite
+    each other's updates.
 
     Args:
         user_id: User's UUID
@@ -167,58 +396,21 @@ async def update_wellness_profile(
     try:
         client = await get_supabase_client()
 
-        # First, get current profile to merge arrays
-        result = await (
-            client.table("user_wellness_profiles")
-            .select("*")
-            .eq("user_id", user_id)
-            .single()
-            .execute()
-        )
-
-        current = result.data if result.data else {}
-
-        # Merge recurring topics (keep unique, limit to 10 most recent)
-        existing_topics = current.get("recurring_topics") or []
-        new_topics = list(set(existing_topics + analysis.topics_discussed))[:10]
-
-        # Merge recurring triggers
-        existing_triggers = current.get("recurring_triggers") or []
-        new_triggers = list(set(existing_triggers + analysis.detected_triggers))[:10]
-
-        # Increment conversation count
-        total_conversations = (current.get("total_conversations") or 0) + 1
-
-        # Determine emotional baseline from recent pattern
-        emotional_baseline = _determine_emotional_baseline(analysis)
-
-        # Build update data
-        update_data: dict[str, Any] = {
-            "recurring_topics": new_topics,
-            "recurring_triggers": new_triggers,
-            "total_conversations": total_conversations,
-            "last_interaction_at": datetime.now(UTC).isoformat(),
-            "updated_at": datetime.now(UTC).isoformat(),
+        params = {
+            "p_user_id": user_id,
+            "p_topics": analysis.topics_discussed,
+            "p_triggers": analysis.detected_triggers,
+            # Only set when significant / when concerns were raised
+            "p_emotional_baseline": _determine_emotional_baseline(analysis),
+            "p_primary_concern": (
+                analysis.concerns_raised[0] if analysis.concerns_raised else None
+            ),
         }
 
-        # Update emotional baseline if significant
-        if emotional_baseline:
-            update_data["emotional_baseline"] = emotional_baseline
-            update_data["emotional_baseline_updated_at"] = datetime.now(UTC).isoformat()
-
-        # Update current primary concern if concerns were raised
-        if analysis.concerns_raised:
-            update_data["current_primary_concern"] = analysis.concerns_raised[0]
-
-        # Set first interaction if not set
-        if not current.get("first_interaction_at"):
-            update_data["first_interaction_at"] = datetime.now(UTC).isoformat()
-
-        # Upsert the profile
-        await (
-            client.table("user_wellness_profiles")
-            .upsert({"user_id": user_id, **update_data})
-            .execute()
+        # Not idempotent (it increments total_conversations), so only
+        # failures that never reached the database are retried
+        await _write_with_retry(
+            lambda: client.rpc("record_conversation_in_profile", params).execute()
         )
 
         logger.info("Wellness profile updated", user_id=user_id)
@@ -276,6 +468,11 @@ async def update_activity_effectiveness(
     Called after an activity is completed to track how well
     different activities work for the user.
 
+    The counters are incremented atomically by the record_activity_outcome
+    database function, which returns the new totals; the derived score is
+    then written back. The write-back only applies while times_started is
+    unchanged, so a concurrent run's newer score isn't overwritten.
+
     Args:
         user_id: User's UUID
         activity_type: Type of activity (breathing, meditation, etc.)
@@ -290,36 +487,28 @@ async def update_activity_effectiveness(
     try:
         client = await get_supabase_client()
 
-        # Get existing effectiveness record
-        result = await (
-            client.table("activity_effectiveness")
-            .select("*")
-            .eq("user_id", user_id)
-            .eq("activity_type", activity_type)
-            .eq("technique", technique or "")
-            .maybeSingle()
-            .execute()
+        # Mood change tracking (None when either rating is missing)
+        mood_change = (
+            mood_after - mood_before if mood_before is not None and mood_after is not None else None
         )
 
-        existing = result.data if result.data else {}
-
-        # Calculate updates
-        times_started = (existing.get("times_started") or 0) + 1
-        times_completed = (existing.get("times_completed") or 0) + (1 if completed else 0)
-
-        # Mood change tracking
-        mood_improvements = existing.get("mood_improvements") or 0
-        mood_no_change = existing.get("mood_no_change") or 0
-        mood_declines = existing.get("mood_declines") or 0
-
-        if mood_before is not None and mood_after is not None:
-            mood_change = mood_after - mood_before
-            if mood_change > 0:
-                mood_improvements += 1
-            elif mood_change < 0:
-                mood_declines += 1
-            else:
-                mood_no_change += 1
+        result = await client.rpc(
+            "record_activity_outcome",
+            {
+                "p_user_id": user_id,
+                "p_activity_type": activity_type,
+                "p_technique": technique or "",
+                "p_completed": completed,
+                "p_mood_change": mood_change,
+            },
+        ).execute()
+        counters = result.data[0]
+
+        times_started = counters["times_started"]
+        times_completed = counters["times_completed"]
+        mood_improvements = counters["mood_improvements"]
+        mood_no_change = counters["mood_no_change"]
+        mood_declines = counters["mood_declines"]
 
         # Calculate average mood change
         total_with_mood = mood_improvements + mood_no_change + mood_declines
@@ -342,32 +531,25 @@ async def update_activity_effectiveness(
         # Determine if recommended
         is_recommended = effectiveness_score >= 50 and times_completed >= 3
 
-        now = datetime.now(UTC).isoformat()
-
-        data = {
-            "user_id": user_id,
-            "activity_type": activity_type,
-            "technique": technique or "",
-            "times_started": times_started,
-            "times_completed": times_completed,
-            "mood_improvements": mood_improvements,
-            "mood_no_change": mood_no_change,
-            "mood_declines": mood_declines,
-            "average_mood_change": average_mood_change,
-            "effectiveness_score": effectiveness_score,
-            "is_recommended": is_recommended,
-            "recommendation_reason": _get_recommendation_reason(
-                effectiveness_score, mood_improvement_rate, times_completed
-            ),
-            "last_used_at": now,
-            "updated_at": now,
-        }
-
-        # Set first_used_at only on insert
-        if not existing:
-            data["first_used_at"] = now
-
-        await client.table("activity_effectiveness").upsert(data).execute()
+        await (
+            client.table("activity_effectiveness")
+            .update(
+                {
+                    "average_mood_change": average_mood_change,
+                    "effectiveness_score": effectiveness_score,
+                    "is_recommended": is_recommended,
+                    "recommendation_reason": _get_recommendation_reason(
+                        effectiveness_score, mood_improvement_rate, times_completed
+                    ),
+                },
+                returning=_NO_ECHO,
+            )
+            .eq("user_id", user_id)
+            .eq("activity_type", activity_type)
+            .eq("technique", technique or "")
+            .eq("times_started", times_started)
+            .execute()
+        )
         logger.info(
             "Activity effectiveness updated",
             activity=activity_type,
@@ -382,18 +564,27 @@ async def update_activity_effectiveness(
         return False
 
 
+# Recommendation reasons, checked in order:
+# (min score, min mood improvement rate, min times completed, reason)
+_RECOMMENDATION_RULES: tuple[tuple[float, float, int, str], ...] = (
+    (70.0, 0.6, 0, "Consistently improves your mood"),
+    (60.0, 0.0, 5, "You complete this regularly and it helps"),
+    (0.0, 0.5, 0, "Often helps improve your mood"),
+    (50.0, 0.0, 0, "Works well for you"),
+)
+
+
 def _get_recommendation_reason(
     score: float,
     mood_improvement_rate: float,
     times_completed: int,
 ) -> str | None:
-    """Generates a human-readable recommendation reason."""
-    if score >= 70 and mood_improvement_rate >= 0.6:
-        return "Consistently improves your mood"
-    if score >= 60 and times_completed >= 5:
-        return "You complete this regularly and it helps"
-    if mood_improvement_rate >= 0.5:
-        return "Often helps improve your mood"
-    if score >= 50:
-        return "Works well for you"
+    """Generates a human-readable recommendation reason (first matching rule)."""
+    for min_score, min_mood_rate, min_completed, reason in _RECOMMENDATION_RULES:
+        if (
+            score >= min_score
+            and mood_improvement_rate >= min_mood_rate
+            and times_completed >= min_completed
+        ):
+            return reason
     return None
@@ -149,7 +149,7 @@ async def get_user_breathing_session_count(user_id: str | None) -> int:
         supabase = await get_supabase_client()
 
         # Query breathing_sessions table (created in migration 005)
-        result = (
+        result = await (
             supabase.table("breathing_sessions")
             .select("id", count="exact")
             .eq("user_id", user_id)
@@ -186,7 +186,7 @@ async def get_user_wim_hof_session_count(user_id: str | None) -> int:
 
         supabase = await get_supabase_client()
 
-        result = (
+        result = await (
             supabase.table("breathing_sessions")
             .select("id", count="exact")
             .eq("user_id", user_id)
@@ -14,15 +14,21 @@ Classification outputs:
 - meditation: User seeks focus, mindfulness, presence
 - journaling: User wants to express/process feelings
 - None: Normal conversation, no activity needed
+
+Messages that explicitly request exactly one activity ("let's meditate",
+"I want to journal") are routed by a keyword pre-pass without calling the LLM.
+Concurrent requests with an identical detection prompt (typically common
+opening messages) share a single in-flight LLM call (see src.llm.call_cache).
 ============================================================================
 """
 
+import re
 from typing import Literal
 
 from langchain_core.messages import BaseMessage, HumanMessage
 from pydantic import BaseModel, Field
 
-from src.graph.state import WellnessState
+from src.graph.state import ActivityType, WellnessState
 from src.llm.providers import ModelTier, create_resilient_llm
 from src.logging_config import NodeLogger
 
@@ -82,6 +88,69 @@ def get_recent_context(messages: list[BaseMessage], count: int = 3) -> str:
     return "\n".join(recent)
 
 
+# -----------------------------------------------------------------------------
+# Keyword Pre-Classifier
+# -----------------------------------------------------------------------------
+
+# An explicit request: an intent phrase followed directly by the activity,
+# optionally through a start verb and an article ("let's meditate", "let's
+# do a breathing exercise", "help me start journaling"). Questions ("can you
+# explain what meditation is"), mentions ("I meditated this morning") and
+# other verbs ("I want to quit journaling") don't match and go to the LLM,
+# which applies its confidence threshold.
+_INTENT = (
+    r"\b(?:let['\u2019]?s|let us|help me|guide me through|walk me through|teach me to|"
+    r"i want to|i['\u2019]?d like to|i would like to)"
+)
+_START_VERB = r"(?:\s+(?:do|try|start|begin|practice|practise))?"
+_ARTICLE = r"(?:\s+(?:a|an|some|the|my))?"
+_ADJECTIVE = r"(?:\s+(?:quick|short|little|guided|calming))?"
+
+
+def _request_pattern(activity_words: str) -> re.Pattern[str]:
+    """Compiles an intent-phrase-then-activity-word pattern."""
+    return re.compile(
+        _INTENT + _START_VERB + _ARTICLE + _ADJECTIVE + rf"\s+(?:{activity_words})\b",
+        re.IGNORECASE,
+    )
+
+
+# A message matching exactly one of these is routed directly; anything else
+# (no match, several matches) goes to the LLM.
+ACTIVITY_KEYWORDS: dict[ActivityType, re.Pattern[str]] = {
+    "breathing": _request_pattern(r"breathing|breathe|breathwork"),
+    "meditation": _request_pattern(r"meditate|meditation|mindfulness"),
+    "journaling": _request_pattern(r"journal|journaling"),
+}
+
+# Negations and refusals ("I don't want to meditate", "can we skip the
+# breathing", "something other than meditation") need the LLM to read intent
+NEGATION_PATTERN = re.compile(
+    r"\b(?:not|no|never|don['\u2019]?t|doesn['\u2019]?t|can['\u2019]?t|cannot|"
+    r"won['\u2019]?t|stop|hate|skip|quit|without|other than|instead of|rather than)\b",
+    re.IGNORECASE,
+)
+
+
+def classify_by_keywords(message: str) -> ActivityType | None:
+    """
+    Classifies a message by explicit activity requests.
+
+    Returns the activity when exactly one activity is requested ("let's
+    meditate", "help me start journaling") and the message has no negation,
+    otherwise None (meaning: ask the LLM).
+    """
+    if NEGATION_PATTERN.search(message):
+        return None
+
+    matches = [
+        activity for activity, pattern in ACTIVITY_KEYWORDS.items() if pattern.search(message)
+    ]
+    if len(matches) == 1:
+        return matches[0]
+    return None
+
+
 # -----------------------------------------------------------------------------
 # Detection Prompt
 # -----------------------------------------------------------------------------
@@ -119,6 +188,34 @@ Current user message:
 Analyze this and determine if a wellness activity would help."""
 
 
+# -----------------------------------------------------------------------------
+# LLM Detection
+# -----------------------------------------------------------------------------
+
+
+async def detect_with_llm(prompt: str) -> ActivityDetection:
+    """
+    Classifies a detection prompt with the LLM.
+
+    Identical concurrent prompts (typically common opening messages) share
+    one upstream call via the resilient LLM's call cache. Different prompts
+    are deliberately not micro-batched into one multi-item LLM call: the
+    prompts carry other users' conversation context, and one user's text
+    must not be able to influence (or leak into) another's classification.
+
+    Args:
+        prompt: The formatted DETECTION_PROMPT
+
+    Returns:
+        The structured detection result.
+    """
+    # Create resilient LLM with LITE tier (simple classification task)
+    # Falls back to Haiku on rate limits
+    llm = create_resilient_llm(tier=ModelTier.LITE, temperature=0.2, max_tokens=200)
+    structured_llm = llm.with_structured_output(ActivityDetection)
+    return await structured_llm.ainvoke([HumanMessage(content=prompt)])
+
+
 # -----------------------------------------------------------------------------
 # Main Node Function
 # -----------------------------------------------------------------------------
@@ -128,8 +225,9 @@ async def detect_activity_intent(state: WellnessState) -> dict[str, str | None]:
     """
     Analyzes conversation to detect if an activity would be helpful.
 
-    Uses LLM with structured output for reliable classification.
-    Only routes to activities when confidence is above threshold (0.7).
+    Explicit single-activity messages are routed by keyword without an
+    LLM call. Otherwise uses LLM with structured output for reliable
+    classification, and only routes when confidence is above threshold (0.7).
 
     Args:
         state: Current conversation state including messages
@@ -145,19 +243,22 @@ async def detect_activity_intent(state: WellnessState) -> dict[str, str | None]:
 
     # Get the user's message and recent context
     last_message = get_last_user_message(messages)
+
+    # Cheap pre-pass: skip the LLM round-trip for explicit activity requests
+    keyword_activity = classify_by_keywords(last_message)
+    if keyword_activity:
+        logger.info("Activity keyword matched → routing", activity=keyword_activity)
+        logger.node_end()
+        return {"suggested_activity": keyword_activity}
+
     context = get_recent_context(messages)
 
-    # Create resilient LLM with LITE tier (simple classification task)
-    # Falls back to Haiku on rate limits
     try:
-        llm = create_resilient_llm(tier=ModelTier.LITE, temperature=0.2, max_tokens=200)
-        structured_llm = llm.with_structured_output(ActivityDetection)
-
         # Format the detection prompt
         prompt = DETECTION_PROMPT.format(context=context, message=last_message)
 
         # Run detection
-        result: ActivityDetection = await structured_llm.ainvoke([HumanMessage(content=prompt)])
+        result = await detect_with_llm(prompt)
 
         # Only route if confidence is high enough
         confidence_threshold = 0.7
@@ -143,6 +143,8 @@ async def generate_response(state: WellnessState) -> dict[str, list[object]]:
                 "I'm having a moment of difficulty connecting right now. "
                 "Could you give me a moment and try again? "
                 "I'm here to support you."
-            )
+            ),
+            # Marked so the semantic response cache never stores it
+            response_metadata={"fallback": True},
         )
         return {"messages": [fallback]}
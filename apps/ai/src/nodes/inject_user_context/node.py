@@ -5,8 +5,11 @@ Inject User Context Node
 Injects authenticated user info from LangGraph auth into graph state,
 along with the user's wellness profile for personalization.
 
-This node MUST run first in the graph so all downstream nodes have access
-to user_context with the authenticated user's information.
+Runs inside prepare_request (concurrently with activity detection) in the
+first super-step, so every activity node has user_context available.
+It is not a separate graph node: the auth mapping alone would fit in a
+state reducer or the API handler, but the wellness profile fetch is
+network I/O, so it stays an awaited step alongside the other first-step work.
 
 Flow:
 1. LangGraph auth validates token and stores user info in config
@@ -119,6 +122,8 @@ async def inject_user_context(
         - If no auth user found, returns empty dict (unauthenticated request)
         - Maps 'identity' key from auth to 'user_id' key expected by nodes
         - Wellness profile is optional - missing profile won't block execution
+        - Must stay async: the wellness profile is fetched over the network,
+          so a sync version would block the event loop during the fan-out
     """
     logger.node_start()
 
@@ -0,0 +1,12 @@
+"""
+============================================================================
+Prepare Request Node
+============================================================================
+Runs user context injection and activity detection as a single graph step,
+returning user_context and suggested_activity for conditional routing.
+============================================================================
+"""
+
+from src.nodes.prepare_request.node import prepare_request
+
+__all__ = ["prepare_request"]
@@ -0,0 +1,59 @@
+"""
+============================================================================
+Prepare Request Node
+============================================================================
+Fuses user context injection, activity detection and the semantic cache
+lookup into a single node.
+
+These steps used to be separate fan-out nodes from START. Running them
+inside one node removes scheduled tasks and checkpoint writes per turn,
+and it means the routing branch off this node sees all of their results:
+a branch only sees the state committed before its super-step plus its own
+node's writes, so a cache hit written by a sibling node was invisible to it.
+
+Flow:
+1. inject_user_context, detect_activity_intent and semantic_cache_lookup
+   run concurrently (none depends on another's output)
+2. Their partial state updates are merged and returned together
+3. The graph routes on cache_hit / suggested_activity straight from this node
+
+retrieve_memories still runs in parallel from START, in the same
+super-step, so memories are in state before any activity node runs.
+============================================================================
+"""
+
+import asyncio
+
+from langchain_core.runnables import RunnableConfig
+
+from src.graph.state import WellnessState
+from src.nodes.detect_activity.node import detect_activity_intent
+from src.nodes.inject_user_context.node import inject_user_context
+from src.nodes.semantic_cache.node import semantic_cache_lookup
+
+
+async def prepare_request(state: WellnessState, config: RunnableConfig) -> dict[str, object]:
+    """
+    Injects user context, detects activity intent and checks the response cache.
+
+    Args:
+        state: Current graph state (messages, etc.)
+        config: LangGraph config containing langgraph_auth_user
+
+    Returns:
+        Merged state update with user_context (when authenticated),
+        suggested_activity and cache_hit for conditional routing, plus the
+        cached AIMessage on a cache hit.
+    """
+    context_update, activity_update, cache_update = await asyncio.gather(
+        inject_user_context(state, config),
+        detect_activity_intent(state),
+        semantic_cache_lookup(state, config),
+    )
+
+    # The cached reply already answers the turn, so the classification is
+    # discarded (the cache only holds replies to no-activity opening messages)
+    if cache_update.get("cache_hit"):
+        activity_update = {"suggested_activity": None}
+
+    return {**context_update, **activity_update, **cache_update}
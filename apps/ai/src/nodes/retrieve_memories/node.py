@@ -36,9 +36,9 @@ async def retrieve_memories(
     conversations that may be relevant to the current discussion.
     Results are ordered by similarity.
 
-    This node runs at START in parallel with inject_user_context and
-    detect_activity. It gets user_id directly from the LangGraph auth
-    config rather than waiting for inject_user_context to populate state.
+    This node runs at START in parallel with prepare_request. It gets
+    user_id directly from the LangGraph auth config rather than waiting
+    for prepare_request to populate user_context in state.
 
     Args:
         state: Current conversation state with messages
@@ -60,7 +60,7 @@ async def retrieve_memories(
     logger.node_start()
 
     # Get user_id directly from LangGraph auth config
-    # This allows memory retrieval to run at START in parallel with inject_user_context
+    # This allows memory retrieval to run at START in parallel with prepare_request
     configurable = config.get("configurable", {})
     auth_user = configurable.get("langgraph_auth_user", {})
     user_id = get_auth_user_field(auth_user, "identity")
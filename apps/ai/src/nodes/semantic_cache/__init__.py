@@ -0,0 +1,16 @@
+"""
+============================================================================
+Semantic Cache Node
+============================================================================
+Short-circuits response generation for opening messages that closely
+match one the user has already received a reply to.
+============================================================================
+"""
+
+from src.nodes.semantic_cache.node import (
+    cache_response,
+    is_opening_turn,
+    semantic_cache_lookup,
+)
+
+__all__ = ["cache_response", "is_opening_turn", "semantic_cache_lookup"]
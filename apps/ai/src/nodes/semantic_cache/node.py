@@ -0,0 +1,104 @@
+"""
+============================================================================
+Semantic Cache Lookup Node
+============================================================================
+Answers repeated opening messages from the semantic response cache.
+
+Many conversations open with near-identical messages ("I'm anxious",
+"help me sleep"). This node embeds the user's message and checks the
+per-user response cache; on a hit it adds the cached reply to state and
+the graph routes straight to store_memory, skipping generate_response.
+
+Position in graph: Runs inside prepare_request, concurrently with user
+context injection and activity detection, so the routing branch off
+prepare_request sees cache_hit. The embedding goes through the same
+Redis-cached path as memory retrieval.
+============================================================================
+"""
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.graph.state import WellnessState
+from src.logging_config import NodeLogger
+from src.memory.store import get_query_embedding
+from src.nodes.semantic_cache.response_cache import response_cache
+from src.utils.auth_helpers import get_auth_user_field
+
+# Set up logging for this node
+logger = NodeLogger("semantic_cache")
+
+
+def is_opening_turn(messages: list[BaseMessage]) -> bool:
+    """
+    Returns True if the conversation has no AI reply before the latest message.
+
+    Only opening turns are cached, since later replies depend on history.
+    """
+    return not any(isinstance(m, AIMessage) for m in messages[:-1])
+
+
+async def cache_response(user_id: str, user_message: str, ai_response: str) -> None:
+    """
+    Adds a generated response to the semantic cache.
+
+    Called by the memory writers after an opening turn is answered by
+    generate_response. The query embedding is usually already in Redis
+    from memory retrieval, so this rarely hits the embedding API.
+
+    Args:
+        user_id: The user who received the response
+        user_message: The opening message that was answered
+        ai_response: The generated response text
+    """
+    embedding = await get_query_embedding(user_id, user_message)
+    response_cache.add(user_id, embedding, ai_response)
+
+
+async def semantic_cache_lookup(state: WellnessState, config: RunnableConfig) -> dict[str, object]:
+    """
+    Looks up a cached response for the user's opening message.
+
+    Args:
+        state: Current conversation state with messages
+        config: LangGraph config containing langgraph_auth_user
+
+    Returns:
+        {"cache_hit": True, "messages": [AIMessage]} on a hit,
+        otherwise {"cache_hit": False} (resets the flag from earlier turns).
+
+    Note:
+        - Skipped for unauthenticated requests and non-opening turns
+        - Errors are logged and treated as a miss
+    """
+    logger.node_start()
+
+    configurable = config.get("configurable", {})
+    auth_user = configurable.get("langgraph_auth_user", {})
+    user_id = get_auth_user_field(auth_user, "identity")
+    messages = state.get("messages", [])
+
+    if not user_id or not messages or not isinstance(messages[-1], HumanMessage):
+        logger.node_end()
+        return {"cache_hit": False}
+
+    if not is_opening_turn(messages):
+        logger.node_end()
+        return {"cache_hit": False}
+
+    try:
+        embedding = await get_query_embedding(user_id, str(messages[-1].content))
+        cached = response_cache.lookup(user_id, embedding)
+    except Exception as e:
+        logger.error("Semantic cache lookup failed", error=str(e))
+        logger.node_end()
+        return {"cache_hit": False}
+
+    if cached is None:
+        logger.info("Semantic cache MISS")
+        logger.node_end()
+        return {"cache_hit": False}
+
+    logger.info("Semantic cache HIT → skipping response generation")
+    logger.node_end()
+    return {"cache_hit": True, "messages": [AIMessage(content=cached)]}
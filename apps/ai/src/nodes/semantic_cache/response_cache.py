@@ -0,0 +1,177 @@
+"""
+============================================================================
+Semantic Response Cache
+============================================================================
+In-process cache of AI responses keyed by the meaning of the user message.
+
+Each user gets their own matrix of L2-normalized query embeddings. A lookup
+is a single matrix-vector product (cosine similarity against every cached
+query) followed by an argmax, which takes microseconds for a few hundred
+entries.
+
+Vectors are stored quantized to int8 with a per-vector scale (768 bytes
+per entry instead of 3KB as float32). Similarity is computed on the int8
+values with int32 accumulation and rescaled; the quantization error
+(~1e-3 in cosine) is far below the hit threshold's margin.
+
+Scope:
+- Per-user isolation: responses are personalized, so they're never shared
+- Opening turns only (enforced by the node): a cached reply to a first
+  message doesn't depend on earlier conversation history
+- Bounded: entries per user and number of users are capped, oldest first
+============================================================================
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from src.memory.embeddings import EMBEDDING_DIMENSIONS
+
+# Cosine similarity required to reuse a cached response
+SIMILARITY_THRESHOLD = 0.9
+
+# Capacity limits (oldest entries/users are evicted first)
+MAX_ENTRIES_PER_USER = 256
+MAX_USERS = 1024
+
+# Cached responses expire so profile changes eventually show up in replies
+RESPONSE_TTL_SECONDS = 24 * 60 * 60  # 24 hours
+
+
+# Largest int8 magnitude used for quantized vectors
+_INT8_MAX = 127
+
+
+@dataclass
+class _UserResponses:
+    """Cached query vectors (int8 + per-row scale) and responses for a single user."""
+
+    vectors: np.ndarray = field(
+        default_factory=lambda: np.empty((0, EMBEDDING_DIMENSIONS), dtype=np.int8)
+    )
+    scales: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
+    responses: list[str] = field(default_factory=list)
+    created_at: list[float] = field(default_factory=list)
+
+
+def _normalize(embedding: list[float]) -> np.ndarray | None:
+    """Returns the embedding as a unit-length float32 vector, or None if degenerate."""
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if vector.shape != (EMBEDDING_DIMENSIONS,) or norm == 0.0:
+        return None
+    return vector / norm
+
+
+def _quantize(vector: np.ndarray) -> tuple[np.ndarray, np.float32]:
+    """
+    Quantizes a float vector to int8 with a symmetric per-vector scale.
+
+    Returns (int8 values, scale) such that values * scale ≈ vector.
+    """
+    scale = np.float32(np.abs(vector).max() / _INT8_MAX)
+    return np.round(vector / scale).astype(np.int8), scale
+
+
+class SemanticResponseCache:
+    """
+    Per-user cosine-similarity cache of AI responses.
+
+    Example:
+        cache = SemanticResponseCache()
+        cache.add(user_id, embedding, "I hear you...")
+        response = cache.lookup(user_id, embedding)  # "I hear you..."
+    """
+
+    def __init__(
+        self,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_entries_per_user: int = MAX_ENTRIES_PER_USER,
+        max_users: int = MAX_USERS,
+        ttl_seconds: float = RESPONSE_TTL_SECONDS,
+    ) -> None:
+        self.threshold = threshold
+        self.max_entries_per_user = max_entries_per_user
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._users: OrderedDict[str, _UserResponses] = OrderedDict()
+
+    def lookup(self, user_id: str, embedding: list[float]) -> str | None:
+        """
+        Finds the cached response whose query is most similar to this one.
+
+        Args:
+            user_id: The user whose cache to search
+            embedding: Embedding of the current user message
+
+        Returns:
+            The cached response text, or None if nothing is similar enough.
+        """
+        entries = self._users.get(user_id)
+        if entries is None or not entries.responses:
+            return None
+
+        query = _normalize(embedding)
+        if query is None:
+            return None
+
+        # int8 dot products accumulated in int32 (int16 would overflow),
+        # then rescaled to cosine similarity
+        q_values, q_scale = _quantize(query)
+        raw = entries.vectors.astype(np.int32) @ q_values.astype(np.int32)
+        scores = raw * entries.scales * q_scale
+        best = int(scores.argmax())
+
+        if scores[best] < self.threshold:
+            return None
+        if time.time() - entries.created_at[best] > self.ttl_seconds:
+            return None
+
+        self._users.move_to_end(user_id)
+        return entries.responses[best]
+
+    def add(self, user_id: str, embedding: list[float], response: str) -> None:
+        """
+        Caches a response for the given query embedding.
+
+        Args:
+            user_id: The user who received the response
+            embedding: Embedding of the user message that produced it
+            response: The AI response text
+        """
+        vector = _normalize(embedding)
+        if vector is None:
+            return
+
+        entries = self._users.get(user_id)
+        if entries is None:
+            entries = _UserResponses()
+            self._users[user_id] = entries
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        self._users.move_to_end(user_id)
+
+        values, scale = _quantize(vector)
+        entries.vectors = np.vstack([entries.vectors, values])
+        entries.scales = np.append(entries.scales, scale)
+        entries.responses.append(response)
+        entries.created_at.append(time.time())
+
+        # Drop the oldest entries beyond the per-user limit
+        overflow = len(entries.responses) - self.max_entries_per_user
+        if overflow > 0:
+            entries.vectors = entries.vectors[overflow:]
+            entries.scales = entries.scales[overflow:]
+            del entries.responses[:overflow]
+            del entries.created_at[:overflow]
+
+    def clear(self) -> None:
+        """Removes every cached response."""
+        self._users.clear()
+
+
+# Process-wide cache shared by the lookup node and the memory writers
+response_cache = SemanticResponseCache()
@@ -9,6 +9,10 @@ for future semantic search retrieval.
 ============================================================================
 """
 
-from src.nodes.store_memory.node import store_memory_node
+from src.nodes.store_memory.node import (
+    flush_memory_writes,
+    shutdown_memory_writer,
+    store_memory_node,
+)
 
-__all__ = ["store_memory_node"]
+__all__ = ["flush_memory_writes", "shutdown_memory_writer", "store_memory_node"]
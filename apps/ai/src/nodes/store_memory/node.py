@@ -5,38 +5,241 @@ Store Memory Node
 Stores the conversation pair as a memory after generating a response.
 
 This node:
-1. Extracts the latest user message and AI response
-2. Saves them to the messages table (for conversation history)
-3. Stores them as a memory with an embedding (for semantic search)
-4. Returns without modifying state (side-effect only)
+1. Schedules background profile analysis for the turn
+2. Extracts the latest user message and AI response
+3. Enqueues the pair on its conversation's bounded background write queue
+4. Returns immediately without modifying state (side-effect only)
 
-Position in graph: Runs AFTER generate_response (after streaming completes)
+Background writers then:
+1. Save the pair to the messages table (for conversation history)
+2. Store it as a memory with an embedding (for semantic search), unless
+   it is trivially short or repeats one of the user's recent memories
+
+Each conversation always maps to the same writer, so its turns are saved
+in order (as the old inline write guaranteed) while different
+conversations are written concurrently.
+
+Position in graph: Runs AFTER generate_response (after streaming completes),
+last node before END
 Execution: Fire-and-forget (errors logged, don't block response delivery)
 ============================================================================
 """
 
+import asyncio
+import zlib
+from dataclasses import dataclass
+
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_core.runnables import RunnableConfig
 
 from src.graph.state import WellnessState
 from src.logging_config import NodeLogger
+from src.memory.cache import is_recent_memory, remember_memory_hash
+from src.memory.embeddings import format_memory_text, generate_embedding
 from src.memory.store import generate_title_if_needed, save_messages, store_memory
+from src.nodes.analyze_profile.node import schedule_profile_analysis
+from src.nodes.semantic_cache import cache_response, is_opening_turn
 
 # Set up logging for this node
 logger = NodeLogger("store_memory")
 
+# Background write queue configuration
+# Each writer has its own queue; a conversation is always routed to the same
+# one. Queues are bounded so a slow database can't grow memory without limit.
+# When a queue is full, the node waits for space (rather than writing inline,
+# which could save a turn ahead of the conversation's earlier queued turns).
+MEMORY_QUEUE_MAXSIZE = 1024
+MEMORY_WRITER_COUNT = 2
+
+# Memory texts shorter than this (e.g. "ok" / "Glad to help!") aren't worth
+# an embedding; the pair is still saved to the messages table
+MEMORY_MIN_CHARS = 40
+
+
+@dataclass
+class MemoryWrite:
+    """A conversation pair waiting to be persisted by a background writer."""
+
+    user_id: str
+    conversation_id: str | None
+    user_message: str
+    ai_response: str
+    # Add the response to the semantic response cache once persisted
+    cache_response: bool = False
+
+
+# Queues and worker tasks are created lazily on the running event loop
+# (asyncio queues are bound to the loop that first uses them)
+_memory_queues: list[asyncio.Queue[MemoryWrite]] = []
+_memory_queue_loop: asyncio.AbstractEventLoop | None = None
+_memory_workers: list[asyncio.Task[None]] = []
+
+
+def _get_memory_queue(write: MemoryWrite) -> asyncio.Queue[MemoryWrite]:
+    """
+    Gets the write queue for a pair's conversation, starting writers if needed.
+
+    The queue is picked by a stable hash of the conversation_id (user_id
+    when there is none), so one conversation's turns are persisted in order.
+    """
+    global _memory_queues, _memory_queue_loop, _memory_workers
+
+    loop = asyncio.get_running_loop()
+    if not _memory_queues or _memory_queue_loop is not loop:
+        _memory_queues = [
+            asyncio.Queue(maxsize=MEMORY_QUEUE_MAXSIZE) for _ in range(MEMORY_WRITER_COUNT)
+        ]
+        _memory_queue_loop = loop
+        _memory_workers = [loop.create_task(_memory_writer_loop(queue)) for queue in _memory_queues]
+
+    shard_key = write.conversation_id or write.user_id
+    return _memory_queues[zlib.crc32(shard_key.encode()) % len(_memory_queues)]
+
+
+async def _memory_writer_loop(queue: asyncio.Queue[MemoryWrite]) -> None:
+    """Consumes queued conversation pairs and persists them one at a time."""
+    while True:
+        write = await queue.get()
+        try:
+            await persist_memory_write(write)
+        except Exception as e:
+            # persist_memory_write already logs its own failures; this is a last resort
+            logger.error("Background memory write failed", error=str(e))
+        finally:
+            queue.task_done()
+
+
+async def flush_memory_writes() -> None:
+    """
+    Waits until every queued conversation pair has been persisted.
+
+    Safe to call when nothing has been queued on the running loop.
+    """
+    if _memory_queues and _memory_queue_loop is asyncio.get_running_loop():
+        await asyncio.gather(*(queue.join() for queue in _memory_queues))
+
+
+async def shutdown_memory_writer() -> None:
+    """
+    Flushes pending writes and stops the background writers.
+
+    Call this during application shutdown so queued memories aren't lost.
+    """
+    global _memory_queues, _memory_queue_loop, _memory_workers
+
+    await flush_memory_writes()
+
+    for worker in _memory_workers:
+        worker.cancel()
+    await asyncio.gather(*_memory_workers, return_exceptions=True)
+
+    _memory_queues = []
+    _memory_queue_loop = None
+    _memory_workers = []
+
+
+async def persist_memory_write(write: MemoryWrite) -> None:
+    """
+    Persists a conversation pair to the messages and memories tables.
+
+    1. Saves to messages table (for conversation history retrieval)
+    2. Stores with embedding (for semantic search)
+
+    The embedding is requested up front, so the embedding API call overlaps
+    the messages insert instead of starting after it. Trivially short pairs
+    and repeats of the user's recent memories skip step 2 (and the
+    embedding) entirely.
+
+    Errors are logged but never raised - the user already has their response.
+
+    Args:
+        write: The conversation pair to persist
+    """
+    conversation_id = write.conversation_id
+
+    memory_text = format_memory_text(write.user_message, write.ai_response)
+    embedding_task: asyncio.Future[list[float]] | None = None
+    if len(memory_text) < MEMORY_MIN_CHARS:
+        logger.info("Memory too short - skipping embedding", chars=len(memory_text))
+    elif await is_recent_memory(write.user_id, memory_text):
+        logger.info("Memory repeats a recent one - skipping embedding")
+    else:
+        # Start embedding the pair now; it's awaited when the memory is stored
+        embedding_task = asyncio.ensure_future(generate_embedding(memory_text))
+
+    # Save to messages table (for conversation history)
+    # Only if we have a valid conversation_id
+    messages_saved = False
+    if conversation_id:
+        try:
+            supabase_ok, cache_ok = await save_messages(
+                conversation_id=conversation_id,
+                user_message=write.user_message,
+                ai_response=write.ai_response,
+            )
+            messages_saved = supabase_ok
+            logger.info(
+                "save_messages completed",
+                supabase_success=supabase_ok,
+                cache_success=cache_ok,
+            )
+            # Generate a title for the conversation if one doesn't exist
+            # This ensures conversations have meaningful titles in history
+            await generate_title_if_needed(conversation_id)
+        except Exception as e:
+            # Log the full error for debugging
+            logger.error(
+                "CRITICAL: Failed to save messages to Supabase",
+                error=str(e),
+                conversation_id=conversation_id[:8] + "...",
+            )
+            # Don't re-raise - user already has their response, we don't want to fail the graph
+    else:
+        logger.warning("No conversation_id - cannot save messages")
+
+    # Store the memory with embedding (for semantic search)
+    # Fire-and-forget pattern - errors logged but don't fail the conversation
+    if embedding_task is not None:
+        try:
+            await store_memory(
+                user_id=write.user_id,
+                user_message=write.user_message,
+                ai_response=write.ai_response,
+                conversation_id=conversation_id,
+                metadata={
+                    "source": "wellness_chat",
+                    "messages_saved": messages_saved,
+                },
+                embedding=await embedding_task,
+            )
+            logger.info("Memory stored with embedding")
+            # Only a stored memory counts as recent, so failed writes are retried
+            # the next time the same pair comes up
+            await remember_memory_hash(write.user_id, memory_text)
+        except Exception as e:
+            # Log but don't fail - user already has their response
+            logger.error("Failed to store memory with embedding", error=str(e))
+
+    # Make a freshly generated opening reply available to the semantic cache
+    if write.cache_response:
+        try:
+            await cache_response(write.user_id, write.user_message, write.ai_response)
+        except Exception as e:
+            logger.warning("Failed to cache response (non-critical)", error=str(e))
+
 
 async def store_memory_node(state: WellnessState, config: RunnableConfig) -> dict[str, object]:
     """
     Stores the latest conversation pair as a memory.
 
     Extracts the most recent user message + AI response pair from the
-    conversation and:
-    1. Saves to messages table (for conversation history retrieval)
-    2. Stores with embedding (for semantic search)
+    conversation and hands it to the background writers, which:
+    1. Save to messages table (for conversation history retrieval)
+    2. Store with embedding (for semantic search)
 
-    This is a side-effect node that doesn't modify state - it just
-    persists the conversation to the database.
+    This is a side-effect node that doesn't modify state. It returns as
+    soon as the pair is queued, so database commit latency is kept off the
+    request path. If the conversation's queue is full, it waits for space.
 
     Args:
         state: Current conversation state after response generation
@@ -63,6 +266,9 @@ async def store_memory_node(state: WellnessState, config: RunnableConfig) -> dic
         logger.node_end()
         return {}
 
+    # Profile analysis runs off the graph so END isn't held up by its LLM call
+    schedule_profile_analysis(state, config)
+
     # Get conversation_id from thread_id in config
     configurable = config.get("configurable", {})
     conversation_id = configurable.get("thread_id")
@@ -87,12 +293,20 @@ async def store_memory_node(state: WellnessState, config: RunnableConfig) -> dic
     # Messages are in order, so we look for: [..., HumanMessage, AIMessage]
     user_message = None
     ai_response = None
+    cacheable = False
 
     # Walk backwards through messages to find the most recent pair
     for i in range(len(messages) - 1, 0, -1):
         if isinstance(messages[i], AIMessage) and isinstance(messages[i - 1], HumanMessage):
             user_message = messages[i - 1].content
             ai_response = messages[i].content
+            # Only generated (not cached, fallback, or activity) opening replies
+            cacheable = (
+                is_opening_turn(messages[:i])
+                and not state.get("cache_hit")
+                and not state.get("suggested_activity")
+                and not messages[i].response_metadata.get("fallback")
+            )
             break
 
     if not user_message or not ai_response:
@@ -108,53 +322,21 @@ async def store_memory_node(state: WellnessState, config: RunnableConfig) -> dic
         ai_msg_preview=ai_response[:50] + "..." if len(ai_response) > 50 else ai_response,
     )
 
-    # Save to messages table (for conversation history)
-    # Only if we have a valid conversation_id
-    messages_saved = False
-    if conversation_id:
-        try:
-            supabase_ok, cache_ok = await save_messages(
-                conversation_id=conversation_id,
-                user_message=user_message,
-                ai_response=ai_response,
-            )
-            messages_saved = supabase_ok
-            logger.info(
-                "save_messages completed",
-                supabase_success=supabase_ok,
-                cache_success=cache_ok,
-            )
-            # Generate a title for the conversation if one doesn't exist
-            # This ensures conversations have meaningful titles in history
-            await generate_title_if_needed(conversation_id)
-        except Exception as e:
-            # Log the full error for debugging
-            logger.error(
-                "CRITICAL: Failed to save messages to Supabase",
-                error=str(e),
-                conversation_id=conversation_id[:8] + "..." if conversation_id else "None",
-            )
-            # Don't re-raise - user already has their response, we don't want to fail the graph
-    else:
-        logger.warning("No conversation_id - cannot save messages")
+    write = MemoryWrite(
+        user_id=user_id,
+        conversation_id=conversation_id,
+        user_message=user_message,
+        ai_response=ai_response,
+        cache_response=cacheable,
+    )
 
-    # Store the memory with embedding (for semantic search)
-    # Fire-and-forget pattern - errors logged but don't fail the conversation
-    try:
-        await store_memory(
-            user_id=user_id,
-            user_message=user_message,
-            ai_response=ai_response,
-            conversation_id=conversation_id,
-            metadata={
-                "source": "wellness_chat",
-                "messages_saved": messages_saved,
-            },
-        )
-        logger.info("Memory stored with embedding")
-    except Exception as e:
-        # Log but don't fail - user already has their response
-        logger.error("Failed to store memory with embedding", error=str(e))
+    # Hand off to the conversation's background writer; if it's backed up,
+    # wait for space so this turn still lands after the earlier ones
+    queue = _get_memory_queue(write)
+    if queue.full():
+        logger.warning("Memory write queue full - waiting for space")
+    await queue.put(write)
+    logger.info("Message pair queued for storage")
 
     logger.node_end()
     return {}
@@ -12,11 +12,33 @@ Provides:
 ============================================================================
 """
 
+from collections.abc import Iterator
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from src.llm import call_cache
+from src.llm.providers import clear_llm_cache
+from src.memory.store import clear_query_embedding_cache
+
+# -----------------------------------------------------------------------------
+# Cache Isolation
+# -----------------------------------------------------------------------------
+
+
+@pytest.fixture(autouse=True)
+def clear_llm_caches() -> Iterator[None]:
+    """Keep cached LLM wrappers, low-temperature results and query embeddings from leaking between tests."""
+    call_cache.clear()
+    clear_llm_cache()
+    clear_query_embedding_cache()
+    yield
+    call_cache.clear()
+    clear_llm_cache()
+    clear_query_embedding_cache()
+
+
 # -----------------------------------------------------------------------------
 # Environment Fixtures
 # -----------------------------------------------------------------------------
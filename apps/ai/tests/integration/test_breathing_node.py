@@ -6,6 +6,7 @@ Tests the breathing exercise node's flow including:
 - Technique selection via LLM
 - HITL confirmation handling
 - Message formatting for frontend
+- Completed-session counts used by the Wim Hof safety check
 
 Note: We import directly from the node module to avoid triggering
 the full graph initialization chain.
@@ -14,7 +15,7 @@ the full graph initialization chain.
 
 import json
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from langchain_core.messages import AIMessage, HumanMessage
@@ -399,3 +400,27 @@ class TestBreathingTechniques:
         """All techniques should have positive recommended cycles."""
         for _technique_id, technique in breathing_techniques.items():
             assert technique["recommended_cycles"] > 0
+
+
+# -----------------------------------------------------------------------------
+# Safety Check Session Counts
+# -----------------------------------------------------------------------------
+
+
+class TestSessionCounts:
+    """Tests for the completed-session queries behind the Wim Hof safety check."""
+
+    @pytest.mark.asyncio
+    async def test_session_count_awaits_query(self) -> None:
+        """Should await the async client's query and return its count."""
+        from src.nodes.breathing_exercise.safety import get_user_breathing_session_count
+
+        client = MagicMock()
+        query = client.table.return_value.select.return_value.eq.return_value.eq.return_value
+        query.execute = AsyncMock(return_value=MagicMock(count=4))
+
+        with patch("src.auth.get_supabase_client", AsyncMock(return_value=client)):
+            count = await get_user_breathing_session_count("user-1")
+
+        assert count == 4
+        query.execute.assert_awaited_once()
@@ -10,13 +10,49 @@ Tests:
 ============================================================================
 """
 
-from unittest.mock import patch
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from langchain_core.messages import AIMessage, HumanMessage
 
 from src.nodes.retrieve_memories.node import retrieve_memories
-from src.nodes.store_memory.node import store_memory_node
+from src.nodes.store_memory.node import flush_memory_writes, store_memory_node
+
+
+@pytest.fixture(autouse=True)
+def mock_schedule_profile_analysis() -> Iterator[MagicMock]:
+    """Keep store_memory_node from starting real background profile analyses."""
+    with patch("src.nodes.store_memory.node.schedule_profile_analysis") as mock_schedule:
+        yield mock_schedule
+
+
+@pytest.fixture(autouse=True)
+def mock_generate_embedding() -> Iterator[AsyncMock]:
+    """Keep the background writers from calling the real embedding API."""
+    with patch(
+        "src.nodes.store_memory.node.generate_embedding", new=AsyncMock(return_value=[0.1] * 768)
+    ) as mock_embed:
+        yield mock_embed
+
+
+@pytest.fixture(autouse=True)
+def mock_is_recent_memory() -> Iterator[AsyncMock]:
+    """Treat every pair as new unless a test says otherwise."""
+    with patch(
+        "src.nodes.store_memory.node.is_recent_memory", new=AsyncMock(return_value=False)
+    ) as mock_recent:
+        yield mock_recent
+
+
+@pytest.fixture(autouse=True)
+def mock_remember_memory_hash() -> Iterator[AsyncMock]:
+    """Keep the background writers from recording hashes in Redis."""
+    with patch(
+        "src.nodes.store_memory.node.remember_memory_hash", new=AsyncMock()
+    ) as mock_remember:
+        yield mock_remember
+
 
 # =============================================================================
 # retrieve_memories Node Tests
@@ -162,6 +198,7 @@ async def test_store_memory_extracts_message_pair() -> None:
         config = {"configurable": {"thread_id": "conv-1"}}
 
         await store_memory_node(state, config)
+        await flush_memory_writes()
 
         # Verify store_memory called with correct messages
         mock_store.assert_called_once()
@@ -170,6 +207,31 @@ async def test_store_memory_extracts_message_pair() -> None:
         assert call_args[1]["ai_response"] == "Let's breathe"
 
 
+@pytest.mark.asyncio
+async def test_store_memory_schedules_profile_analysis(
+    mock_schedule_profile_analysis: MagicMock,
+) -> None:
+    """store_memory_node should hand profile analysis off to a background task."""
+    with (
+        patch("src.nodes.store_memory.node.save_messages"),
+        patch("src.nodes.store_memory.node.store_memory"),
+        patch("src.nodes.store_memory.node.generate_title_if_needed"),
+    ):
+        state = {
+            "messages": [
+                HumanMessage(content="I'm stressed"),
+                AIMessage(content="Let's breathe"),
+            ],
+            "user_context": {"user_id": "user-1"},
+        }
+        config = {"configurable": {"thread_id": "conv-1"}}
+
+        await store_memory_node(state, config)
+        await flush_memory_writes()
+
+    mock_schedule_profile_analysis.assert_called_once_with(state, config)
+
+
 @pytest.mark.asyncio
 async def test_store_memory_calls_save_and_store() -> None:
     """store_memory_node should call both save_messages and store_memory."""
@@ -182,18 +244,116 @@ async def test_store_memory_calls_save_and_store() -> None:
 
         state = {
             "messages": [
-                HumanMessage(content="Hello"),
-                AIMessage(content="Hi"),
+                HumanMessage(content="I've been feeling anxious at work"),
+                AIMessage(content="That sounds hard. What's been happening?"),
             ],
             "user_context": {"user_id": "user-1"},
         }
         config = {"configurable": {"thread_id": "conv-1"}}
 
         await store_memory_node(state, config)
+        await flush_memory_writes()
 
         # Both should be called
         mock_save.assert_called_once()
         mock_store.assert_called_once()
+        # With the embedding started before the messages were saved
+        assert mock_store.call_args[1]["embedding"] == [0.1] * 768
+
+
+@pytest.mark.asyncio
+async def test_store_memory_skips_trivial_pair(mock_generate_embedding: AsyncMock) -> None:
+    """A very short pair is saved to messages but not embedded or stored as a memory."""
+    with (
+        patch("src.nodes.store_memory.node.save_messages", return_value=(True, True)) as mock_save,
+        patch("src.nodes.store_memory.node.store_memory") as mock_store,
+        patch("src.nodes.store_memory.node.generate_title_if_needed"),
+    ):
+        state = {
+            "messages": [HumanMessage(content="ok"), AIMessage(content="Great!")],
+            "user_context": {"user_id": "user-1"},
+        }
+        config = {"configurable": {"thread_id": "conv-1"}}
+
+        await store_memory_node(state, config)
+        await flush_memory_writes()
+
+        mock_save.assert_called_once()
+        mock_store.assert_not_called()
+        mock_generate_embedding.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_store_memory_skips_recent_repeat(
+    mock_generate_embedding: AsyncMock, mock_is_recent_memory: AsyncMock
+) -> None:
+    """A pair repeating one of the user's recent memories isn't embedded again."""
+    mock_is_recent_memory.return_value = True
+
+    with (
+        patch("src.nodes.store_memory.node.save_messages", return_value=(True, True)) as mock_save,
+        patch("src.nodes.store_memory.node.store_memory") as mock_store,
+        patch("src.nodes.store_memory.node.generate_title_if_needed"),
+    ):
+        state = {
+            "messages": [
+                HumanMessage(content="Thank you so much for the help"),
+                AIMessage(content="You're welcome! I'm here whenever you need me."),
+            ],
+            "user_context": {"user_id": "user-1"},
+        }
+        config = {"configurable": {"thread_id": "conv-1"}}
+
+        await store_memory_node(state, config)
+        await flush_memory_writes()
+
+        mock_save.assert_called_once()
+        mock_store.assert_not_called()
+        mock_generate_embedding.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_store_memory_failed_write_is_not_recent(
+    mock_is_recent_memory: AsyncMock, mock_remember_memory_hash: AsyncMock
+) -> None:
+    """A pair whose memory insert failed is stored when it comes up again."""
+    recent: set[tuple[str, str]] = set()
+
+    async def is_recent(user_id: str, text: str) -> bool:
+        return (user_id, text) in recent
+
+    async def remember(user_id: str, text: str) -> None:
+        recent.add((user_id, text))
+
+    mock_is_recent_memory.side_effect = is_recent
+    mock_remember_memory_hash.side_effect = remember
+
+    with (
+        patch("src.nodes.store_memory.node.save_messages", return_value=(True, True)),
+        patch(
+            "src.nodes.store_memory.node.store_memory",
+            new=AsyncMock(side_effect=[Exception("insert failed"), "memory-1"]),
+        ) as mock_store,
+        patch("src.nodes.store_memory.node.generate_title_if_needed"),
+    ):
+        state = {
+            "messages": [
+                HumanMessage(content="Thank you so much for the help"),
+                AIMessage(content="You're welcome! I'm here whenever you need me."),
+            ],
+            "user_context": {"user_id": "user-1"},
+        }
+        config = {"configurable": {"thread_id": "conv-1"}}
+
+        await store_memory_node(state, config)
+        await flush_memory_writes()
+        assert not recent
+
+        await store_memory_node(state, config)
+        await flush_memory_writes()
+
+    assert mock_store.await_count == 2
+    assert len(recent) == 1
 
 
 @pytest.mark.asyncio
@@ -214,6 +374,7 @@ async def test_store_memory_generates_title() -> None:
         config = {"configurable": {"thread_id": "conv-1"}}
 
         await store_memory_node(state, config)
+        await flush_memory_writes()
 
         # Verify title generation was called
         mock_title.assert_called_once_with("conv-1")
@@ -304,6 +465,7 @@ async def test_store_memory_handles_save_errors_gracefully() -> None:
 
         # Should not raise, just logs error
         result = await store_memory_node(state, config)
+        await flush_memory_writes()
         assert result == {}
 
 
@@ -326,4 +488,96 @@ async def test_store_memory_handles_store_errors_gracefully() -> None:
 
         # Should not raise, just logs error
         result = await store_memory_node(state, config)
+        await flush_memory_writes()
+        assert result == {}
+
+
+@pytest.mark.asyncio
+async def test_store_memory_returns_before_write_completes() -> None:
+    """store_memory_node should queue the pair and return without awaiting the write."""
+    import asyncio
+
+    release = asyncio.Event()
+
+    async def slow_store(**kwargs: object) -> str:
+        await release.wait()
+        return "mem-1"
+
+    with (
+        patch("src.nodes.store_memory.node.save_messages", return_value=(True, True)),
+        patch("src.nodes.store_memory.node.store_memory", side_effect=slow_store) as mock_store,
+        patch("src.nodes.store_memory.node.generate_title_if_needed"),
+    ):
+        state = {
+            "messages": [
+                HumanMessage(content="I couldn't sleep last night"),
+                AIMessage(content="I'm sorry to hear that. What kept you up?"),
+            ],
+            "user_context": {"user_id": "user-1"},
+        }
+        config = {"configurable": {"thread_id": "conv-1"}}
+
+        result = await asyncio.wait_for(store_memory_node(state, config), timeout=1)
+        assert result == {}
+
+        # The write finishes in the background once unblocked
+        release.set()
+        await flush_memory_writes()
+        mock_store.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_store_memory_waits_for_space_when_queue_full() -> None:
+    """store_memory_node should wait for queue space instead of writing out of order."""
+
+    with (
+        patch("src.nodes.store_memory.node.save_messages", return_value=(True, True)),
+        patch("src.nodes.store_memory.node.store_memory") as mock_store,
+        patch("src.nodes.store_memory.node.generate_title_if_needed"),
+        patch("src.nodes.store_memory.node._get_memory_queue") as mock_queue,
+    ):
+        mock_queue.return_value.full.return_value = True
+        mock_queue.return_value.put = AsyncMock()
+
+        state = {
+            "messages": [HumanMessage(content="Hi"), AIMessage(content="Hello")],
+            "user_context": {"user_id": "user-1"},
+        }
+        config = {"configurable": {"thread_id": "conv-1"}}
+
+        result = await store_memory_node(state, config)
+
         assert result == {}
+        mock_queue.return_value.put.assert_awaited_once()
+        mock_store.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_store_memory_persists_one_conversation_in_order() -> None:
+    """Turns of the same conversation should be saved in the order they were queued."""
+    import asyncio
+
+    saved: list[str] = []
+
+    async def record_save(conversation_id: str, user_message: str, ai_response: str) -> tuple:
+        # The first turn is slower, so concurrent writers would reorder them
+        await asyncio.sleep(0.02 if user_message == "first" else 0)
+        saved.append(user_message)
+        return (True, True)
+
+    with (
+        patch("src.nodes.store_memory.node.save_messages", side_effect=record_save),
+        patch("src.nodes.store_memory.node.store_memory"),
+        patch("src.nodes.store_memory.node.generate_title_if_needed"),
+    ):
+        config = {"configurable": {"thread_id": "conv-1"}}
+        for text in ("first", "second"):
+            state = {
+                "messages": [HumanMessage(content=text), AIMessage(content="reply")],
+                "user_context": {"user_id": "user-1"},
+            }
+            await store_memory_node(state, config)
+
+        await flush_memory_writes()
+
+    assert saved == ["first", "second"]
@@ -0,0 +1,252 @@
+"""
+============================================================================
+Tests for Analyze Profile Background Scheduling and Storage
+============================================================================
+Tests that profile analysis runs as a tracked background task.
+
+Tests:
+- schedule_profile_analysis runs analyze_profile off the caller's path
+- wait_for_profile_analyses cancels analyses that outlive the timeout
+- update_wellness_profile merges in one database call
+- store_conversation_analyses_bulk embeds once and inserts in chunks
+- update_activity_effectiveness scores the atomically incremented counters
+- get_supabase_client creates one client under concurrent first use
+- _write_with_retry retries only safe failures and pauses after repeated ones
+============================================================================
+"""
+
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from src.nodes.analyze_profile import node as analyze_profile_node
+from src.nodes.analyze_profile import storage
+from src.nodes.analyze_profile.models import ConversationAnalysis
+
+
+@pytest.fixture(autouse=True)
+def fast_write_retries(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """No backoff sleeps, and a closed write circuit for every test."""
+    monkeypatch.setattr(storage, "WRITE_RETRY_BASE_DELAY", 0.0)
+    storage.reset_write_circuit()
+    yield
+    storage.reset_write_circuit()
+
+
+@pytest.mark.asyncio
+async def test_schedule_profile_analysis_runs_in_background() -> None:
+    """Scheduled analyses should run and be awaitable via wait_for_profile_analyses."""
+    mock_analyze = AsyncMock(return_value={})
+    with patch.object(analyze_profile_node, "analyze_profile", mock_analyze):
+        state = {"user_context": {"user_id": "user-1"}, "messages": []}
+        config = {"configurable": {"thread_id": "conv-1"}}
+
+        analyze_profile_node.schedule_profile_analysis(state, config)
+        mock_analyze.assert_not_awaited()
+
+        await analyze_profile_node.wait_for_profile_analyses()
+
+    mock_analyze.assert_awaited_once_with(state, config)
+    assert not analyze_profile_node._background_tasks
+
+
+@pytest.mark.asyncio
+async def test_wait_for_profile_analyses_cancels_after_timeout() -> None:
+    """Analyses still running at the timeout should be cancelled."""
+    started = asyncio.Event()
+
+    async def slow_analysis(state: dict, config: dict) -> dict[str, object]:
+        started.set()
+        await asyncio.sleep(10)
+        return {}
+
+    with patch.object(analyze_profile_node, "analyze_profile", slow_analysis):
+        analyze_profile_node.schedule_profile_analysis({}, {})
+        await started.wait()
+
+        await analyze_profile_node.wait_for_profile_analyses(timeout=0.01)
+
+    assert not analyze_profile_node._background_tasks
+
+
+def _analysis() -> ConversationAnalysis:
+    return ConversationAnalysis(
+        primary_emotion="anxiety",
+        emotion_intensity=0.7,
+        emotional_valence=-0.5,
+        emotional_trajectory="stable",
+        topics_discussed=["work"],
+        concerns_raised=["deadlines"],
+        detected_triggers=["meetings"],
+        conversation_type="venting",
+        engagement_level="high",
+    )
+
+
+@pytest.mark.asyncio
+async def test_update_wellness_profile_is_one_rpc_call() -> None:
+    """The profile merge should be a single RPC, with no read before it."""
+    analysis = _analysis()
+    client = MagicMock()
+    client.rpc.return_value.execute = AsyncMock()
+
+    with patch.object(storage, "get_supabase_client", AsyncMock(return_value=client)):
+        assert await storage.update_wellness_profile("user-1", analysis) is True
+
+    client.table.assert_not_called()
+    client.rpc.assert_called_once_with(
+        "record_conversation_in_profile",
+        {
+            "p_user_id": "user-1",
+            "p_topics": ["work"],
+            "p_triggers": ["meetings"],
+            "p_emotional_baseline": "anxious",
+            "p_primary_concern": "deadlines",
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_store_conversation_analyses_bulk_batches() -> None:
+    """Summaries should be embedded in one call and rows inserted in chunks."""
+    analyses = [
+        ("user-1", "conv-1", _analysis(), "Summary one"),
+        ("user-1", "conv-2", _analysis(), None),
+        ("user-2", "conv-3", _analysis(), "Summary three"),
+    ]
+    client = MagicMock()
+    client.table.return_value.insert.return_value.execute = AsyncMock()
+    mock_batch = AsyncMock(return_value=[[0.25] * 768, [0.5] * 768])
+
+    with (
+        patch.object(storage, "get_supabase_client", AsyncMock(return_value=client)),
+        patch.object(storage, "generate_embeddings_batch", mock_batch),
+        patch.object(storage, "ANALYSIS_INSERT_BATCH", 2),
+    ):
+        analysis_ids = await storage.store_conversation_analyses_bulk(analyses)
+
+    assert len(analysis_ids) == 3
+    mock_batch.assert_awaited_once_with(["Summary one", "Summary three"])
+
+    batches = [call.args[0] for call in client.table.return_value.insert.call_args_list]
+    assert [len(batch) for batch in batches] == [2, 1]
+    rows = batches[0] + batches[1]
+    assert [row["id"] for row in rows] == analysis_ids
+    assert rows[0]["embedding"].startswith("[0.25,")
+    assert rows[1]["embedding"] is None
+    assert rows[2]["embedding"].startswith("[0.5,")
+
+
+@pytest.mark.asyncio
+async def test_update_activity_effectiveness_scores_returned_counters() -> None:
+    """Counters come from the RPC; the score write-back is guarded by times_started."""
+    client = MagicMock()
+    client.rpc.return_value.execute = AsyncMock(
+        return_value=MagicMock(
+            data=[
+                {
+                    "times_started": 4,
+                    "times_completed": 4,
+                    "mood_improvements": 3,
+                    "mood_no_change": 1,
+                    "mood_declines": 0,
+                }
+            ]
+        )
+    )
+    update = client.table.return_value.update
+    update_query = update.return_value.eq.return_value.eq.return_value.eq.return_value.eq
+    update_query.return_value.execute = AsyncMock()
+
+    with patch.object(storage, "get_supabase_client", AsyncMock(return_value=client)):
+        updated = await storage.update_activity_effectiveness(
+            "user-1", "breathing", "box", mood_before=2, mood_after=4
+        )
+
+    assert updated is True
+    client.rpc.assert_called_once_with(
+        "record_activity_outcome",
+        {
+            "p_user_id": "user-1",
+            "p_activity_type": "breathing",
+            "p_technique": "box",
+            "p_completed": True,
+            "p_mood_change": 2,
+        },
+    )
+    scores = update.call_args[0][0]
+    # 1.0 * 40 + 0.75 * 40 + 0.4 * 20
+    assert scores["effectiveness_score"] == pytest.approx(78.0)
+    assert scores["is_recommended"] is True
+    assert scores["recommendation_reason"] == "Consistently improves your mood"
+    update_query.assert_called_once_with("times_started", 4)
+
+
+@pytest.mark.asyncio
+async def test_get_supabase_client_created_once_under_concurrency(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Concurrent first calls should share a single acreate_client call."""
+    monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+    monkeypatch.setenv("SUPABASE_SERVICE_KEY", "test-key")
+    monkeypatch.setattr(storage, "_supabase_client", None)
+    client = MagicMock()
+
+    async def slow_create(url: str, key: str) -> MagicMock:
+        await asyncio.sleep(0.01)
+        return client
+
+    mock_create = AsyncMock(side_effect=slow_create)
+    with patch.object(storage, "acreate_client", mock_create):
+        clients = await asyncio.gather(*(storage.get_supabase_client() for _ in range(3)))
+
+    assert all(c is client for c in clients)
+    mock_create.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_write_retry_replays_only_safe_failures() -> None:
+    """Timeouts are retried for idempotent writes only; unsent requests for any write."""
+    timeout = httpx.ReadTimeout("timed out")
+
+    idempotent_write = AsyncMock(side_effect=[timeout, "ok"])
+    assert await storage._write_with_retry(idempotent_write, idempotent=True) == "ok"
+    assert idempotent_write.await_count == 2
+
+    counter_write = AsyncMock(side_effect=[timeout, "ok"])
+    with pytest.raises(httpx.ReadTimeout):
+        await storage._write_with_retry(counter_write)
+    assert counter_write.await_count == 1
+
+    unsent_write = AsyncMock(side_effect=[httpx.ConnectError("refused"), "ok"])
+    assert await storage._write_with_retry(unsent_write) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_write_retry_treats_duplicate_after_retry_as_applied() -> None:
+    """A retried insert hitting its own id again means the first attempt landed."""
+    write = AsyncMock(
+        side_effect=[
+            APIError({"code": 504, "message": "gateway timeout"}),
+            APIError({"code": "23505", "message": "duplicate key"}),
+        ]
+    )
+    assert await storage._write_with_retry(write, idempotent=True) is None
+
+
+@pytest.mark.asyncio
+async def test_write_circuit_pauses_after_repeated_failures() -> None:
+    """Past the failure threshold, writes fail fast without being attempted."""
+    failing = AsyncMock(side_effect=httpx.ConnectError("refused"))
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await storage._write_with_retry(failing)
+
+    skipped = AsyncMock()
+    with pytest.raises(RuntimeError):
+        await storage._write_with_retry(skipped)
+    skipped.assert_not_awaited()
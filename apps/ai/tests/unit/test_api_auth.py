@@ -211,6 +211,26 @@ class TestGetSupabaseClient:
 
         assert "SUPABASE_SERVICE_KEY" in str(exc.value)
 
+    @pytest.mark.asyncio
+    async def test_client_created_once(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Should create the client on first use and reuse it afterwards."""
+        import src.api.auth as api_auth
+
+        monkeypatch.setenv("SUPABASE_URL", "https://test.supabase.co")
+        monkeypatch.setenv("SUPABASE_SERVICE_KEY", "test-key")
+        monkeypatch.setattr(api_auth, "_supabase_client", None)
+        mock_client = MagicMock()
+
+        with patch(
+            "src.api.auth.acreate_client", new_callable=AsyncMock, return_value=mock_client
+        ) as mock_create:
+            first = await api_auth.get_supabase_client()
+            second = await api_auth.get_supabase_client()
+
+        assert first is mock_client
+        assert second is mock_client
+        mock_create.assert_awaited_once()
+
 
 # -----------------------------------------------------------------------------
 # Config Builder Tests
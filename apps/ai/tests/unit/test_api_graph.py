@@ -268,6 +268,50 @@ class TestSSEFormatting:
         assert data["data"]["message"] == "Something went wrong"
 
 
+# -----------------------------------------------------------------------------
+# Token Batching Tests
+# -----------------------------------------------------------------------------
+
+
+class TestPartialBatcher:
+    """Tests for dynamic batching of messages/partial events."""
+
+    def test_first_token_flushes_immediately(self) -> None:
+        """The first token should produce a partial event (unchanged TTFT)."""
+        from src.api.graph import PartialBatcher
+
+        batcher = PartialBatcher()
+
+        assert batcher.add() is True
+
+    def test_batch_size_grows_until_cap(self) -> None:
+        """Batches should grow by the growth factor and stop at the max size."""
+        from src.api.graph import (
+            STREAM_BATCH_SIZE_GROWTH_FACTOR,
+            STREAM_MAX_BATCH_SIZE,
+            PartialBatcher,
+        )
+
+        batcher = PartialBatcher()
+        flush_points = [i for i in range(1, 500) if batcher.add()]
+
+        gaps = [b - a for a, b in zip([0, *flush_points], flush_points, strict=False)]
+        assert gaps[0] == 1
+        assert gaps[1] == min(STREAM_BATCH_SIZE_GROWTH_FACTOR, STREAM_MAX_BATCH_SIZE)
+        assert max(gaps) == STREAM_MAX_BATCH_SIZE
+
+    def test_flush_reports_pending_tokens(self) -> None:
+        """flush() should report unsent tokens once, then reset."""
+        from src.api.graph import PartialBatcher
+
+        batcher = PartialBatcher()
+        batcher.add()  # Flushed immediately
+        batcher.add()  # Pending in the next batch
+
+        assert batcher.flush() is True
+        assert batcher.flush() is False
+
+
 # -----------------------------------------------------------------------------
 # Content Filtering Tests
 # -----------------------------------------------------------------------------
@@ -144,6 +144,62 @@ async def test_get_checkpointer_uses_correct_uri(
         assert "test-db-password" in conninfo
 
 
+@pytest.mark.asyncio
+async def test_get_checkpointer_keeps_warm_pool(
+    mock_checkpointer_env: None,
+    reset_checkpointer_state: None,
+) -> None:
+    """get_checkpointer() should size the pool from the module settings."""
+    with (
+        patch("src.checkpointer.AsyncConnectionPool") as mock_pool_class,
+        patch("src.checkpointer.AsyncPostgresSaver"),
+    ):
+        mock_pool = AsyncMock()
+        mock_pool.open = AsyncMock()
+        mock_pool_class.return_value = mock_pool
+
+        from src.checkpointer import POOL_MAX_SIZE, POOL_MIN_SIZE, get_checkpointer
+
+        await get_checkpointer()
+
+        call_kwargs = mock_pool_class.call_args.kwargs
+        assert call_kwargs["min_size"] == POOL_MIN_SIZE
+        assert call_kwargs["max_size"] == POOL_MAX_SIZE
+        assert call_kwargs["kwargs"]["prepare_threshold"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_checkpointer_configures_orjson(
+    mock_checkpointer_env: None,
+    reset_checkpointer_state: None,
+) -> None:
+    """get_checkpointer() should configure pooled connections to use orjson."""
+    with (
+        patch("src.checkpointer.AsyncConnectionPool") as mock_pool_class,
+        patch("src.checkpointer.AsyncPostgresSaver"),
+    ):
+        mock_pool = AsyncMock()
+        mock_pool.open = AsyncMock()
+        mock_pool_class.return_value = mock_pool
+
+        from src.checkpointer import _configure_connection, get_checkpointer
+
+        await get_checkpointer()
+
+        assert mock_pool_class.call_args.kwargs["configure"] is _configure_connection
+
+
+def test_orjson_dumps_matches_json_for_checkpoint_dicts() -> None:
+    """_orjson_dumps should encode like json.dumps, including non-str keys."""
+    import json
+
+    from src.checkpointer import _orjson_dumps
+
+    value = {"v": 1, "channel_versions": {"messages": "00001.0.42"}, 2: ["x"]}
+
+    assert json.loads(_orjson_dumps(value)) == json.loads(json.dumps(value))
+
+
 # =============================================================================
 # setup_checkpointer() Tests
 # =============================================================================
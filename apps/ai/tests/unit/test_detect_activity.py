@@ -0,0 +1,65 @@
+"""
+============================================================================
+Tests for Detect Activity Node
+============================================================================
+Tests the keyword pre-classifier that routes explicit activity requests
+without an LLM call.
+
+Tests:
+- A single explicit activity request is classified
+- Mentions, questions, refusals, ambiguous, negated, or keyword-free
+  messages defer to the LLM
+- detect_activity_intent skips the LLM on a keyword match
+============================================================================
+"""
+
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.nodes.detect_activity.node import (
+    classify_by_keywords,
+    detect_activity_intent,
+)
+
+
+@pytest.mark.parametrize(
+    ("message", "expected"),
+    [
+        ("Let's do a breathing exercise", "breathing"),
+        ("I'd like to meditate for a bit", "meditation"),
+        ("I\u2019d like to start a guided meditation", "meditation"),
+        ("Help me start journaling", "journaling"),
+        ("Can we do a breathing exercise?", None),
+        ("I feel stressed about work", None),
+        ("Should I meditate or do breathing?", None),
+        ("I don't want to meditate right now", None),
+        ("I meditated this morning and feel great", None),
+        ("My sister is a journalist and works late", None),
+        ("The view was breathtaking", None),
+        ("I'm out of breath after my run", None),
+        ("Meditation sounds nice", None),
+        ("Can we skip the breathing exercise today?", None),
+        ("Can we do something other than meditation?", None),
+        ("I want to quit journaling", None),
+        ("can you explain what meditation is", None),
+        ("I don\u2019t want to meditate right now", None),
+        ("I want to do breathing but I can\u2019t focus today", None),
+    ],
+)
+def test_classify_by_keywords(message: str, expected: str | None) -> None:
+    """classify_by_keywords() should only match a single, non-negated activity request."""
+    assert classify_by_keywords(message) == expected
+
+
+@pytest.mark.asyncio
+async def test_keyword_match_skips_llm() -> None:
+    """detect_activity_intent should route keyword matches without creating an LLM."""
+    with patch("src.nodes.detect_activity.node.create_resilient_llm") as mock_create_llm:
+        state = {"messages": [HumanMessage(content="Let's do some breathing")]}
+
+        result = await detect_activity_intent(state)
+
+    assert result == {"suggested_activity": "breathing"}
+    mock_create_llm.assert_not_called()
@@ -0,0 +1,471 @@
+"""
+============================================================================
+Tests for LLM Provider Configuration
+============================================================================
+Tests the model instance cache in src/llm/providers.py.
+
+Tests:
+- Same settings return the same instance
+- Different settings get their own instance
+- Fallback models share the cache
+- Warmup pings request-path clients and never raises
+- Structured calls reuse the ResilientLLM's primary client and bound schemas
+- Gemini clients get the tuned connection limits; shutdown closes clients
+- Rate budgets and Retry-After pauses skip to the fallback without a call
+============================================================================
+"""
+
+import asyncio
+from collections.abc import Iterator
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+import pytest
+from anthropic import RateLimitError
+from langchain_core.messages import AIMessage, HumanMessage
+from pydantic import BaseModel
+
+from src.llm.providers import (
+    GEMINI_CLIENT_ARGS,
+    MODEL_GEMINI_LITE,
+    WARMUP_LLM_SETTINGS,
+    CircuitOpenError,
+    ModelTier,
+    RateBudgetExceededError,
+    _call_with_breaker,
+    _get_breaker,
+    _get_model_by_name,
+    _get_rate_budget,
+    _RateBudget,
+    clear_llm_cache,
+    close_llm_clients,
+    create_llm,
+    create_resilient_llm,
+    is_rate_limit_error,
+    reset_circuit_breakers,
+    reset_rate_budgets,
+    warmup_llms,
+)
+
+
+@pytest.fixture(autouse=True)
+def fake_api_keys(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Provide dummy API keys and start each test with an empty cache."""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-anthropic-key")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-google-key")
+    clear_llm_cache()
+    reset_circuit_breakers()
+    reset_rate_budgets()
+    yield
+    clear_llm_cache()
+    reset_circuit_breakers()
+    reset_rate_budgets()
+
+
+def test_create_llm_reuses_instance_for_same_settings() -> None:
+    """create_llm() should return the cached instance for identical settings."""
+    first = create_llm(ModelTier.STANDARD, temperature=0.7, max_tokens=1024)
+    second = create_llm(ModelTier.STANDARD, temperature=0.7, max_tokens=1024)
+
+    assert first is second
+
+
+def test_create_llm_separates_instances_by_settings() -> None:
+    """create_llm() should not share instances across different settings."""
+    default = create_llm(ModelTier.STANDARD, temperature=0.7, max_tokens=1024)
+    colder = create_llm(ModelTier.STANDARD, temperature=0.2, max_tokens=1024)
+
+    assert default is not colder
+
+
+def test_fallback_lookup_shares_tier_instance() -> None:
+    """Fallback model lookups should hit the same cache as create_llm()."""
+    fast = create_llm(ModelTier.FAST, temperature=0.2, max_tokens=200)
+
+    assert _get_model_by_name(MODEL_GEMINI_LITE, 0.2, 200) is fast
+
+
+def test_unknown_model_name_raises() -> None:
+    """Model names without a factory should be rejected."""
+    with pytest.raises(ValueError, match="Unknown model"):
+        _get_model_by_name("not-a-model", 0.2, 200)
+
+
+@pytest.mark.asyncio
+async def test_warmup_llms_pings_request_path_clients() -> None:
+    """warmup_llms() should invoke each request-path client once."""
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock()
+
+    with patch("src.llm.providers.create_llm", return_value=mock_llm) as mock_create:
+        await warmup_llms()
+
+    assert mock_create.call_count == len(WARMUP_LLM_SETTINGS)
+    assert mock_llm.ainvoke.await_count == len(WARMUP_LLM_SETTINGS)
+
+
+@pytest.mark.asyncio
+async def test_warmup_llms_swallows_provider_errors() -> None:
+    """warmup_llms() should log and continue when a provider call fails."""
+    mock_llm = MagicMock()
+    mock_llm.ainvoke = AsyncMock(side_effect=RuntimeError("connection refused"))
+
+    with patch("src.llm.providers.create_llm", return_value=mock_llm):
+        await warmup_llms()
+
+
+class _Answer(BaseModel):
+    """Minimal structured output schema for tests."""
+
+    answer: str
+
+
+@pytest.mark.asyncio
+async def test_structured_llm_reuses_primary_client() -> None:
+    """ResilientStructuredLLM should invoke the primary built once, not re-create it."""
+    llm = create_resilient_llm(tier=ModelTier.FAST, temperature=0.1)
+    structured = llm.with_structured_output(_Answer)
+    structured.primary = MagicMock()
+    structured.primary.ainvoke = AsyncMock(return_value="result")
+
+    with patch("src.llm.providers.create_llm") as mock_create:
+        result = await structured.ainvoke("prompt")
+
+    assert result == "result"
+    mock_create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_structured_fallback_is_bound_once() -> None:
+    """Fallback models should bind the output schema once, not on every call."""
+    llm = create_resilient_llm(tier=ModelTier.FAST, temperature=0.7)
+    structured = llm.with_structured_output(_Answer)
+    structured.primary = MagicMock()
+    structured.primary.ainvoke = AsyncMock(side_effect=Exception("429 RESOURCE_EXHAUSTED"))
+
+    fallback = MagicMock()
+    fallback.with_structured_output.return_value.ainvoke = AsyncMock(return_value="fallback")
+    with patch("src.llm.providers._get_model_by_name", return_value=fallback):
+        await structured.ainvoke("first")
+        await structured.ainvoke("second")
+
+    fallback.with_structured_output.assert_called_once_with(_Answer)
+
+
+def test_gemini_client_uses_tuned_connection_limits() -> None:
+    """Gemini instances should be built with the shared connection limits."""
+    llm = create_llm(ModelTier.FAST, temperature=0.2, max_tokens=200)
+
+    assert llm.client_args == GEMINI_CLIENT_ARGS
+
+
+@pytest.mark.asyncio
+async def test_close_llm_clients_closes_and_clears_cache() -> None:
+    """close_llm_clients() should aclose cached clients and empty the cache."""
+    llm = create_llm(ModelTier.FAST, temperature=0.2, max_tokens=200)
+
+    with patch.object(type(llm), "aclose", new=AsyncMock()) as mock_aclose:
+        await close_llm_clients()
+
+    mock_aclose.assert_awaited_once()
+    assert create_llm(ModelTier.FAST, temperature=0.2, max_tokens=200) is not llm
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["Error code: 429", "RESOURCE_EXHAUSTED: try later", "Quota exceeded", "Rate limit hit"],
+)
+def test_is_rate_limit_error_matches_messages(message: str) -> None:
+    """Rate limit markers should match regardless of case."""
+    assert is_rate_limit_error(Exception(message))
+
+
+def test_is_rate_limit_error_matches_sdk_types() -> None:
+    """Typed SDK rate limit errors should match without inspecting the message."""
+    response = httpx.Response(429, request=httpx.Request("POST", "https://example.com"))
+    error = RateLimitError("slow down", response=response, body=None)
+
+    assert is_rate_limit_error(error)
+    assert not is_rate_limit_error(ValueError("invalid schema"))
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_after_repeated_failures() -> None:
+    """After the threshold, calls to the model should be skipped without a request."""
+    call = AsyncMock(side_effect=Exception("429 RESOURCE_EXHAUSTED"))
+    breaker = _get_breaker("model-a")
+
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(Exception, match="429"):
+            await _call_with_breaker("model-a", call)
+
+    with pytest.raises(CircuitOpenError):
+        await _call_with_breaker("model-a", call)
+    assert call.await_count == breaker.failure_threshold
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_half_open_probe_closes_on_success() -> None:
+    """After the cooldown, one probe call is allowed and success closes the breaker."""
+    breaker = _get_breaker("model-b")
+    breaker.cooldown = 0.0
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == "open"
+
+    result = await _call_with_breaker("model-b", AsyncMock(return_value="ok"))
+
+    assert result == "ok"
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_ignores_request_errors() -> None:
+    """Errors about the request itself should not count as provider failures."""
+    call = AsyncMock(side_effect=ValueError("invalid schema"))
+    breaker = _get_breaker("model-c")
+
+    for _ in range(breaker.failure_threshold + 1):
+        with pytest.raises(ValueError):
+            await _call_with_breaker("model-c", call)
+
+    assert breaker.state == "closed"
+
+
+def test_rate_budget_limits_requests_and_tokens() -> None:
+    """A budget should reject calls once either bucket is empty."""
+    by_requests = _RateBudget(rpm=2)
+    assert by_requests.try_acquire(10)
+    assert by_requests.try_acquire(10)
+    assert not by_requests.try_acquire(10)
+
+    by_tokens = _RateBudget(tpm=1000)
+    assert by_tokens.try_acquire(800)
+    assert not by_tokens.try_acquire(300)
+    assert by_tokens.try_acquire(100)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_model() -> None:
+    """A 429 with Retry-After should skip the model until the pause ends."""
+    response = httpx.Response(
+        429,
+        headers={"retry-after": "30"},
+        request=httpx.Request("POST", "https://example.com"),
+    )
+    call = AsyncMock(side_effect=RateLimitError("slow down", response=response, body=None))
+
+    with pytest.raises(RateLimitError):
+        await _call_with_breaker("model-d", call)
+    with pytest.raises(RateBudgetExceededError):
+        await _call_with_breaker("model-d", call)
+
+    call.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_resilient_llm_skips_primary_over_budget() -> None:
+    """A spent primary budget should route straight to the fallback model."""
+    llm = create_resilient_llm(tier=ModelTier.FAST, temperature=0.2, max_tokens=200)
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = AsyncMock(return_value="primary")
+    _get_rate_budget(llm.primary_model_name).pause(60)
+
+    fallback = MagicMock()
+    fallback.ainvoke = AsyncMock(return_value="fallback")
+    with patch("src.llm.providers._get_model_by_name", return_value=fallback):
+        result = await llm.ainvoke("prompt")
+
+    assert result == "fallback"
+    llm.primary.ainvoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_resilient_llm_skips_primary_with_open_breaker() -> None:
+    """An open primary breaker should route straight to the fallback model."""
+    llm = create_resilient_llm(tier=ModelTier.FAST, temperature=0.2, max_tokens=200)
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = AsyncMock(return_value="primary")
+    breaker = _get_breaker(llm.primary_model_name)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+    fallback = MagicMock()
+    fallback.ainvoke = AsyncMock(return_value="fallback")
+    with patch("src.llm.providers._get_model_by_name", return_value=fallback):
+        result = await llm.ainvoke("prompt")
+
+    assert result == "fallback"
+    llm.primary.ainvoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_low_temperature_calls_are_cached() -> None:
+    """A repeated low-temperature prompt should be answered without a second call."""
+    llm = create_resilient_llm(tier=ModelTier.LITE, temperature=0.2, max_tokens=200)
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = AsyncMock(return_value=AIMessage(content="none"))
+
+    first = await llm.ainvoke([HumanMessage(content="hello")])
+    second = await llm.ainvoke([HumanMessage(content="hello")])
+
+    assert first.content == second.content == "none"
+    llm.primary.ainvoke.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cache_key_ignores_case_and_spacing() -> None:
+    """Prompts differing only in case or whitespace should share a cache entry."""
+    llm = create_resilient_llm(tier=ModelTier.LITE, temperature=0.2, max_tokens=200)
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = AsyncMock(return_value=AIMessage(content="none"))
+
+    await llm.ainvoke([HumanMessage(content="I feel  anxious\n")])
+    await llm.ainvoke([HumanMessage(content="i feel anxious")])
+
+    llm.primary.ainvoke.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_creative_calls_are_not_cached() -> None:
+    """Calls above the cacheable temperature should always reach the provider."""
+    llm = create_resilient_llm(tier=ModelTier.STANDARD, temperature=0.7)
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = AsyncMock(return_value=AIMessage(content="hi"))
+
+    await llm.ainvoke("hello")
+    await llm.ainvoke("hello")
+
+    assert llm.primary.ainvoke.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_with_fallback() -> None:
+    """A primary slower than the hedge delay should lose to the first fallback."""
+    llm = create_resilient_llm(tier=ModelTier.LITE, temperature=0.5, max_tokens=200)
+    llm.hedge_delay = 0.01
+    primary_cancelled = asyncio.Event()
+
+    async def slow_primary(*_args: object, **_kwargs: object) -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            primary_cancelled.set()
+            raise
+        return "primary"
+
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = slow_primary
+    fallback = MagicMock()
+    fallback.ainvoke = AsyncMock(return_value="fallback")
+
+    with patch("src.llm.providers._get_model_by_name", return_value=fallback):
+        result = await llm.ainvoke("prompt")
+
+    assert result == "fallback"
+    assert primary_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_primary_falls_back_without_hedging() -> None:
+    """Without a hedge delay, a 429 on the primary should move on to the fallback."""
+    llm = create_resilient_llm(tier=ModelTier.STANDARD)
+    assert llm.hedge_delay is None
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = AsyncMock(side_effect=Exception("429 Too Many Requests"))
+    fallback = MagicMock()
+    fallback.ainvoke = AsyncMock(return_value="fallback")
+
+    with patch("src.llm.providers._get_model_by_name", return_value=fallback):
+        result = await llm.ainvoke("prompt")
+
+    assert result == "fallback"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_request() -> None:
+    """Identical low-temperature calls in flight together should hit the provider once."""
+    llm = create_resilient_llm(tier=ModelTier.LITE, temperature=0.2, max_tokens=200)
+    release = asyncio.Event()
+
+    async def slow_call(*_args: object, **_kwargs: object) -> AIMessage:
+        await release.wait()
+        return AIMessage(content="none")
+
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = AsyncMock(side_effect=slow_call)
+
+    calls = [asyncio.create_task(llm.ainvoke("ok")) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*calls)
+
+    assert [r.content for r in results] == ["none"] * 3
+    llm.primary.ainvoke.assert_awaited_once()
+
+
+def test_create_resilient_llm_reuses_wrappers() -> None:
+    """Resilient wrappers and their structured variants should be built once."""
+    llm = create_resilient_llm(tier=ModelTier.LITE, temperature=0.2, max_tokens=200)
+
+    assert create_resilient_llm(tier=ModelTier.LITE, temperature=0.2, max_tokens=200) is llm
+    assert llm.with_structured_output(_Answer) is llm.with_structured_output(_Answer)
+
+
+@pytest.mark.asyncio
+async def test_close_llm_clients_drops_resilient_wrappers() -> None:
+    """Wrappers around closed clients should not be handed out after shutdown."""
+    llm = create_resilient_llm(tier=ModelTier.FAST, temperature=0.2, max_tokens=200)
+
+    with patch.object(type(llm.primary), "aclose", new=AsyncMock()):
+        await close_llm_clients()
+
+    assert create_resilient_llm(tier=ModelTier.FAST, temperature=0.2, max_tokens=200) is not llm
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_does_not_cancel_healthy_primary() -> None:
+    """A hedge that errors (e.g. missing API key) should not take down a slow primary."""
+    llm = create_resilient_llm(tier=ModelTier.LITE, temperature=0.5, max_tokens=200)
+    llm.hedge_delay = 0.01
+
+    async def slow_primary(*_args: object, **_kwargs: object) -> str:
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = slow_primary
+    fallback = MagicMock()
+    fallback.ainvoke = AsyncMock(side_effect=ValueError("ANTHROPIC_API_KEY is required"))
+
+    with patch("src.llm.providers._get_model_by_name", return_value=fallback):
+        result = await llm.ainvoke("prompt")
+
+    assert result == "primary"
+    fallback.ainvoke.assert_awaited_once()
+
+
+def test_only_lite_tier_hedges() -> None:
+    """FAST (profile analysis) and STANDARD calls should not pay for a hedge."""
+    assert create_resilient_llm(tier=ModelTier.LITE, temperature=0.2).hedge_delay is not None
+    assert create_resilient_llm(tier=ModelTier.FAST, temperature=0.1).hedge_delay is None
+    assert create_resilient_llm(tier=ModelTier.STANDARD).hedge_delay is None
+
+
+@pytest.mark.asyncio
+async def test_fallback_answers_are_not_cached_under_primary_key() -> None:
+    """A fallback model's answer should not be served later as the primary's."""
+    llm = create_resilient_llm(tier=ModelTier.LITE, temperature=0.2, max_tokens=200)
+    llm.primary = MagicMock()
+    llm.primary.ainvoke = AsyncMock(
+        side_effect=[Exception("429 RESOURCE_EXHAUSTED"), AIMessage(content="primary")]
+    )
+    fallback = MagicMock()
+    fallback.ainvoke = AsyncMock(return_value=AIMessage(content="fallback"))
+
+    with patch("src.llm.providers._get_model_by_name", return_value=fallback):
+        first = await llm.ainvoke("hello")
+        second = await llm.ainvoke("hello")
+
+    assert first.content == "fallback"
+    assert second.content == "primary"
@@ -0,0 +1,107 @@
+"""
+============================================================================
+Tests for Logging Configuration
+============================================================================
+Tests the readable formatter and NodeLogger context handling.
+
+Tests:
+- NodeLogger context is attached as a single ctx dict
+- ReadableFormatter prints context key-value pairs
+- Records without context format as a single line
+- colors=False drops the ANSI codes
+- is_enabled_for reflects the logger's level
+- node_start/node_end log the node's banners
+- Filtered levels never reach the underlying logger
+============================================================================
+"""
+
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from src.logging_config import NodeLogger, ReadableFormatter
+
+
+def test_node_logger_attaches_context_as_ctx(caplog: pytest.LogCaptureFixture) -> None:
+    """NodeLogger should pass its context as one record.ctx dict."""
+    logger = NodeLogger("test_node")
+
+    with caplog.at_level(logging.INFO, logger="node.test_node"):
+        logger.info("Hello", user_id="abc", count=2)
+
+    record = caplog.records[-1]
+    assert record.ctx == {"user_id": "abc", "count": 2}
+    assert record.getMessage() == "[test_node] Hello"
+
+
+def test_readable_formatter_prints_context() -> None:
+    """ReadableFormatter should render each context item on its own line."""
+    record = logging.LogRecord("node.test", logging.INFO, __file__, 1, "msg", None, None)
+    record.ctx = {"user_id": "abc"}
+
+    output = ReadableFormatter().format(record)
+
+    assert "user_id" in output
+    assert "abc" in output
+    assert output.count("\n") == 1
+
+
+def test_readable_formatter_without_context() -> None:
+    """Records without context should format as a single line."""
+    record = logging.LogRecord("node.test", logging.INFO, __file__, 1, "msg", None, None)
+
+    assert "\n" not in ReadableFormatter().format(record)
+
+
+def test_readable_formatter_without_colors() -> None:
+    """colors=False should produce the same layout with no ANSI escape codes."""
+    record = logging.LogRecord("node.test", logging.INFO, __file__, 1, "msg", None, None)
+    record.ctx = {"user_id": "abc"}
+
+    output = ReadableFormatter(colors=False).format(record)
+
+    assert "\033[" not in output
+    assert "INFO" in output
+    assert "  user_id: abc" in output
+
+
+def test_is_enabled_for_reflects_logger_level() -> None:
+    """is_enabled_for() should follow the underlying logger's level."""
+    logger = NodeLogger("level_test")
+    logger.logger.setLevel(logging.ERROR)
+
+    try:
+        assert not logger.is_enabled_for(logging.WARNING)
+        assert logger.is_enabled_for(logging.ERROR)
+    finally:
+        logger.logger.setLevel(logging.NOTSET)
+
+
+def test_node_banners(caplog: pytest.LogCaptureFixture) -> None:
+    """node_start/node_end should log separator banners with the node name."""
+    logger = NodeLogger("banner_test")
+
+    with caplog.at_level(logging.INFO, logger="node.banner_test"):
+        logger.node_start()
+        logger.node_end()
+
+    start, end = (record.getMessage() for record in caplog.records[-2:])
+    assert start == "\n" + "─" * 70 + "\n▶ BANNER_TEST"
+    assert end == "✓ BANNER_TEST\n" + "─" * 70 + "\n"
+
+
+def test_filtered_levels_skip_logging() -> None:
+    """Messages below the logger's level should not be built or emitted."""
+    logger = NodeLogger("filtered_test")
+    logger.logger.setLevel(logging.WARNING)
+
+    try:
+        with patch.object(logger.logger, "log") as mock_log:
+            logger.debug("hidden", detail="x")
+            logger.info("hidden")
+            logger.warning("shown")
+
+        mock_log.assert_called_once_with(logging.WARNING, "[filtered_test] shown")
+    finally:
+        logger.logger.setLevel(logging.NOTSET)
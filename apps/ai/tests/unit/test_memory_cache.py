@@ -6,24 +6,51 @@ Tests Redis-based caching for embeddings.
 
 Tests:
 - get_cached_embedding(): Cache hit/miss scenarios
+- get_cached_embeddings_bulk(): One MGET and one LRU update for many texts
 - cache_embedding(): Storage with TTL and LRU tracking
-- Eviction: Oldest entry removal when limit exceeded
+- Eviction: Oldest entry removal when limit exceeded (server-side script)
+- Embeddings round-trip through the int8 encoding with small cosine error
 - Graceful fallback when Redis unavailable
+- get_redis_client(): client reused, PING only every health-check interval
+- get_shared_redis_client(): reuses the local pool when both URLs match
+- Message total: kept as a counter, rebuilt from the counts hash if missing
+- append_messages(): only the new messages are sent, spliced on server-side
+- is_recent_memory(): repeats detected from a capped set of recent hashes
+- remember_memory_hash(): stored memories recorded in that set
 ============================================================================
 """
 
-import json
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from src.memory.cache import (
     EMBEDDING_TTL_SECONDS,
+    MAX_CACHED_MESSAGES,
     MAX_ENTRIES_PER_USER,
+    MESSAGES_COUNTS_KEY,
+    MESSAGES_LRU_KEY,
+    MESSAGES_TOTAL_KEY,
+    _pack_embedding,
+    append_messages,
     cache_embedding,
+    cache_messages,
     get_cached_embedding,
+    get_cached_embeddings_bulk,
+    get_message_cache_stats,
+    is_recent_memory,
+    remember_memory_hash,
 )
 
+
+def _mock_pipeline(mock_redis: AsyncMock, results: list[object]) -> MagicMock:
+    """Makes mock_redis.pipeline() return a pipeline whose execute() gives results."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=results)
+    mock_redis.pipeline = MagicMock(return_value=pipe)
+    return pipe
+
+
 # =============================================================================
 # get_cached_embedding() Tests
 # =============================================================================
@@ -35,16 +62,15 @@ async def test_cache_hit_returns_stored_embedding():
     with patch("src.memory.cache.get_redis_client") as mock_get_redis:
         # Setup mock Redis client
         mock_redis = AsyncMock()
-        embedding = [0.1, 0.2, 0.3]
-        mock_redis.get.return_value = json.dumps(embedding)
-        mock_redis.zadd = AsyncMock()
+        embedding = [0.5, -0.25, 0.125]
+        _mock_pipeline(mock_redis, [_pack_embedding(embedding), 0])
         mock_get_redis.return_value = mock_redis
 
         # Call function
         result = await get_cached_embedding("user-1", "Hello")
 
-        # Verify returns cached embedding
-        assert result == embedding
+        # Verify returns cached embedding (int8-quantized, so approximate)
+        assert result == pytest.approx(embedding, abs=0.5 / 127)
         assert len(result) == 3
 
 
@@ -54,7 +80,7 @@ async def test_cache_miss_returns_none():
     with patch("src.memory.cache.get_redis_client") as mock_get_redis:
         # Setup mock - cache miss
         mock_redis = AsyncMock()
-        mock_redis.get.return_value = None
+        _mock_pipeline(mock_redis, [None, 0])
         mock_get_redis.return_value = mock_redis
 
         # Call function
@@ -66,26 +92,27 @@ async def test_cache_miss_returns_none():
 
 @pytest.mark.asyncio
 async def test_cache_updates_lru_on_hit():
-    """get_cached_embedding() should update LRU timestamp on cache hit."""
+    """get_cached_embedding() should update the LRU timestamp in the same round-trip."""
     with (
         patch("src.memory.cache.get_redis_client") as mock_get_redis,
         patch("src.memory.cache.time.time", return_value=1000.0),
     ):
         # Setup mock
         mock_redis = AsyncMock()
-        mock_redis.get.return_value = json.dumps([0.1] * 768)
-        mock_redis.zadd = AsyncMock()
+        pipe = _mock_pipeline(mock_redis, [_pack_embedding([0.1] * 768), 0])
         mock_get_redis.return_value = mock_redis
 
         # Call function
         await get_cached_embedding("user-1", "Hello")
 
-        # Verify LRU was updated with timestamp
-        assert mock_redis.zadd.called
-        call_args = mock_redis.zadd.call_args
-        # zadd called with (key, {hash: timestamp_value})
-        assert call_args is not None
-        # Check that zadd was called (timestamp value verification not critical for this test)
+        # GET and ZADD XX were queued on one pipeline and executed once
+        pipe.get.assert_called_once()
+        lru_key, scores = pipe.zadd.call_args.args
+        assert lru_key == "embedding_lru:user-1"
+        assert list(scores.values()) == [1000.0]
+        assert pipe.zadd.call_args.kwargs == {"xx": True}
+        pipe.execute.assert_awaited_once()
+        mock_redis.get.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -106,9 +133,10 @@ async def test_cache_graceful_fallback_on_redis_unavailable():
 async def test_cache_handles_get_errors():
     """get_cached_embedding() should handle Redis errors gracefully."""
     with patch("src.memory.cache.get_redis_client") as mock_get_redis:
-        # Setup mock to raise error on get()
+        # Setup mock to raise error on execute()
         mock_redis = AsyncMock()
-        mock_redis.get.side_effect = Exception("Redis error")
+        pipe = _mock_pipeline(mock_redis, [])
+        pipe.execute.side_effect = Exception("Redis error")
         mock_get_redis.return_value = mock_redis
 
         # Should not raise, returns None
@@ -116,6 +144,50 @@ async def test_cache_handles_get_errors():
         assert result is None
 
 
+# =============================================================================
+# get_cached_embeddings_bulk() Tests
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_bulk_get_returns_hits_and_misses_in_order():
+    """get_cached_embeddings_bulk() should pipeline one MGET with one ZADD XX."""
+    with (
+        patch("src.memory.cache.get_redis_client") as mock_get_redis,
+        patch("src.memory.cache.time.time", return_value=1000.0),
+    ):
+        mock_redis = AsyncMock()
+        values = [_pack_embedding([0.5]), None, _pack_embedding([0.25])]
+        pipe = _mock_pipeline(mock_redis, [values, 2])
+        mock_get_redis.return_value = mock_redis
+
+        result = await get_cached_embeddings_bulk("user-1", ["a", "b", "c"])
+
+        assert result[1] is None
+        assert result[0] == pytest.approx([0.5])
+        assert result[2] == pytest.approx([0.25])
+        pipe.mget.assert_called_once()
+        lru_key, scores = pipe.zadd.call_args.args
+        assert lru_key == "embedding_lru:user-1"
+        assert len(scores) == 3
+        assert pipe.zadd.call_args.kwargs == {"xx": True}
+        pipe.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk_get_returns_misses_on_errors():
+    """get_cached_embeddings_bulk() should return all None when Redis fails."""
+    with patch("src.memory.cache.get_redis_client") as mock_get_redis:
+        mock_redis = AsyncMock()
+        pipe = _mock_pipeline(mock_redis, [])
+        pipe.execute.side_effect = Exception("Redis error")
+        mock_get_redis.return_value = mock_redis
+
+        result = await get_cached_embeddings_bulk("user-1", ["a", "b"])
+
+        assert result == [None, None]
+
+
 # =============================================================================
 # cache_embedding() Tests
 # =============================================================================
@@ -127,44 +199,42 @@ async def test_cache_embedding_stores_with_ttl():
     with patch("src.memory.cache.get_redis_client") as mock_get_redis:
         # Setup mock
         mock_redis = AsyncMock()
-        mock_redis.setex = AsyncMock()
-        mock_redis.zadd = AsyncMock()
-        mock_redis.zcard = AsyncMock(return_value=10)  # Under limit
+        pipe = _mock_pipeline(mock_redis, [True, 1, 10])  # Under limit
         mock_get_redis.return_value = mock_redis
 
         # Call function
         embedding = [0.1] * 768
         result = await cache_embedding("user-1", "Test text", embedding)
 
-        # Verify setex was called with TTL
+        # Verify setex was queued with TTL
         assert result is True
-        mock_redis.setex.assert_called_once()
-        call_args = mock_redis.setex.call_args[0]
+        pipe.setex.assert_called_once()
+        call_args = pipe.setex.call_args[0]
         assert call_args[1] == EMBEDDING_TTL_SECONDS  # TTL argument
+        assert call_args[2] == _pack_embedding(embedding)  # quantized bytes, not JSON
 
 
 @pytest.mark.asyncio
 async def test_cache_embedding_updates_lru():
-    """cache_embedding() should update LRU sorted set."""
+    """cache_embedding() should write, update the LRU and count it in one round-trip."""
     with (
         patch("src.memory.cache.get_redis_client") as mock_get_redis,
-        patch("src.memory.cache.time.time", return_value=2000.0),
+        patch("src.memory.cache.time.time", return_value=1000.0),
     ):
         # Setup mock
         mock_redis = AsyncMock()
-        mock_redis.setex = AsyncMock()
-        mock_redis.zadd = AsyncMock()
-        mock_redis.zcard = AsyncMock(return_value=10)
+        pipe = _mock_pipeline(mock_redis, [True, 1, 10])
         mock_get_redis.return_value = mock_redis
 
         # Call function
         await cache_embedding("user-1", "Test", [0.1] * 768)
 
-        # Verify LRU was updated with timestamp
-        assert mock_redis.zadd.called
-        call_args = mock_redis.zadd.call_args
-        # zadd called with (key, {hash: timestamp})
-        assert call_args is not None
+        # Verify LRU was updated with timestamp on the same pipeline
+        lru_key, scores = pipe.zadd.call_args.args
+        assert lru_key == "embedding_lru:user-1"
+        assert list(scores.values()) == [1000.0]
+        pipe.zcard.assert_called_once_with("embedding_lru:user-1")
+        pipe.execute.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -176,9 +246,7 @@ async def test_cache_embedding_triggers_eviction_when_over_limit():
     ):
         # Setup mock - cache is over limit
         mock_redis = AsyncMock()
-        mock_redis.setex = AsyncMock()
-        mock_redis.zadd = AsyncMock()
-        mock_redis.zcard = AsyncMock(return_value=MAX_ENTRIES_PER_USER + 10)  # Over limit
+        _mock_pipeline(mock_redis, [True, 1, MAX_ENTRIES_PER_USER + 10])  # Over limit
         mock_get_redis.return_value = mock_redis
         mock_evict.return_value = 10
 
@@ -209,7 +277,8 @@ async def test_cache_embedding_handles_errors_gracefully():
     with patch("src.memory.cache.get_redis_client") as mock_get_redis:
         # Setup mock to raise error
         mock_redis = AsyncMock()
-        mock_redis.setex.side_effect = Exception("Redis error")
+        pipe = _mock_pipeline(mock_redis, [])
+        pipe.execute.side_effect = Exception("Redis error")
         mock_get_redis.return_value = mock_redis
 
         # Should not raise, returns False
@@ -217,6 +286,248 @@ async def test_cache_embedding_handles_errors_gracefully():
         assert result is False
 
 
+# =============================================================================
+# is_recent_memory() Tests
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_recent_memory_detects_repeat():
+    """is_recent_memory() should report a repeat when the hash is in the set."""
+    with patch("src.memory.cache.get_redis_client") as mock_get_redis:
+        mock_redis = AsyncMock()
+        mock_redis.zscore = AsyncMock(return_value=1700000000.0)
+        mock_get_redis.return_value = mock_redis
+
+        assert await is_recent_memory("user-1", "User: thanks\nAssistant: Anytime!") is True
+        mock_redis.zadd.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_recent_memory_new_text_or_no_redis():
+    """is_recent_memory() should report new text, and treat missing Redis as new."""
+    with patch("src.memory.cache.get_redis_client") as mock_get_redis:
+        mock_redis = AsyncMock()
+        mock_redis.zscore = AsyncMock(return_value=None)
+        mock_get_redis.return_value = mock_redis
+        assert await is_recent_memory("user-1", "User: hi\nAssistant: Hello!") is False
+
+        mock_get_redis.return_value = None
+        assert await is_recent_memory("user-1", "User: hi\nAssistant: Hello!") is False
+
+
+@pytest.mark.asyncio
+async def test_remember_memory_hash_records_capped_set():
+    """remember_memory_hash() should add the hash, trim the set and refresh its TTL."""
+    with patch("src.memory.cache.get_redis_client") as mock_get_redis:
+        mock_redis = AsyncMock()
+        pipe = _mock_pipeline(mock_redis, [1, 0, True])
+        mock_get_redis.return_value = mock_redis
+
+        await remember_memory_hash("user-1", "User: thanks\nAssistant: Anytime!")
+
+        pipe.zadd.assert_called_once()
+        pipe.zremrangebyrank.assert_called_once()
+        pipe.expire.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_eviction_runs_as_one_script_call():
+    """_evict_oldest_entries() should evict in a single EVALSHA with the user's key prefix."""
+    from src.memory.cache import _evict_oldest_entries
+
+    mock_redis = AsyncMock()
+    mock_redis.evalsha.return_value = 3
+
+    evicted = await _evict_oldest_entries(mock_redis, "user-1", "embedding_lru:user-1", 10)
+
+    assert evicted == 3
+    args = mock_redis.evalsha.call_args.args
+    assert args[1:] == (1, "embedding_lru:user-1", "embedding:q8b2:user-1:", 10)
+    mock_redis.zrange.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_eviction_loads_script_when_not_cached():
+    """A NOSCRIPT reply should fall back to EVAL with the script source."""
+    from redis.exceptions import NoScriptError
+
+    from src.memory.cache import _evict_oldest_entries
+
+    mock_redis = AsyncMock()
+    mock_redis.evalsha.side_effect = NoScriptError("NOSCRIPT")
+    mock_redis.eval.return_value = 1
+
+    assert await _evict_oldest_entries(mock_redis, "user-1", "embedding_lru:user-1", 10) == 1
+    assert "ZPOPMIN" in mock_redis.eval.call_args.args[0]
+
+
+# =============================================================================
+# Message Total Counter Tests
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_stats_read_counter_in_one_round_trip():
+    """Message stats should read the counter, count and oldest entry in one pipeline."""
+    with patch("src.memory.cache.get_shared_redis_client") as mock_get_redis:
+        mock_redis = AsyncMock()
+        pipe = _mock_pipeline(mock_redis, [b"42", 3, []])
+        mock_get_redis.return_value = mock_redis
+
+        stats = await get_message_cache_stats()
+
+        assert stats["total_messages"] == 42
+        assert stats["conversation_count"] == 3
+        pipe.get.assert_called_once_with(MESSAGES_TOTAL_KEY)
+        pipe.execute.assert_awaited_once()
+        mock_redis.hgetall.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_total_rebuilt_from_counts_when_missing():
+    """A missing counter should be rebuilt once from the counts hash."""
+    with patch("src.memory.cache.get_shared_redis_client") as mock_get_redis:
+        mock_redis = AsyncMock()
+        _mock_pipeline(mock_redis, [None, 2, []])
+        mock_redis.hgetall.return_value = {b"conv-a": b"3", b"conv-b": b"4"}
+        mock_get_redis.return_value = mock_redis
+
+        assert (await get_message_cache_stats())["total_messages"] == 7
+        mock_redis.set.assert_awaited_once_with(MESSAGES_TOTAL_KEY, 7, nx=True)
+
+
+@pytest.mark.asyncio
+async def test_cache_messages_updates_count_and_total_together():
+    """cache_messages() should set the count and move the total in one script call."""
+    with patch("src.memory.cache.get_shared_redis_client") as mock_get_redis:
+        mock_redis = AsyncMock()
+        pipe = _mock_pipeline(mock_redis, [True, 1, 11])
+        mock_get_redis.return_value = mock_redis
+
+        result = await cache_messages("conv-1", [{"id": "m1"}, {"id": "m2"}, {"id": "m3"}])
+
+        assert result is True
+        pipe.hset.assert_not_called()
+        args = pipe.eval.call_args.args
+        assert args[1:] == (2, MESSAGES_COUNTS_KEY, MESSAGES_TOTAL_KEY, "conv-1", 3)
+
+
+@pytest.mark.asyncio
+async def test_append_messages_sends_only_new_messages():
+    """append_messages() should splice server-side without reading the stored array."""
+    with patch("src.memory.cache.get_shared_redis_client") as mock_get_redis:
+        mock_redis = AsyncMock()
+        mock_redis.evalsha.return_value = [6, 10, 0]
+        mock_get_redis.return_value = mock_redis
+
+        result = await append_messages("conv-1", [{"id": "m6"}])
+
+        assert result is True
+        mock_redis.get.assert_not_called()
+        mock_redis.pipeline.assert_not_called()
+        args = mock_redis.evalsha.call_args.args
+        assert args[2:6] == (
+            MESSAGES_COUNTS_KEY,
+            MESSAGES_TOTAL_KEY,
+            "conv_msgs:conv-1",
+            MESSAGES_LRU_KEY,
+        )
+        assert args[6:9] == ("conv-1", b'{"id":"m6"}', 1)
+
+
+@pytest.mark.asyncio
+async def test_append_messages_evicts_overflow_from_returned_total():
+    """An append that pushes the total over the cap should evict just the overflow."""
+    with (
+        patch("src.memory.cache.get_shared_redis_client") as mock_get_redis,
+        patch("src.memory.cache._evict_oldest_conversations") as mock_evict,
+    ):
+        mock_redis = AsyncMock()
+        mock_redis.evalsha.return_value = [3, MAX_CACHED_MESSAGES + 2, 1]
+        mock_get_redis.return_value = mock_redis
+
+        assert await append_messages("conv-1", [{"id": "m1"}, {"id": "m2"}]) is True
+
+        mock_evict.assert_awaited_once_with(mock_redis, 2)
+
+
+# =============================================================================
+# get_redis_client() Tests
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_redis_client_is_reused_and_pinged_once(monkeypatch: pytest.MonkeyPatch):
+    """Calls within the health-check interval should reuse the client without a PING."""
+    import src.memory.cache as cache_module
+
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379")
+    monkeypatch.setattr(cache_module, "_redis_pool", None)
+    monkeypatch.setattr(cache_module, "_redis_client", None)
+    mock_client = AsyncMock()
+
+    with (
+        patch("src.memory.cache.redis.BlockingConnectionPool.from_url") as mock_from_url,
+        patch("src.memory.cache.redis.Redis", return_value=mock_client) as mock_redis_cls,
+    ):
+        mock_client.connection_pool = mock_from_url.return_value
+        first = await cache_module.get_redis_client()
+        second = await cache_module.get_redis_client()
+
+    assert first is second is mock_client
+    mock_redis_cls.assert_called_once()
+    mock_client.ping.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_redis_client_repings_after_failed_ping(monkeypatch: pytest.MonkeyPatch):
+    """A failed PING should return None and force a PING on the next call."""
+    import src.memory.cache as cache_module
+
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379")
+    monkeypatch.setattr(cache_module, "_redis_pool", None)
+    monkeypatch.setattr(cache_module, "_redis_client", None)
+    mock_client = AsyncMock()
+    mock_client.ping.side_effect = [ConnectionError("down"), True]
+
+    with (
+        patch("src.memory.cache.redis.BlockingConnectionPool.from_url") as mock_from_url,
+        patch("src.memory.cache.redis.Redis", return_value=mock_client),
+    ):
+        mock_client.connection_pool = mock_from_url.return_value
+        assert await cache_module.get_redis_client() is None
+        assert await cache_module.get_redis_client() is mock_client
+
+    assert mock_client.ping.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reuses_local_pool_for_same_url(monkeypatch: pytest.MonkeyPatch):
+    """A shared URL equal to the local one should reuse the local client and pool."""
+    import src.memory.cache as cache_module
+
+    monkeypatch.delenv("REDIS_URI", raising=False)
+    monkeypatch.setenv("REDIS_URL", "redis://localhost:6379")
+    monkeypatch.setenv("REDIS_SHARED_URL", "redis://localhost:6379")
+    monkeypatch.setattr(cache_module, "_redis_pool", None)
+    monkeypatch.setattr(cache_module, "_redis_client", None)
+    monkeypatch.setattr(cache_module, "_shared_redis_pool", None)
+    mock_client = AsyncMock()
+
+    with (
+        patch("src.memory.cache.redis.BlockingConnectionPool.from_url") as mock_from_url,
+        patch("src.memory.cache.redis.Redis", return_value=mock_client),
+    ):
+        mock_client.connection_pool = mock_from_url.return_value
+        assert await cache_module.get_shared_redis_client() is mock_client
+        assert await cache_module.get_redis_client() is mock_client
+
+    mock_from_url.assert_called_once()
+    assert mock_from_url.call_args.kwargs["max_connections"] == cache_module.REDIS_MAX_CONNECTIONS
+    assert cache_module._shared_redis_pool is None
+
+
 # =============================================================================
 # Helper Function Tests
 # =============================================================================
@@ -244,13 +555,45 @@ def test_hash_text_normalizes_input():
     assert hash1 == hash2
 
 
+def test_hash_text_collapses_inner_whitespace():
+    """_hash_text() should treat runs of whitespace as a single space."""
+    from src.memory.cache import _hash_text
+
+    assert _hash_text("I feel\n\n  anxious") == _hash_text("i feel anxious")
+    assert _hash_text("i feel anxious") != _hash_text("i feelanxious")
+
+
+def test_embedding_round_trips_through_int8():
+    """Packed embeddings should be dim + 4 bytes and keep cosine similarity ~1."""
+    import numpy as np
+
+    from src.memory.cache import _unpack_embedding
+
+    rng = np.random.default_rng(0)
+    embedding = rng.normal(size=768).tolist()
+    packed = _pack_embedding(embedding)
+    restored = np.array(_unpack_embedding(packed))
+
+    original = np.array(embedding)
+    cosine = restored @ original / (np.linalg.norm(restored) * np.linalg.norm(original))
+    assert len(packed) == 768 + 4
+    assert cosine > 0.999
+
+
+def test_zero_embedding_round_trips():
+    """An all-zero vector should not divide by a zero scale."""
+    from src.memory.cache import _unpack_embedding
+
+    assert _unpack_embedding(_pack_embedding([0.0, 0.0])) == [0.0, 0.0]
+
+
 def test_embedding_key_format():
     """_embedding_key() should create correctly formatted key."""
     from src.memory.cache import _embedding_key
 
     key = _embedding_key("user-123", "abc123")
 
-    assert key == "embedding:user-123:abc123"
+    assert key == "embedding:q8b2:user-123:abc123"
     assert key.startswith("embedding:")
 
 
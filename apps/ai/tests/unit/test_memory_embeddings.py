@@ -6,20 +6,25 @@ Tests embedding generation using Google's Gemini model.
 
 Tests:
 - generate_embedding(): Vector generation with correct dimensions
-- generate_embeddings_batch(): Batch processing
+- generate_embedding(): Concurrent calls coalesced into one batch request
+- generate_embeddings_batch(): Batch processing, chunked past EMBED_MAX_BATCH
+- to_halfvec_literal(): pgvector literal for halfvec columns
 - format_memory_text(): Text formatting for embeddings
 ============================================================================
 """
 
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from src.memory.embeddings import (
+    EMBED_MAX_BATCH,
     EMBEDDING_DIMENSIONS,
     format_memory_text,
     generate_embedding,
     generate_embeddings_batch,
+    to_halfvec_literal,
 )
 
 # =============================================================================
@@ -37,7 +42,7 @@ async def test_generate_embedding_returns_768_dimensions(mock_env):
         mock_embedding.values = [0.1] * 768
         mock_result = MagicMock()
         mock_result.embeddings = [mock_embedding]
-        mock_client.models.embed_content.return_value = mock_result
+        mock_client.aio.models.embed_content = AsyncMock(return_value=mock_result)
         mock_get_client.return_value = mock_client
 
         # Call function
@@ -58,14 +63,14 @@ async def test_generate_embedding_uses_correct_model(mock_env):
         mock_embedding.values = [0.1] * 768
         mock_result = MagicMock()
         mock_result.embeddings = [mock_embedding]
-        mock_client.models.embed_content.return_value = mock_result
+        mock_client.aio.models.embed_content = AsyncMock(return_value=mock_result)
         mock_get_client.return_value = mock_client
 
         # Call function
         await generate_embedding("Test text")
 
         # Verify correct model was used
-        call_args = mock_client.models.embed_content.call_args
+        call_args = mock_client.aio.models.embed_content.call_args
         assert call_args[1]["model"] == "gemini-embedding-001"
 
 
@@ -79,14 +84,14 @@ async def test_generate_embedding_uses_semantic_similarity_task(mock_env):
         mock_embedding.values = [0.1] * 768
         mock_result = MagicMock()
         mock_result.embeddings = [mock_embedding]
-        mock_client.models.embed_content.return_value = mock_result
+        mock_client.aio.models.embed_content = AsyncMock(return_value=mock_result)
         mock_get_client.return_value = mock_client
 
         # Call function
         await generate_embedding("Test text")
 
         # Verify task type
-        call_args = mock_client.models.embed_content.call_args
+        call_args = mock_client.aio.models.embed_content.call_args
         config = call_args[1]["config"]
         assert config.task_type == "SEMANTIC_SIMILARITY"
         assert config.output_dimensionality == EMBEDDING_DIMENSIONS
@@ -98,7 +103,7 @@ async def test_generate_embedding_handles_api_errors():
     with patch("src.memory.embeddings.get_genai_client") as mock_get_client:
         # Setup mock to raise error
         mock_client = MagicMock()
-        mock_client.models.embed_content.side_effect = Exception("API Error")
+        mock_client.aio.models.embed_content = AsyncMock(side_effect=Exception("API Error"))
         mock_get_client.return_value = mock_client
 
         # Should raise the error (caller handles it)
@@ -106,6 +111,31 @@ async def test_generate_embedding_handles_api_errors():
             await generate_embedding("Test")
 
 
+@pytest.mark.asyncio
+async def test_concurrent_embeddings_share_one_request(mock_env):
+    """Concurrent generate_embedding() calls should be sent as one batch, in order."""
+    with patch("src.memory.embeddings.get_genai_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_emb1 = MagicMock()
+        mock_emb1.values = [0.1] * 768
+        mock_emb2 = MagicMock()
+        mock_emb2.values = [0.2] * 768
+        mock_result = MagicMock()
+        mock_result.embeddings = [mock_emb1, mock_emb2]
+        mock_client.aio.models.embed_content = AsyncMock(return_value=mock_result)
+        mock_get_client.return_value = mock_client
+
+        first, second = await asyncio.gather(
+            generate_embedding("Text 1"), generate_embedding("Text 2")
+        )
+
+        assert first[0] == 0.1
+        assert second[0] == 0.2
+        mock_client.aio.models.embed_content.assert_awaited_once()
+        call_args = mock_client.aio.models.embed_content.call_args
+        assert call_args[1]["contents"] == ["Text 1", "Text 2"]
+
+
 # =============================================================================
 # generate_embeddings_batch() Tests
 # =============================================================================
@@ -123,7 +153,7 @@ async def test_generate_embeddings_batch_returns_multiple_vectors(mock_env):
         mock_emb2.values = [0.2] * 768
         mock_result = MagicMock()
         mock_result.embeddings = [mock_emb1, mock_emb2]
-        mock_client.models.embed_content.return_value = mock_result
+        mock_client.aio.models.embed_content = AsyncMock(return_value=mock_result)
         mock_get_client.return_value = mock_client
 
         # Call function
@@ -135,6 +165,47 @@ async def test_generate_embeddings_batch_returns_multiple_vectors(mock_env):
         assert len(results[1]) == 768
 
 
+@pytest.mark.asyncio
+async def test_generate_embeddings_batch_splits_large_inputs_in_order(mock_env):
+    """Inputs over EMBED_MAX_BATCH should be sent in chunks and reassembled in order."""
+
+    async def _embed(model: str, contents: list[str], config: object) -> MagicMock:
+        result = MagicMock()
+        result.embeddings = [MagicMock(values=[float(text)]) for text in contents]
+        return result
+
+    with patch("src.memory.embeddings.get_genai_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_client.aio.models.embed_content = AsyncMock(side_effect=_embed)
+        mock_get_client.return_value = mock_client
+
+        texts = [str(i) for i in range(EMBED_MAX_BATCH * 2 + 1)]
+        results = await generate_embeddings_batch(texts)
+
+        assert [r[0] for r in results] == [float(t) for t in texts]
+        assert mock_client.aio.models.embed_content.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_generate_embeddings_batch_embeds_duplicates_once(mock_env):
+    """Repeated texts should be sent once and their vectors scattered back in order."""
+
+    async def _embed(model: str, contents: list[str], config: object) -> MagicMock:
+        result = MagicMock()
+        result.embeddings = [MagicMock(values=[float(text)]) for text in contents]
+        return result
+
+    with patch("src.memory.embeddings.get_genai_client") as mock_get_client:
+        mock_client = MagicMock()
+        mock_client.aio.models.embed_content = AsyncMock(side_effect=_embed)
+        mock_get_client.return_value = mock_client
+
+        results = await generate_embeddings_batch(["1", "2", "1", "1"])
+
+        assert results == [[1.0], [2.0], [1.0], [1.0]]
+        assert mock_client.aio.models.embed_content.call_args[1]["contents"] == ["1", "2"]
+
+
 @pytest.mark.asyncio
 async def test_generate_embeddings_batch_handles_empty_list(mock_env):
     """generate_embeddings_batch() should handle empty input list."""
@@ -145,6 +216,16 @@ async def test_generate_embeddings_batch_handles_empty_list(mock_env):
     assert results == []
 
 
+# =============================================================================
+# to_halfvec_literal() Tests
+# =============================================================================
+
+
+def test_halfvec_literal_is_compact_pgvector_text():
+    """to_halfvec_literal() should give a bracketed list with 5 significant digits."""
+    assert to_halfvec_literal([0.0123456789, -0.5, 1e-7]) == "[0.012346,-0.5,1e-07]"
+
+
 # =============================================================================
 # format_memory_text() Tests
 # =============================================================================
@@ -6,14 +6,16 @@ Tests memory storage, retrieval, and formatting functions.
 
 Tests:
 - store_memory(): Embedding generation and Supabase storage
+- store_memories_bulk(): One embedding batch and chunked multi-row inserts
 - search_memories(): Semantic search with similarity filtering
+- get_query_embedding(): In-process tier in front of the Redis cache
 - format_memories_for_prompt(): LLM prompt formatting
 - save_messages(): Fire-and-forget message persistence
 - generate_title_if_needed(): Conversation title generation
 ============================================================================
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -21,8 +23,10 @@ from src.memory.store import (
     Memory,
     format_memories_for_prompt,
     generate_title_if_needed,
+    get_query_embedding,
     save_messages,
     search_memories,
+    store_memories_bulk,
     store_memory,
 )
 
@@ -149,6 +153,57 @@ async def test_store_memory_returns_valid_uuid(mock_env):
         assert len(result_id) == 36  # Standard UUID length with hyphens
 
 
+# =============================================================================
+# store_memories_bulk() Tests
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_store_memories_bulk_batches_embeddings_and_inserts():
+    """store_memories_bulk() should embed once and insert in MEMORY_INSERT_BATCH chunks."""
+    pairs = [
+        {"user_id": "user-1", "user_message": f"Message {i}", "ai_response": f"Reply {i}"}
+        for i in range(3)
+    ]
+    mock_client = MagicMock()
+    mock_client.table().insert().execute = AsyncMock(
+        side_effect=[
+            MagicMock(data=[{"id": "mem-0"}, {"id": "mem-1"}]),
+            MagicMock(data=[{"id": "mem-2"}]),
+        ]
+    )
+
+    with (
+        patch("src.memory.store.MEMORY_INSERT_BATCH", 2),
+        patch(
+            "src.memory.store.generate_embeddings_batch",
+            new=AsyncMock(return_value=[[0.5] * 768] * 3),
+        ) as mock_batch,
+        patch(
+            "src.memory.store.get_async_supabase_client",
+            new=AsyncMock(return_value=mock_client),
+        ),
+    ):
+        memory_ids = await store_memories_bulk(pairs)
+
+    assert memory_ids == ["mem-0", "mem-1", "mem-2"]
+    mock_batch.assert_awaited_once()
+    assert len(mock_batch.call_args[0][0]) == 3
+
+    inserted = [call.args[0] for call in mock_client.table().insert.call_args_list if call.args]
+    assert [len(rows) for rows in inserted] == [2, 1]
+    assert inserted[0][0]["metadata"] == {}
+    assert inserted[0][0]["embedding"].startswith("[0.5,")
+
+
+@pytest.mark.asyncio
+async def test_store_memories_bulk_empty_input():
+    """store_memories_bulk() should do nothing for an empty list."""
+    with patch("src.memory.store.generate_embeddings_batch") as mock_batch:
+        assert await store_memories_bulk([]) == []
+    mock_batch.assert_not_called()
+
+
 # =============================================================================
 # search_memories() Tests
 # =============================================================================
@@ -259,6 +314,25 @@ async def test_search_memories_returns_memory_objects(mock_env):
         assert memory.metadata == {"topic": "anxiety"}
 
 
+@pytest.mark.asyncio
+async def test_query_embedding_repeat_skips_redis_and_api():
+    """A repeated query should be served from the in-process cache."""
+    with (
+        patch("src.memory.store.get_cached_embedding", new=AsyncMock(return_value=None)) as get,
+        patch("src.memory.store.cache_embedding", new=AsyncMock(return_value=True)),
+        patch(
+            "src.memory.store.generate_embedding", new=AsyncMock(return_value=[0.1] * 768)
+        ) as gen,
+    ):
+        first = await get_query_embedding("user-1", "How are you?")
+        second = await get_query_embedding("user-1", "How are you?")
+        await get_query_embedding("user-2", "How are you?")
+
+    assert first == second == [0.1] * 768
+    assert get.await_count == 2  # once per user
+    assert gen.await_count == 2
+
+
 # =============================================================================
 # format_memories_for_prompt() Tests
 # =============================================================================
@@ -0,0 +1,100 @@
+"""
+============================================================================
+Tests for Prepare Request Node
+============================================================================
+Tests the fused user context injection + activity detection + semantic
+cache lookup node.
+
+Tests:
+- Merges updates from all inner nodes into one state update
+- Unauthenticated requests still get an activity decision
+- A cache hit discards the detected activity
+============================================================================
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.nodes.prepare_request.node import prepare_request
+
+
+@pytest.mark.asyncio
+async def test_prepare_request_merges_context_and_activity() -> None:
+    """prepare_request should return user_context and suggested_activity together."""
+    with (
+        patch(
+            "src.nodes.prepare_request.node.inject_user_context",
+            new=AsyncMock(return_value={"user_context": {"user_id": "user-1"}}),
+        ),
+        patch(
+            "src.nodes.prepare_request.node.detect_activity_intent",
+            new=AsyncMock(return_value={"suggested_activity": "breathing"}),
+        ),
+        patch(
+            "src.nodes.prepare_request.node.semantic_cache_lookup",
+            new=AsyncMock(return_value={"cache_hit": False}),
+        ),
+    ):
+        state = {"messages": [HumanMessage(content="I feel anxious")]}
+        config = {"configurable": {"langgraph_auth_user": {"identity": "user-1"}}}
+
+        result = await prepare_request(state, config)
+
+    assert result == {
+        "user_context": {"user_id": "user-1"},
+        "suggested_activity": "breathing",
+        "cache_hit": False,
+    }
+
+
+@pytest.mark.asyncio
+async def test_prepare_request_unauthenticated_still_detects_activity() -> None:
+    """prepare_request should return only the activity when no user is authenticated."""
+    with (
+        patch(
+            "src.nodes.prepare_request.node.inject_user_context",
+            new=AsyncMock(return_value={}),
+        ),
+        patch(
+            "src.nodes.prepare_request.node.detect_activity_intent",
+            new=AsyncMock(return_value={"suggested_activity": None}),
+        ),
+        patch(
+            "src.nodes.prepare_request.node.semantic_cache_lookup",
+            new=AsyncMock(return_value={"cache_hit": False}),
+        ),
+    ):
+        state = {"messages": [HumanMessage(content="Hello")]}
+        config = {"configurable": {}}
+
+        result = await prepare_request(state, config)
+
+    assert result == {"suggested_activity": None, "cache_hit": False}
+
+
+@pytest.mark.asyncio
+async def test_prepare_request_cache_hit_discards_activity() -> None:
+    """A cache hit already answers the turn, so no activity should be suggested."""
+    cached = AIMessage(content="Cached reply")
+    with (
+        patch(
+            "src.nodes.prepare_request.node.inject_user_context",
+            new=AsyncMock(return_value={}),
+        ),
+        patch(
+            "src.nodes.prepare_request.node.detect_activity_intent",
+            new=AsyncMock(return_value={"suggested_activity": "breathing"}),
+        ),
+        patch(
+            "src.nodes.prepare_request.node.semantic_cache_lookup",
+            new=AsyncMock(return_value={"cache_hit": True, "messages": [cached]}),
+        ),
+    ):
+        state = {"messages": [HumanMessage(content="I feel anxious")]}
+        config = {"configurable": {"langgraph_auth_user": {"identity": "user-1"}}}
+
+        result = await prepare_request(state, config)
+
+    assert result == {"suggested_activity": None, "cache_hit": True, "messages": [cached]}
@@ -0,0 +1,135 @@
+"""
+============================================================================
+Tests for Semantic Response Cache
+============================================================================
+Tests the per-user response cache and the semantic_cache_lookup node.
+
+Tests:
+- Similar embeddings hit, dissimilar ones miss
+- Entries are isolated per user
+- Per-user entry limit evicts the oldest responses
+- int8-quantized similarity tracks float cosine similarity
+- Node only looks up authenticated opening turns
+============================================================================
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.memory.embeddings import EMBEDDING_DIMENSIONS
+from src.nodes.semantic_cache.node import is_opening_turn, semantic_cache_lookup
+from src.nodes.semantic_cache.response_cache import SemanticResponseCache
+
+
+def _unit(index: int) -> list[float]:
+    """Returns a one-hot embedding (orthogonal to every other index)."""
+    vector = np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float32)
+    vector[index] = 1.0
+    return vector.tolist()
+
+
+# =============================================================================
+# SemanticResponseCache Tests
+# =============================================================================
+
+
+def test_lookup_returns_response_for_similar_embedding() -> None:
+    """lookup() should return the stored response for a near-identical embedding."""
+    cache = SemanticResponseCache()
+    cache.add("user-1", _unit(0), "Let's take a breath together.")
+
+    nearby = _unit(0)
+    nearby[1] = 0.1
+
+    assert cache.lookup("user-1", nearby) == "Let's take a breath together."
+
+
+def test_lookup_misses_for_dissimilar_embedding() -> None:
+    """lookup() should return None when nothing is above the threshold."""
+    cache = SemanticResponseCache()
+    cache.add("user-1", _unit(0), "Let's take a breath together.")
+
+    assert cache.lookup("user-1", _unit(1)) is None
+
+
+def test_lookup_is_isolated_per_user() -> None:
+    """lookup() should never return another user's response."""
+    cache = SemanticResponseCache()
+    cache.add("user-1", _unit(0), "Response for user 1")
+
+    assert cache.lookup("user-2", _unit(0)) is None
+
+
+def test_add_evicts_oldest_entries_past_limit() -> None:
+    """add() should drop the oldest responses once a user exceeds the limit."""
+    cache = SemanticResponseCache(max_entries_per_user=2)
+    cache.add("user-1", _unit(0), "first")
+    cache.add("user-1", _unit(1), "second")
+    cache.add("user-1", _unit(2), "third")
+
+    assert cache.lookup("user-1", _unit(0)) is None
+    assert cache.lookup("user-1", _unit(2)) == "third"
+
+
+def test_quantized_similarity_matches_float_cosine() -> None:
+    """Stored int8 vectors should score within quantization error of float cosine."""
+    rng = np.random.default_rng(0)
+    stored = rng.standard_normal(EMBEDDING_DIMENSIONS).astype(np.float32)
+    query = stored + 0.3 * rng.standard_normal(EMBEDDING_DIMENSIONS).astype(np.float32)
+    cosine = float(stored @ query / (np.linalg.norm(stored) * np.linalg.norm(query)))
+
+    cache = SemanticResponseCache(threshold=cosine - 0.01)
+    cache.add("user-1", stored.tolist(), "close enough")
+    assert cache.lookup("user-1", query.tolist()) == "close enough"
+
+    strict = SemanticResponseCache(threshold=cosine + 0.01)
+    strict.add("user-1", stored.tolist(), "close enough")
+    assert strict.lookup("user-1", query.tolist()) is None
+
+
+def test_is_opening_turn() -> None:
+    """is_opening_turn() should be False once the AI has replied earlier."""
+    assert is_opening_turn([HumanMessage(content="Hi")])
+    assert not is_opening_turn(
+        [HumanMessage(content="Hi"), AIMessage(content="Hello!"), HumanMessage(content="Hm")]
+    )
+
+
+# =============================================================================
+# semantic_cache_lookup Node Tests
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_node_skips_unauthenticated_requests() -> None:
+    """semantic_cache_lookup should report a miss without an auth user."""
+    state = {"messages": [HumanMessage(content="I feel anxious")]}
+
+    result = await semantic_cache_lookup(state, {"configurable": {}})
+
+    assert result == {"cache_hit": False}
+
+
+@pytest.mark.asyncio
+async def test_node_returns_cached_message_on_hit() -> None:
+    """semantic_cache_lookup should add the cached reply to state on a hit."""
+    cache = SemanticResponseCache()
+    cache.add("user-1", _unit(0), "I'm here with you.")
+
+    with (
+        patch("src.nodes.semantic_cache.node.response_cache", cache),
+        patch(
+            "src.nodes.semantic_cache.node.get_query_embedding",
+            new=AsyncMock(return_value=_unit(0)),
+        ),
+    ):
+        state = {"messages": [HumanMessage(content="I feel anxious")]}
+        config = {"configurable": {"langgraph_auth_user": {"identity": "user-1"}}}
+
+        result = await semantic_cache_lookup(state, config)
+
+    assert result["cache_hit"] is True
+    assert result["messages"][0].content == "I'm here with you."
@@ -0,0 +1,75 @@
+-- ============================================================================
+-- Migration: Index-friendly search_memories()
+-- ============================================================================
+-- Rewrites search_memories() so the planner can answer it from the HNSW index
+-- on memories.embedding.
+--
+-- The previous version ordered by (distance, created_at DESC) and filtered on
+-- the similarity threshold before the LIMIT. pgvector only uses an ANN index
+-- for a plain "ORDER BY distance LIMIT n", so every search fell back to
+-- computing the distance for all of the user's memories.
+--
+-- Now the inner query takes the p_limit nearest memories by distance alone,
+-- and the threshold and the recency tie-break are applied to those few rows.
+-- The nearest rows are also the most similar, so the result set is the same.
+--
+-- Requires pgvector >= 0.8 for hnsw.iterative_scan. Without iterative scans,
+-- an index scan filtered by user_id could return fewer than p_limit rows.
+-- (pgvectorscale's StreamingDiskANN isn't available on Supabase; HNSW with
+-- iterative scans is its closest equivalent here.)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION public.search_memories(
+  p_user_id UUID,
+  p_embedding halfvec(768),
+  p_limit INT DEFAULT 5,
+  p_similarity_threshold FLOAT DEFAULT 0.5
+)
+RETURNS TABLE (
+  id UUID,
+  user_message TEXT,
+  ai_response TEXT,
+  similarity FLOAT,
+  created_at TIMESTAMPTZ,
+  metadata JSONB
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = 'public'
+-- Keep scanning the index until enough of this user's rows are found
+SET hnsw.iterative_scan = 'relaxed_order'
+AS $$
+  SELECT
+    nearest.id,
+    nearest.user_message,
+    nearest.ai_response,
+    nearest.similarity,
+    nearest.created_at,
+    nearest.metadata
+  FROM (
+    SELECT
+      m.id,
+      m.user_message,
+      m.ai_response,
+      -- Cosine similarity: 1 - cosine_distance
+      -- Range: 0 (opposite) to 1 (identical)
+      1 - (m.embedding <=> p_embedding) AS similarity,
+      m.created_at,
+      m.metadata
+    FROM public.memories m
+    WHERE m.user_id = p_user_id
+      AND m.embedding IS NOT NULL
+    -- Distance only, so the HNSW index can serve this ORDER BY ... LIMIT
+    ORDER BY m.embedding <=> p_embedding
+    LIMIT p_limit
+  ) nearest
+  WHERE nearest.similarity > p_similarity_threshold
+  ORDER BY
+    -- Primary sort: by similarity (most similar first)
+    nearest.similarity DESC,
+    -- Secondary sort: by recency (newer first for ties)
+    nearest.created_at DESC;
+$$;
+
+COMMENT ON FUNCTION public.search_memories IS 'Searches for semantically similar memories using cosine similarity. Index-friendly nearest-first query with HNSW iterative scans.';
@@ -0,0 +1,100 @@
+-- ============================================================================
+-- Migration: Single-statement wellness profile update
+-- ============================================================================
+-- Adds record_conversation_in_profile(), which folds one conversation
+-- analysis into user_wellness_profiles with a single INSERT ... ON CONFLICT.
+--
+-- The AI backend used to SELECT the profile, merge the arrays in Python and
+-- upsert the result: two round-trips, and two conversations finishing at
+-- the same time could overwrite each other's topics and count. It also
+-- failed outright for users without a profile row yet (.single() on zero
+-- rows). Now the merge happens inside the upsert, under the row lock.
+--
+-- Recurring topics/triggers keep the 10 most recent distinct values: the
+-- new conversation's values first, then the existing ones.
+--
+-- Called only by the backend with the service role key.
+-- ============================================================================
+
+-- Merges tag arrays, keeping first occurrences in order, up to p_limit
+CREATE OR REPLACE FUNCTION public.merge_recent_tags(
+  p_new TEXT[],
+  p_existing TEXT[],
+  p_limit INT DEFAULT 10
+)
+RETURNS TEXT[]
+LANGUAGE sql
+IMMUTABLE
+SET search_path = ''
+AS $$
+  SELECT ARRAY(
+    SELECT tags.tag
+    FROM (
+      SELECT t.tag, MIN(t.ord) AS first_ord
+      FROM unnest(COALESCE(p_new, '{}') || COALESCE(p_existing, '{}'))
+        WITH ORDINALITY AS t(tag, ord)
+      GROUP BY t.tag
+    ) tags
+    ORDER BY tags.first_ord
+    LIMIT p_limit
+  );
+$$;
+
+CREATE OR REPLACE FUNCTION public.record_conversation_in_profile(
+  p_user_id UUID,
+  p_topics TEXT[],
+  p_triggers TEXT[],
+  p_emotional_baseline TEXT DEFAULT NULL,
+  p_primary_concern TEXT DEFAULT NULL
+)
+RETURNS VOID
+LANGUAGE sql
+SET search_path = ''
+AS $$
+  INSERT INTO public.user_wellness_profiles AS p (
+    user_id,
+    recurring_topics,
+    recurring_triggers,
+    total_conversations,
+    emotional_baseline,
+    emotional_baseline_updated_at,
+    current_primary_concern,
+    first_interaction_at,
+    last_interaction_at,
+    updated_at
+  )
+  VALUES (
+    p_user_id,
+    public.merge_recent_tags(p_topics, '{}'),
+    public.merge_recent_tags(p_triggers, '{}'),
+    1,
+    p_emotional_baseline,
+    CASE WHEN p_emotional_baseline IS NOT NULL THEN NOW() END,
+    p_primary_concern,
+    NOW(),
+    NOW(),
+    NOW()
+  )
+  ON CONFLICT (user_id) DO UPDATE SET
+    recurring_topics = public.merge_recent_tags(p_topics, p.recurring_topics),
+    recurring_triggers = public.merge_recent_tags(p_triggers, p.recurring_triggers),
+    total_conversations = COALESCE(p.total_conversations, 0) + 1,
+    -- Baseline and concern only change when this analysis determined one
+    emotional_baseline = COALESCE(EXCLUDED.emotional_baseline, p.emotional_baseline),
+    emotional_baseline_updated_at = CASE
+      WHEN EXCLUDED.emotional_baseline IS NOT NULL THEN NOW()
+      ELSE p.emotional_baseline_updated_at
+    END,
+    current_primary_concern = COALESCE(EXCLUDED.current_primary_concern, p.current_primary_concern),
+    first_interaction_at = COALESCE(p.first_interaction_at, NOW()),
+    last_interaction_at = NOW(),
+    updated_at = NOW();
+$$;
+
+-- Backend only: users must not be able to edit their own (or others') profiles
+REVOKE EXECUTE ON FUNCTION public.record_conversation_in_profile(UUID, TEXT[], TEXT[], TEXT, TEXT)
+  FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.record_conversation_in_profile(UUID, TEXT[], TEXT[], TEXT, TEXT)
+  TO service_role;
+
+COMMENT ON FUNCTION public.record_conversation_in_profile IS 'Folds one conversation analysis into user_wellness_profiles in a single atomic upsert.';
@@ -0,0 +1,80 @@
+-- ============================================================================
+-- Migration: Atomic activity effectiveness counters
+-- ============================================================================
+-- Adds record_activity_outcome(), which counts one activity run in
+-- activity_effectiveness with a single INSERT ... ON CONFLICT and returns
+-- the updated counters.
+--
+-- The AI backend used to SELECT the row, add to the counters in Python and
+-- upsert them back, so two activities finishing at the same time could lose
+-- a count. The counters are now incremented under the row lock; the backend
+-- derives the effectiveness score from the returned totals.
+--
+-- Called only by the backend with the service role key.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION public.record_activity_outcome(
+  p_user_id UUID,
+  p_activity_type TEXT,
+  p_technique TEXT,
+  p_completed BOOLEAN,
+  -- mood_after - mood_before, or NULL when either rating is missing
+  p_mood_change INT DEFAULT NULL
+)
+RETURNS TABLE (
+  times_started INT,
+  times_completed INT,
+  mood_improvements INT,
+  mood_no_change INT,
+  mood_declines INT
+)
+LANGUAGE sql
+SET search_path = ''
+AS $$
+  INSERT INTO public.activity_effectiveness AS a (
+    user_id,
+    activity_type,
+    technique,
+    times_started,
+    times_completed,
+    mood_improvements,
+    mood_no_change,
+    mood_declines,
+    first_used_at,
+    last_used_at
+  )
+  VALUES (
+    p_user_id,
+    p_activity_type,
+    p_technique,
+    1,
+    p_completed::INT,
+    COALESCE((p_mood_change > 0)::INT, 0),
+    COALESCE((p_mood_change = 0)::INT, 0),
+    COALESCE((p_mood_change < 0)::INT, 0),
+    NOW(),
+    NOW()
+  )
+  ON CONFLICT (user_id, activity_type, technique) DO UPDATE SET
+    times_started = COALESCE(a.times_started, 0) + 1,
+    times_completed = COALESCE(a.times_completed, 0) + EXCLUDED.times_completed,
+    mood_improvements = COALESCE(a.mood_improvements, 0) + EXCLUDED.mood_improvements,
+    mood_no_change = COALESCE(a.mood_no_change, 0) + EXCLUDED.mood_no_change,
+    mood_declines = COALESCE(a.mood_declines, 0) + EXCLUDED.mood_declines,
+    first_used_at = COALESCE(a.first_used_at, EXCLUDED.first_used_at),
+    last_used_at = NOW()
+  RETURNING
+    a.times_started,
+    a.times_completed,
+    a.mood_improvements,
+    a.mood_no_change,
+    a.mood_declines;
+$$;
+
+-- Backend only
+REVOKE EXECUTE ON FUNCTION public.record_activity_outcome(UUID, TEXT, TEXT, BOOLEAN, INT)
+  FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.record_activity_outcome(UUID, TEXT, TEXT, BOOLEAN, INT)
+  TO service_role;
+
+COMMENT ON FUNCTION public.record_activity_outcome IS 'Counts one activity run in activity_effectiveness atomically and returns the updated counters.';